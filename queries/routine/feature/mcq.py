@@ -2,7 +2,7 @@ from typing import override
 
 import httpx
 
-from tests import http
+from tests import http, trapi
 from tests.base_test import Test, TestResult
 
 method = "POST"
@@ -38,7 +38,7 @@ class TRAPINotImplementedError(Test):
     @override
     @staticmethod
     def test(response: httpx.Response) -> TestResult:
-        body = response.json()
+        body = trapi.as_json(response)
         passed = body["description"] == "NotImplementedError"
         return TestResult(passed, body["description"] if not passed else None)
 
@@ -2,7 +2,7 @@ from typing import override
 
 import httpx
 
-from tests import http
+from tests import http, trapi
 from tests.base_test import Test, TestResult
 
 method = "POST"
@@ -33,7 +33,7 @@ class QueryNotTraversableStatus(Test):
     @override
     @staticmethod
     def test(response: httpx.Response) -> TestResult:
-        body = response.json()
+        body = trapi.as_json(response)
         passed = body["status"] == "QueryNotTraversable"
         return TestResult(passed, body["status"] if not passed else None)
 
@@ -21,3 +21,8 @@ class Test(ABC):
     @abstractmethod
     def test(response: httpx.Response) -> TestResult:
         """A test that takes the httpx response and returns a pass/fail and optional info."""
+
+
+def test_name(test: type[Test]) -> str:
+    """A test's name, as printed with its result: its docstring, minus the final period."""
+    return test.__doc__.removesuffix(".") if test.__doc__ else test.__name__
@@ -17,9 +17,9 @@ import httpx
 from tests.base_test import Test, TestResult
 
 Comparison = Literal["lt", "lte", "eq", "ne", "gte", "gt"]
-"""A comparison operator for count-based tests."""
+"""A comparison operator for count-based (and budget) tests."""
 
-_COMPARATORS: dict[Comparison, Callable[[int, int], bool]] = {
+_COMPARATORS: dict[Comparison, Callable[[float, float], bool]] = {
     "lt": operator.lt,
     "lte": operator.le,
     "eq": operator.eq,
@@ -38,7 +38,7 @@ _SYMBOLS: dict[Comparison, str] = {
 }
 
 
-def compare(actual: int, expected: int, comparison: Comparison) -> bool:
+def compare(actual: float, expected: float, comparison: Comparison) -> bool:
     """Whether ``actual`` satisfies ``comparison`` against ``expected``."""
     return _COMPARATORS[comparison](actual, expected)
 
@@ -0,0 +1,181 @@
+"""Performance budget tests: elapsed time, time to first byte and body size.
+
+A test only receives the response, so before running a step's tests the runner
+records that step's measurements against its response (`record`), which these
+tests read back. Like `CountTest`, used bare they pass and report the
+measurement; `BudgetTest.expect(...)` builds a variant enforcing a budget, e.g.
+``perf.Latency.expect(30)`` (at most 30 seconds) or
+``perf.BodySize.expect(50_000_000, "lt")``. In a multi-step query each step's
+tests see that step's measurements; an async step's elapsed time runs from
+submission, through polling, to the final response.
+"""
+
+from typing import ClassVar, Literal, TypedDict, override
+from weakref import WeakKeyDictionary
+
+import httpx
+
+from tests.base_test import Test, TestResult
+from tests.params import Comparison, bind, compare, comparison_symbol
+
+Unit = Literal["seconds", "bytes"]
+Metric = Literal[
+    "elapsed_seconds", "query_elapsed_seconds", "ttfb_seconds", "body_bytes"
+]
+
+
+class StepMetrics(TypedDict):
+    """What a step's response took, as measured by the runner."""
+
+    elapsed_seconds: float  # the step end to end, async polling included
+    query_elapsed_seconds: float  # every step of the query so far, this one included
+    ttfb_seconds: float | None  # of the final response; None if not measured
+    body_bytes: int  # the final response's body (decoded, if compressed)
+
+
+_METRICS: WeakKeyDictionary[httpx.Response, StepMetrics] = WeakKeyDictionary()
+
+
+def record(response: httpx.Response, metrics: StepMetrics) -> None:
+    """Record a step's measurements for the tests run against its response."""
+    _METRICS[response] = metrics
+
+
+def _format(value: float, unit: Unit, budget: bool = False) -> str:
+    if unit == "bytes":
+        return f"{value:,.0f} bytes"
+    return f"{value:g}s" if budget else f"{value:.3f}s"
+
+
+def budget_result(
+    response: httpx.Response,
+    subject: str,
+    metric: Metric,
+    expected: float | None,
+    comparison: Comparison,
+) -> TestResult:
+    """A pass/fail `TestResult` comparing a recorded measurement against a budget.
+
+    ``metric`` is a `StepMetrics` key; no budget (``expected`` None) always
+    passes. The info shows the measurement, and the budget too when it's broken.
+    """
+    metrics = _METRICS.get(response)
+    if metrics is None:
+        return TestResult(False, "no step measurements recorded for this response")
+    value = metrics.get(metric)
+    if value is None:
+        return TestResult(True, f"{subject} not measured")
+    unit: Unit = "bytes" if metric == "body_bytes" else "seconds"
+    info = f"{subject} {_format(value, unit)}"
+    passed = expected is None or compare(value, expected, comparison)
+    if not passed:
+        info += f" (expected {comparison_symbol(comparison)} {_format(expected, unit, budget=True)})"
+    return TestResult(passed, info)
+
+
+class BudgetTest(Test):
+    """Base for performance budget tests: assert a measurement is within a budget.
+
+    Subclasses set `subject` and `unit` and implement a keyword-parametrized
+    ``test(response, *, expected=None, comparison="lte")`` that returns
+    ``budget_result(response, cls.subject, <StepMetrics key>, expected, comparison)``.
+    """
+
+    subject: ClassVar[str] = "measurement"
+    """The noun for the measurement, used in pass/fail reports."""
+
+    unit: ClassVar[Unit] = "seconds"
+
+    @classmethod
+    def expect(cls, expected: float, comparison: Comparison = "lte") -> type[Test]:
+        """Build a variant asserting the measurement ``comparison`` ``expected``.
+
+        e.g. ``perf.Latency.expect(30)`` allows at most 30 seconds, and
+        ``perf.BodySize.expect(50_000_000, "lt")`` under 50MB.
+        """
+        return bind(
+            cls,
+            name=(
+                f"{cls.subject} {comparison_symbol(comparison)} "
+                f"{_format(expected, cls.unit, budget=True)}"
+            ),
+            expected=expected,
+            comparison=comparison,
+        )
+
+
+class Latency(BudgetTest):
+    """elapsed time."""
+
+    subject = "elapsed"
+
+    @override
+    @staticmethod
+    def test(
+        response: httpx.Response,
+        *,
+        expected: float | None = None,
+        comparison: Comparison = "lte",
+    ) -> TestResult:
+        return budget_result(
+            response, Latency.subject, "elapsed_seconds", expected, comparison
+        )
+
+
+class QueryLatency(BudgetTest):
+    """query elapsed time."""
+
+    subject = "query elapsed"
+
+    @override
+    @staticmethod
+    def test(
+        response: httpx.Response,
+        *,
+        expected: float | None = None,
+        comparison: Comparison = "lte",
+    ) -> TestResult:
+        return budget_result(
+            response,
+            QueryLatency.subject,
+            "query_elapsed_seconds",
+            expected,
+            comparison,
+        )
+
+
+class TimeToFirstByte(BudgetTest):
+    """time to first byte."""
+
+    subject = "time to first byte"
+
+    @override
+    @staticmethod
+    def test(
+        response: httpx.Response,
+        *,
+        expected: float | None = None,
+        comparison: Comparison = "lte",
+    ) -> TestResult:
+        return budget_result(
+            response, TimeToFirstByte.subject, "ttfb_seconds", expected, comparison
+        )
+
+
+class BodySize(BudgetTest):
+    """response body size."""
+
+    subject = "body size"
+    unit = "bytes"
+
+    @override
+    @staticmethod
+    def test(
+        response: httpx.Response,
+        *,
+        expected: float | None = None,
+        comparison: Comparison = "lte",
+    ) -> TestResult:
+        return budget_result(
+            response, BodySize.subject, "body_bytes", expected, comparison
+        )
@@ -1,25 +1,38 @@
 """TOM-aware helpers for tests, backed by translator_tom.
 
-Responses are parsed into TOM models at most once each (memoized per response
-object).
+Response bodies are decoded from JSON at most once each, and parsed into TOM
+models at most once each (both memoized per response object). translator_tom is
+imported on first parse, so decoding JSON alone doesn't pay for loading it.
 """
 
 from __future__ import annotations
 
-from typing import override
+import json
+from typing import TYPE_CHECKING, Any, override
 from weakref import WeakKeyDictionary
 
 import httpx
-from translator_tom import MetaKnowledgeGraph, Response
-from translator_tom.validation import semantic_validate
 
 from tests.base_test import Test, TestResult
 
+if TYPE_CHECKING:
+    from translator_tom import MetaKnowledgeGraph, Response
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # orjson normally comes with translator_tom
+    _loads = json.loads
+
 
 class TrapiParseError(Exception):
     """Raised when a response body cannot be parsed as the expected TRAPI model."""
 
 
+# Cache decoded body or decode error per response, shared by everything that
+# reads it (run pipeline, report, tests, model parsing).
+_JSON_CACHE: WeakKeyDictionary[httpx.Response, Any] = WeakKeyDictionary()
+_JSON_ERRORS: WeakKeyDictionary[httpx.Response, ValueError] = WeakKeyDictionary()
+
 # Cache parsed model or parse error per response to avoid slow re-parsing.
 _TRAPI_CACHE: WeakKeyDictionary[httpx.Response, Response | TrapiParseError] = (
     WeakKeyDictionary()
@@ -29,6 +42,51 @@ _METAKG_CACHE: WeakKeyDictionary[
 ] = WeakKeyDictionary()
 
 
+def as_json(response: httpx.Response, keep: bool = True) -> Any:
+    """Decode a response's JSON body, memoized per response.
+
+    Uses orjson when it's installed. The result is shared: don't modify it.
+    Without ``keep``, a body that isn't already cached is decoded but not kept,
+    for a one-off look that shouldn't pin it for the response's lifetime.
+
+    Raises:
+        ValueError: if the body is not valid JSON (also cached and re-raised).
+    """
+    if response in _JSON_CACHE:
+        return _JSON_CACHE[response]
+    cached_error = _JSON_ERRORS.get(response)
+    if cached_error is not None:
+        raise cached_error
+
+    try:
+        decoded = _loads(response.content)
+    except ValueError as error:
+        _JSON_ERRORS[response] = error
+        raise
+
+    if keep:
+        _JSON_CACHE[response] = decoded
+    return decoded
+
+
+def is_json(response: httpx.Response) -> bool:
+    """Whether a response's body is valid JSON.
+
+    Answered from `as_json`'s cache when possible; otherwise the body is decoded
+    to check, but not kept.
+    """
+    if response in _JSON_CACHE:
+        return True
+    if response in _JSON_ERRORS:
+        return False
+    try:
+        _loads(response.content)
+    except ValueError as error:
+        _JSON_ERRORS[response] = error
+        return False
+    return True
+
+
 def as_trapi(response: httpx.Response) -> Response:
     """Parse a response into a TOM `Response`, memoized per response.
 
@@ -41,8 +99,10 @@ def as_trapi(response: httpx.Response) -> Response:
             raise cached
         return cached
 
+    from translator_tom import Response
+
     try:
-        parsed = Response.from_json(response.content)
+        parsed = Response.model_validate(as_json(response))
     except Exception as error:
         parse_error = TrapiParseError(f"response is not valid TRAPI: {error}")
         _TRAPI_CACHE[response] = parse_error
@@ -64,8 +124,10 @@ def as_metakg(response: httpx.Response) -> MetaKnowledgeGraph:
             raise cached
         return cached
 
+    from translator_tom import MetaKnowledgeGraph
+
     try:
-        parsed = MetaKnowledgeGraph.from_json(response.content)
+        parsed = MetaKnowledgeGraph.model_validate(as_json(response))
     except Exception as error:
         parse_error = TrapiParseError(
             f"response is not a valid meta_knowledge_graph: {error}"
@@ -127,6 +189,8 @@ class Semantic(Test):
         if isinstance(model, TestResult):
             return model
 
+        from translator_tom.validation import semantic_validate
+
         warnings, errors = semantic_validate(model)
 
         if errors:
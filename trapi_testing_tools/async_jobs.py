@@ -0,0 +1,171 @@
+"""Submit-then-collect handling of asyncquery jobs.
+
+Every job is POSTed up front (`submit`), then each is polled to completion
+(`collect`). Awaiting many `collect` calls together multiplexes all of their
+``asyncquery_status`` polls in one event loop, so a set of long-running jobs takes
+roughly as long as the slowest one rather than the sum of them all.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Literal, cast
+
+import httpx
+
+from tests import trapi
+from trapi_testing_tools import callback, transport
+from trapi_testing_tools.config import CONFIG
+from trapi_testing_tools.polling import ACTIVE_STATUSES, PollStrategy, PollTimer
+from trapi_testing_tools.report import StepRun
+from trapi_testing_tools.types import Query
+
+
+@dataclass
+class SubmittedJob:
+    """An asyncquery that has been POSTed, but not yet collected."""
+
+    target: str
+    method: str
+    strategy: PollStrategy
+    status_url: str | None  # None when submission already decided the result
+    body: dict[str, Any]  # the submission response body
+    response: httpx.Response | None
+    started_at: float  # monotonic time just before submission
+    pending: callback.PendingCallback | None = None  # in callback mode
+    run: StepRun | None = None  # final result, when submission already decided it
+
+
+async def submit(client: httpx.AsyncClient, query: Query, url: str) -> SubmittedJob:
+    """POST one asyncquery, returning the job to collect later.
+
+    Failed submissions (HTTP errors, request errors, or no ``job_id``) are
+    returned with their final `StepRun` already set.
+    """
+    target = url + cast(str, query.endpoint)
+    method = cast(str, query.method)
+    strategy = query.polling or CONFIG.polling
+    job = SubmittedJob(target, method, strategy, None, {}, None, time.monotonic())
+    receiver = callback.active()
+    job.pending = receiver.register() if receiver is not None else None
+    try:
+        response = await transport.asend(
+            client,
+            method=method,
+            url=target,
+            params=query.params,
+            headers=query.headers,
+            payload=callback.with_callback(query, job.pending),
+        )
+        job.response = response
+        response.raise_for_status()
+        job.body = cast(dict[str, Any], trapi.as_json(response))
+    except httpx.HTTPStatusError as error:
+        errored = error.response
+        elapsed = errored.elapsed.total_seconds()
+        job.run = StepRun(
+            errored, "ok", errored.status_code, None, elapsed, target, method
+        )
+        return job
+    except httpx.RequestError as error:
+        status = "timeout" if isinstance(error, httpx.TimeoutException) else "error"
+        elapsed = time.monotonic() - job.started_at
+        job.run = StepRun(None, status, None, repr(error), elapsed, target, method)
+        return job
+
+    job_id = job.body.get("job_id")
+    if job_id is None:
+        elapsed = response.elapsed.total_seconds()
+        job.run = StepRun(
+            response, "ok", response.status_code, None, elapsed, target, method
+        )
+        return job
+    job.status_url = f"{url}/asyncquery_status/{job_id}"
+    return job
+
+
+async def collect(client: httpx.AsyncClient, job: SubmittedJob) -> StepRun:
+    """Poll a submitted job to completion, then fetch its final response.
+
+    Like a sequential run, the elapsed time is end-to-end wall-clock time and the
+    uncertainty is the poll interval completion was observed in. In callback mode
+    the result is taken from the callback, polling only slowly as a fallback.
+    """
+    try:
+        return await _poll(client, job)
+    finally:
+        if job.pending is not None:
+            job.pending.close()
+
+
+async def _poll(client: httpx.AsyncClient, job: SubmittedJob) -> StepRun:
+    if job.run is not None:
+        return job.run
+
+    status_url = cast(str, job.status_url)
+    response = cast(httpx.Response, job.response)
+    body = job.body
+    pending = job.pending
+    timer = PollTimer(job.strategy, CONFIG.timeout, fallback=pending is not None)
+    status: Literal["ok", "timeout"] = "ok"
+    try:
+        while body.get("status") in ACTIVE_STATUSES:
+            if timer.expired:
+                status = "timeout"
+                break
+            delay = timer.next_delay(response)
+            if pending is None:
+                await asyncio.sleep(delay)
+            elif await pending.wait_async(delay) is not None:
+                break
+            response = await client.get(status_url)
+            timer.polled()
+            response.raise_for_status()
+            body = cast(dict[str, Any], trapi.as_json(response))
+
+        if pending is not None:
+            grace = 0 if status == "timeout" else callback.CALLBACK_GRACE
+            arrived = await pending.wait_async(grace)
+            if arrived is not None:
+                return StepRun(
+                    arrived.response,
+                    "ok",
+                    arrived.response.status_code,
+                    None,
+                    arrived.received_at - job.started_at,
+                    job.target,
+                    job.method,
+                )
+
+        response_url = body.get("response_url")
+        if status == "ok" and response_url is not None:
+            response = await transport.asend(client, "GET", response_url)
+            response.raise_for_status()
+
+    except httpx.HTTPStatusError as error:
+        response = error.response
+    except httpx.RequestError as error:
+        request_status = (
+            "timeout" if isinstance(error, httpx.TimeoutException) else "error"
+        )
+        return StepRun(
+            None,
+            request_status,
+            None,
+            repr(error),
+            time.monotonic() - job.started_at,
+            job.target,
+            job.method,
+            timer.uncertainty,
+        )
+
+    return StepRun(
+        response,
+        status,
+        response.status_code,
+        None,
+        time.monotonic() - job.started_at,
+        job.target,
+        job.method,
+        timer.uncertainty,
+    )
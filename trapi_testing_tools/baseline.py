@@ -0,0 +1,251 @@
+"""A performance regression gate: a run compared against a baseline.
+
+``tt test --baseline SOURCE`` compares each query's latency (its elapsed time)
+and response size (its final response's body) in each environment against
+earlier measurements, from a ``--pipe``/``--report``/``--ndjson`` report or from
+the run history (see `history`). A metric regresses when its median got worse
+by more than a tolerance and a one-sided significance test agrees, per
+`BaselineConfig` (``baseline`` in ``config.yaml``). Regressions fail the run.
+
+With too few runs for the test to ever reach significance (e.g. single runs
+without ``--repeat``), the tolerance alone decides.
+"""
+
+import json
+import sqlite3
+import statistics
+from contextlib import closing
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal, TypedDict
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from trapi_testing_tools import stats
+
+if TYPE_CHECKING:
+    from trapi_testing_tools.config import BaselineConfig
+    from trapi_testing_tools.report import QueryResult
+
+console = Console(stderr=True)
+
+Metric = Literal["latency", "size"]
+HISTORY_SOURCE = "history"
+
+# Samples of each metric, by (query path, environment)
+Measurements = dict[tuple[str, str], dict[Metric, list[float]]]
+
+
+class Comparison(TypedDict):
+    """One metric of one query/environment compared against the baseline."""
+
+    path: str
+    env: str
+    metric: Metric
+    baseline_runs: int
+    current_runs: int
+    baseline_median: float
+    current_median: float
+    change: float  # relative change of the median
+    p_value: float | None  # None if too few runs for the test
+    regression: bool
+
+
+def _size(result: "QueryResult") -> float | None:
+    timing = result["steps"][-1]["timing"] if result["steps"] else None
+    if timing is None:
+        return None
+    return timing["decoded_bytes"] or timing["wire_bytes"]
+
+
+def add_result(measurements: Measurements, result: "QueryResult") -> None:
+    """Add a query result's measurements (if every step of it got a response)."""
+    if result["error"] is not None or not result["steps"]:
+        return
+    if any(step["status"] != "ok" for step in result["steps"]):
+        return
+    samples = measurements.setdefault((result["path"], result["env"]), {})
+    repetitions = result.get("repetitions")
+    variants = result.get("matrix")
+    samples.setdefault("latency", []).extend(
+        repetitions["elapsed_samples"]
+        if repetitions is not None
+        else [
+            variant["elapsed_seconds"]
+            for variant in variants["results"]
+            if variant["error"] is None and variant["elapsed_seconds"] is not None
+        ]
+        if variants is not None  # each variant's time, not the whole matrix's
+        else [result["elapsed_seconds"]]
+    )
+    size = _size(result)
+    if size is not None:
+        samples.setdefault("size", []).append(size)
+
+
+def _from_report(path: Path, measurements: Measurements) -> None:
+    """Add the results of a report file: one envelope, or NDJSON records."""
+    text = path.read_text(encoding="utf8")
+    try:
+        records = [json.loads(text)]
+    except json.JSONDecodeError:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    for record in records:
+        if not isinstance(record, dict):
+            raise ValueError(
+                f"{path} is not a tt test report (from -p, -r or --ndjson)"
+            )
+        if "queries" in record:
+            for result in record["queries"]:
+                add_result(measurements, result)
+        elif record.get("type") in {"singleton", "multi_step"}:
+            add_result(measurements, record)
+        elif record.get("type") != "summary":
+            raise ValueError(
+                f"{path} is not a tt test report (from -p, -r or --ndjson)"
+            )
+
+
+def _from_history(days: int, measurements: Measurements) -> None:
+    """Add every recorded run from the last ``days`` days."""
+    from trapi_testing_tools import history
+
+    path = history.default_path()
+    if not path.exists():
+        raise FileNotFoundError(f"No run history yet ({path} doesn't exist)")
+    since = (datetime.now(UTC) - timedelta(days=days)).isoformat(timespec="seconds")
+    with closing(history.connect(path)) as connection:
+        grouped = history.samples(connection, [], [], since)
+    for key, group in grouped.items():
+        samples = measurements.setdefault(key, {})
+        # Each recorded run (a --repeat run's repetitions are recorded one by
+        # one), filtered and measured as `add_result` does
+        for sample in group:
+            if not sample["responded"]:
+                continue
+            samples.setdefault("latency", []).extend(
+                sample["variant_elapsed"] or [sample["elapsed_seconds"]]
+            )
+            size = sample["decoded_bytes"] or sample["wire_bytes"]
+            if size is not None:
+                samples.setdefault("size", []).append(size)
+
+
+def load(sources: list[str], config: "BaselineConfig") -> Measurements:
+    """Baseline measurements pooled from report files and/or the run history.
+
+    A source is a report's path, ``history`` (the last ``history_days`` days of
+    recorded runs) or ``history:N`` (the last N days).
+
+    Raises:
+        ValueError: if a source isn't a report, or a history source is malformed.
+        OSError: if a report can't be read, or there's no history yet.
+    """
+    measurements: Measurements = {}
+    for source in sources:
+        name, _, days = source.partition(":")
+        if name == HISTORY_SOURCE and not Path(source).exists():
+            try:
+                _from_history(int(days) if days else config.history_days, measurements)
+            except (ValueError, sqlite3.Error) as error:
+                raise ValueError(f"bad history baseline {source!r}: {error}") from error
+        else:
+            _from_report(Path(source), measurements)
+    return measurements
+
+
+def compare(
+    baseline: Measurements, current: Measurements, config: "BaselineConfig"
+) -> list[Comparison]:
+    """Compare each query/environment's metrics present in both."""
+    tolerances: dict[Metric, float] = {
+        "latency": config.latency_tolerance,
+        "size": config.size_tolerance,
+    }
+    comparisons: list[Comparison] = []
+    for key in sorted(current.keys() & baseline.keys()):
+        for metric, tolerance in tolerances.items():
+            before = baseline[key].get(metric)
+            after = current[key].get(metric)
+            if not before or not after:
+                continue
+            change = stats.median_change(before, after)
+            p_value = None
+            testable = stats.min_pvalue(len(before), len(after)) < config.alpha
+            if config.test == "permutation" and testable:
+                p_value = stats.permutation_pvalue(before, after)
+            elif config.test == "mann-whitney" and testable:
+                p_value = stats.mann_whitney_pvalue(before, after)
+            worse = change > tolerance and (p_value is None or p_value < config.alpha)
+            if metric == "latency":
+                slowdown = statistics.median(after) - statistics.median(before)
+                worse = worse and slowdown >= config.min_latency_seconds
+            comparisons.append(
+                {
+                    "path": key[0],
+                    "env": key[1],
+                    "metric": metric,
+                    "baseline_runs": len(before),
+                    "current_runs": len(after),
+                    "baseline_median": statistics.median(before),
+                    "current_median": statistics.median(after),
+                    "change": round(change, 4),
+                    "p_value": None if p_value is None else round(p_value, 4),
+                    "regression": worse,
+                }
+            )
+    return comparisons
+
+
+def _value(metric: Metric, value: float) -> str:
+    return f"{value:.3f}s" if metric == "latency" else f"{value:,.0f}B"
+
+
+def print_comparisons(comparisons: list[Comparison], config: "BaselineConfig") -> None:
+    """Print the regressions (if any) as a table, and a one-line verdict."""
+    regressions = [row for row in comparisons if row["regression"]]
+    pairs = len({(row["path"], row["env"]) for row in comparisons})
+    if not regressions:
+        console.print(
+            f"✓ No performance regressions against the baseline "
+            f"({pairs} query/environment pair(s) compared).",
+            style="green",
+            highlight=False,
+        )
+        return
+    table = Table(
+        title="Performance regressions",
+        title_style="bold red",
+        box=box.SIMPLE,
+        caption=(
+            f"Median worse by over the tolerance (latency "
+            f"{config.latency_tolerance:.0%}, size {config.size_tolerance:.0%}) and "
+            f"{config.test} p < {config.alpha}; p is - when there are too few runs "
+            f"to test (see --repeat)."
+        ),
+    )
+    table.add_column("Query", style="rule.line", overflow="fold")
+    table.add_column("Env", no_wrap=True)
+    table.add_column("Metric")
+    for column in ("Baseline", "Current", "Change", "p", "Runs"):
+        table.add_column(column, justify="right", no_wrap=True)
+    for row in regressions:
+        table.add_row(
+            row["path"],
+            row["env"],
+            row["metric"],
+            _value(row["metric"], row["baseline_median"]),
+            _value(row["metric"], row["current_median"]),
+            f"[red]{row['change']:+.1%}[/]",
+            "-" if row["p_value"] is None else f"{row['p_value']:.3f}",
+            f"{row['baseline_runs']}/{row['current_runs']}",
+        )
+    console.print(table)
+    console.print(
+        f"X {len(regressions)} performance regression(s) across {pairs} "
+        f"query/environment pair(s) compared.",
+        style="bold red",
+        highlight=False,
+    )
@@ -0,0 +1,296 @@
+"""Microbenchmarks of tests' and analyses' hot paths (`tt bench`).
+
+Each benchmark runs against synthetic responses (see `synth`) of several sizes,
+reporting wall time over repeated calls, then peak memory and the allocations
+one more call leaves alive, under `tracemalloc`. Results can be saved as
+JSON and compared against an earlier run (see `compare`).
+
+Responses are parsed once per size, outside the timed calls, except by the
+parsing benchmark itself; tests reuse the memoized parse like a real run does.
+"""
+
+import gc
+import io
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, TypedDict
+
+import httpx
+from rich import box
+from rich.console import Console
+from rich.table import Table
+from translator_tom import Response
+
+from analysis.frequency import NodeFrequency
+from analysis.hierarchy import SupportGraphHierarchy
+from analysis.path import PathCount
+from tests import kg, trapi
+from tests.base_test import Test
+from trapi_testing_tools.stats import median_change, permutation_pvalue
+from trapi_testing_tools.synth import SynthSpec, synthesize
+
+console = Console(stderr=True)
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+class BenchResult(TypedDict):
+    """One benchmark's measurements at one response size."""
+
+    benchmark: str
+    edges: int
+    seconds: list[float]  # each timed call
+    median_seconds: float
+    mean_seconds: float
+    stdev_seconds: float
+    peak_bytes: int  # peak traced memory during one call
+    # Blocks (and their bytes) allocated by that call and still alive after it,
+    # its output included; ones allocated and freed within it aren't counted
+    retained_blocks: int
+    retained_bytes: int
+
+
+class BenchReport(TypedDict):
+    """The whole ``tt bench`` output."""
+
+    created: str
+    python: str
+    repeat: int
+    results: list[BenchResult]
+
+
+class Comparison(TypedDict):
+    """One benchmark/size compared against a baseline."""
+
+    benchmark: str
+    edges: int
+    baseline_median: float
+    current_median: float
+    change: float  # relative change of the median time
+    p_value: float
+    regression: bool
+
+
+@dataclass
+class Fixture:
+    """A synthetic response at one size, raw and parsed."""
+
+    edges: int
+    content: bytes
+    model: Response
+    path_ends: list[str]  # PathCount args between two connected nodes
+
+    def response(self) -> httpx.Response:
+        """A fresh response object (so nothing is memoized on it yet)."""
+        return httpx.Response(
+            200, content=self.content, headers={"Content-Type": "application/json"}
+        )
+
+
+def make_fixture(edges: int) -> Fixture:
+    """Synthesize a response with ``edges`` edges and support graphs 2 deep.
+
+    As many nodes as edges keeps the graph sparse, so path finding stays tractable.
+    """
+    spec = SynthSpec(
+        nodes=edges,
+        edges=edges,
+        results=max(edges // 10, 1),
+        aux_graphs=max(edges // 20, 2),
+        depth=2,
+        logs=100,
+    )
+    buffer = io.StringIO()
+    synthesize(spec, buffer)
+    content = buffer.getvalue().encode()
+    model = Response.from_json(content)
+    graph = model.message.knowledge_graph
+    real = next(
+        edge
+        for edge in (graph.edges.values() if graph else ())
+        if not edge.support_graphs
+    )
+    return Fixture(
+        edges, content, model, ["--start", real.subject, "--end", real.object]
+    )
+
+
+def _test_call(test: type[Test]) -> Callable[[Fixture], Callable[[], object]]:
+    def prepare(fixture: Fixture) -> Callable[[], object]:
+        response = fixture.response()
+        trapi.as_trapi(response)  # parse (memoized) outside the timing
+        return lambda: test.test(response)
+
+    return prepare
+
+
+def _parse(fixture: Fixture) -> Callable[[], object]:
+    def call() -> object:
+        return trapi.as_trapi(fixture.response())
+
+    return call
+
+
+BENCHMARKS: dict[str, Callable[[Fixture], Callable[[], object]]] = {
+    "trapi.as_trapi": _parse,
+    "trapi.Semantic": _test_call(trapi.Semantic),
+    "kg.BindingsResolveToKG": _test_call(kg.BindingsResolveToKG),
+    "kg.AllKGItemsBound": _test_call(kg.AllKGItemsBound),
+    "kg.HasKLAT": _test_call(kg.HasKLAT),
+    "kg.SourceRecordURLs": _test_call(kg.SourceRecordURLs),
+    "analysis.NodeFrequency": lambda f: lambda: NodeFrequency.analyze(f.model),
+    "analysis.SupportGraphHierarchy": (
+        lambda f: lambda: SupportGraphHierarchy.analyze(f.model)
+    ),
+    "analysis.PathCount": lambda f: lambda: PathCount.run(f.model, f.path_ends),
+}
+"""Benchmarks by name: each prepares a call (untimed) against a fixture."""
+
+
+def _measure(name: str, fixture: Fixture, repeat: int) -> BenchResult:
+    prepare = BENCHMARKS[name]
+    prepare(fixture)()  # untimed, so one-off setup (e.g. loading biolink) isn't counted
+    seconds: list[float] = []
+    for _ in range(repeat):
+        call = prepare(fixture)
+        gc.collect()
+        start = time.perf_counter()
+        call()
+        seconds.append(time.perf_counter() - start)
+
+    call = prepare(fixture)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    output = call()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    # Only growth counts: blocks the call frees mustn't cancel out new ones
+    growth = [
+        stat for stat in after.compare_to(before, "filename") if stat.count_diff > 0
+    ]
+    del output
+
+    return {
+        "benchmark": name,
+        "edges": fixture.edges,
+        "seconds": [round(value, 6) for value in seconds],
+        "median_seconds": round(statistics.median(seconds), 6),
+        "mean_seconds": round(statistics.fmean(seconds), 6),
+        "stdev_seconds": round(statistics.stdev(seconds), 6) if repeat > 1 else 0.0,
+        "peak_bytes": peak,
+        "retained_blocks": sum(stat.count_diff for stat in growth),
+        "retained_bytes": sum(max(stat.size_diff, 0) for stat in growth),
+    }
+
+
+def run_benchmarks(names: list[str], sizes: list[int], repeat: int) -> BenchReport:
+    """Run each named benchmark at each size (smallest first)."""
+    results: list[BenchResult] = []
+    with console.status("Benchmarking...") as status:
+        for size in sorted(sizes):
+            status.update(f"Synthesizing a {size:,}-edge response...")
+            fixture = make_fixture(size)
+            for name in names:
+                status.update(f"Benchmarking {name} at {size:,} edges...")
+                results.append(_measure(name, fixture, repeat))
+            del fixture
+    return {
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(
+    baseline: BenchReport, report: BenchReport, threshold: float, alpha: float
+) -> list[Comparison]:
+    """Compare timings with a baseline's, benchmark by benchmark and size by size.
+
+    A regression is a median slowdown beyond ``threshold`` (e.g. 0.1 for 10%) that
+    is also significant: a one-sided permutation test p-value below ``alpha``.
+    """
+    before = {(r["benchmark"], r["edges"]): r for r in baseline["results"]}
+    comparisons: list[Comparison] = []
+    for result in report["results"]:
+        old = before.get((result["benchmark"], result["edges"]))
+        if old is None:
+            continue
+        change = median_change(old["seconds"], result["seconds"])
+        p_value = permutation_pvalue(old["seconds"], result["seconds"])
+        comparisons.append(
+            {
+                "benchmark": result["benchmark"],
+                "edges": result["edges"],
+                "baseline_median": old["median_seconds"],
+                "current_median": result["median_seconds"],
+                "change": round(change, 4),
+                "p_value": round(p_value, 4),
+                "regression": change > threshold and p_value < alpha,
+            }
+        )
+    return comparisons
+
+
+def _size(count: float) -> str:
+    for unit in ("B", "kB", "MB"):
+        if count < 1000:  # noqa: PLR2004
+            return f"{count:.0f}{unit}"
+        count /= 1000
+    return f"{count:.1f}GB"
+
+
+def print_report(report: BenchReport) -> None:
+    """Print benchmark results as a table."""
+    table = Table(title="Benchmarks", title_style="bold", box=box.SIMPLE)
+    table.add_column("Benchmark", style="rule.line")
+    for column in ("Edges", "Median", "Stdev", "Peak mem", "Retained", "Blocks"):
+        table.add_column(column, justify="right", no_wrap=True)
+    for result in report["results"]:
+        table.add_row(
+            result["benchmark"],
+            f"{result['edges']:,}",
+            f"{result['median_seconds'] * 1000:.2f}ms",
+            f"{result['stdev_seconds'] * 1000:.2f}ms",
+            _size(result["peak_bytes"]),
+            _size(result["retained_bytes"]),
+            f"{result['retained_blocks']:,}",
+        )
+    console.print(table)
+
+
+def print_comparison(comparisons: list[Comparison]) -> None:
+    """Print comparisons against a baseline, flagging regressions."""
+    table = Table(
+        title="Compared to baseline",
+        title_style="bold",
+        box=box.SIMPLE,
+        caption="Median times. Regressions are significant slowdowns past the threshold.",
+    )
+    table.add_column("Benchmark", style="rule.line")
+    for column in ("Edges", "Baseline", "Current", "Change", "p"):
+        table.add_column(column, justify="right", no_wrap=True)
+    for row in comparisons:
+        style = "red" if row["regression"] else "green" if row["change"] < 0 else ""
+        table.add_row(
+            row["benchmark"],
+            f"{row['edges']:,}",
+            f"{row['baseline_median'] * 1000:.2f}ms",
+            f"{row['current_median'] * 1000:.2f}ms",
+            f"[{style}]{row['change']:+.1%}[/]" if style else f"{row['change']:+.1%}",
+            f"{row['p_value']:.3f}",
+        )
+    console.print(table)
+
+
+def emit(output: Any) -> None:
+    """Write results to stdout as JSON."""
+    print(json.dumps(output, ensure_ascii=False))
@@ -0,0 +1,180 @@
+"""A content-addressed store of response bodies (``tt test --blobs DIR``).
+
+With a store open, JSON response bodies aren't embedded in the pipe report or
+written to ``--save`` files; each is written to the store once, gzipped and named
+by the SHA-256 of its canonical JSON (sorted keys, no whitespace), and referred
+to as ``{"$blob": "sha256:<hex>"}``. Identical responses, however formatted, are
+stored once, so reports stay small enough to diff and archive. `resolve` (and
+``tt resolve``) puts the bodies back.
+
+Cassettes (see `cassette`) keep their recorded bodies in a store too, byte for
+byte (`BlobStore.put_bytes`).
+"""
+
+import gzip
+import hashlib
+import json
+import tempfile
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypedDict, TypeGuard
+
+from trapi_testing_tools.spool import CHUNK_SIZE
+
+try:
+    import orjson
+except ImportError:  # orjson normally comes with translator_tom
+    orjson = None
+
+BLOB_KEY = "$blob"
+DIGEST_PREFIX = "sha256:"
+
+# A reference to a stored body (the key isn't a valid identifier).
+BlobRef = TypedDict("BlobRef", {"$blob": str})
+
+
+def canonical_json(value: object) -> bytes:
+    """``value`` as canonical JSON: sorted keys, no whitespace, UTF-8."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+def ref(digest: str) -> BlobRef:
+    """The reference to a blob with the given SHA-256 hex digest."""
+    return {BLOB_KEY: DIGEST_PREFIX + digest}
+
+
+def is_ref(value: object) -> TypeGuard[BlobRef]:
+    """Whether ``value`` is a blob reference."""
+    return (
+        isinstance(value, dict)
+        and len(value) == 1
+        and isinstance(value.get(BLOB_KEY), str)
+    )
+
+
+class StoredBody:
+    """A stored body, streamed from its blob when written out (see `report`)."""
+
+    def __init__(self, path: Path) -> None:
+        """Refer to the blob at ``path``."""
+        self.path = path
+
+    def chunks(self) -> Iterator[bytes]:
+        """The body's canonical JSON, decompressed a chunk at a time."""
+        with gzip.open(self.path, "rb") as compressed:
+            while chunk := compressed.read(CHUNK_SIZE):
+                yield chunk
+
+
+class BlobStore:
+    """A blob store directory."""
+
+    def __init__(self, directory: Path) -> None:
+        """Use ``directory`` (created on first write)."""
+        self.directory = directory
+
+    def path(self, ref: BlobRef) -> Path:
+        """Where a referenced blob is kept."""
+        digest = ref[BLOB_KEY].removeprefix(DIGEST_PREFIX)
+        return self.directory / digest[:2] / f"{digest}.gz"
+
+    def put(self, value: object) -> BlobRef:
+        """Store a JSON value (unless it's already stored), returning its reference."""
+        content = canonical_json(value)
+        stored = ref(hashlib.sha256(content).hexdigest())
+        if self.path(stored).exists():
+            return stored
+        return self.put_bytes([content])
+
+    def put_bytes(self, chunks: Iterable[bytes]) -> BlobRef:
+        """Store a body as is, a chunk at a time, returning its reference."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        with (
+            tempfile.NamedTemporaryFile(dir=self.directory, delete=False) as temporary,
+            gzip.GzipFile(fileobj=temporary, mode="wb", mtime=0) as compressed,
+        ):
+            for chunk in chunks:
+                digest.update(chunk)
+                compressed.write(chunk)
+        stored = ref(digest.hexdigest())
+        path = self.path(stored)
+        if path.exists():
+            Path(temporary.name).unlink()
+        else:
+            path.parent.mkdir(exist_ok=True)
+            Path(temporary.name).replace(path)
+        return stored
+
+    def read_bytes(self, ref: BlobRef) -> bytes:
+        """A stored body, whole and undecoded.
+
+        Raises:
+            FileNotFoundError: if the blob isn't in this store.
+        """
+        with gzip.open(self.path(ref), "rb") as compressed:
+            return compressed.read()
+
+    def get(self, ref: BlobRef) -> Any:
+        """A stored body, decoded.
+
+        Raises:
+            FileNotFoundError: if the blob isn't in this store.
+        """
+        content = self.read_bytes(ref)
+        return orjson.loads(content) if orjson is not None else json.loads(content)
+
+
+def resolve(value: Any, store: BlobStore, lazy: bool = False) -> Any:
+    """``value`` with every blob reference in it replaced by the stored body.
+
+    ``lazy`` leaves bodies as `StoredBody` objects instead of decoding them, for
+    streaming straight to output.
+
+    Raises:
+        FileNotFoundError: if a referenced blob isn't in the store.
+    """
+    if is_ref(value):
+        if lazy:
+            path = store.path(value)
+            if not path.exists():
+                raise FileNotFoundError(
+                    f"No blob {value[BLOB_KEY]} in {store.directory}"
+                )
+            return StoredBody(path)
+        return store.get(value)
+    if isinstance(value, dict):
+        return {key: resolve(item, store, lazy) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve(item, store, lazy) for item in value]
+    return value
+
+
+_store: BlobStore | None = None
+
+
+def active() -> BlobStore | None:
+    """The open blob store, if bodies are being stored."""
+    return _store
+
+
+@contextmanager
+def using(directory: Path | None) -> Generator[BlobStore | None]:
+    """Store response bodies in ``directory`` for the duration of the block.
+
+    Does nothing when ``directory`` is None.
+    """
+    global _store  # noqa: PLW0603
+    if directory is None:
+        yield None
+        return
+    _store = BlobStore(directory)
+    try:
+        yield _store
+    finally:
+        _store = None
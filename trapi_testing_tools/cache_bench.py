@@ -0,0 +1,260 @@
+"""Cache effectiveness benchmarking (`tt cache-bench`).
+
+Each query file's (last) step is run alternately cold (``bypass_cache: true``)
+and warm (the cache allowed), after one unmeasured warm run to fill the cache.
+The speedup is the ratio of mean cold to mean warm elapsed time, with a
+bootstrap confidence interval over the cold/warm pairs; a query whose interval
+doesn't clear the minimum speedup is flagged as a regression.
+"""
+
+import asyncio
+import json
+import random
+import re
+import statistics
+from dataclasses import dataclass, replace
+from typing import Any, TypedDict, cast
+
+import httpx
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from tests import trapi
+from trapi_testing_tools import async_jobs, transport
+from trapi_testing_tools.config import CONFIG
+from trapi_testing_tools.report import ElapsedStats, StepRun, elapsed_stats
+from trapi_testing_tools.types import Query
+
+console = Console(stderr=True)
+
+BOOTSTRAP_RESAMPLES = 2000
+
+CACHED_QEDGES = re.compile(r"\(([1-9][0-9]*)\) cached qEdges")
+"""The log `logs.FoundCacheLog` checks for, capturing the qEdge count."""
+
+
+class CacheBenchResult(TypedDict):
+    """Cold vs. warm results for one query file in one environment."""
+
+    path: str
+    env: str
+    rounds: int  # completed cold/warm pairs
+    cold: ElapsedStats | None
+    warm: ElapsedStats | None
+    speedup: float | None  # mean cold / mean warm
+    speedup_ci: tuple[float, float] | None
+    cached_qedges: list[int]  # per warm run, as reported by the logs
+    errors: list[str]
+    regression: bool  # warm runs weren't meaningfully faster (or errored)
+
+
+@dataclass
+class CacheBenchTarget:
+    """One query file's step to benchmark against one environment."""
+
+    name: str
+    env: str
+    url: str
+    query: Query
+
+
+def _variant(query: Query, bypass: bool) -> Query:
+    """The query with the cache bypassed (cold) or allowed (warm)."""
+    body = dict(cast(dict[str, Any], query.body))
+    if bypass:
+        body["bypass_cache"] = True
+    else:
+        body.pop("bypass_cache", None)
+    return replace(query, body=body)
+
+
+async def _run(client: httpx.AsyncClient, query: Query, url: str) -> StepRun:
+    """Run one sync or async step to completion."""
+    if "asyncquery" in (query.endpoint or ""):
+        return await async_jobs.collect(
+            client, await async_jobs.submit(client, query, url)
+        )
+    target = url + (query.endpoint or "")
+    try:
+        response = await transport.asend(
+            client,
+            method=query.method,
+            url=target,
+            params=query.params,
+            headers=query.headers,
+            payload=query.payload,
+        )
+    except httpx.RequestError as error:
+        status = "timeout" if isinstance(error, httpx.TimeoutException) else "error"
+        return StepRun(None, status, None, repr(error), 0.0, target, query.method)
+    elapsed = response.elapsed.total_seconds()
+    return StepRun(
+        response, "ok", response.status_code, None, elapsed, target, query.method
+    )
+
+
+def _failure(run: StepRun) -> str | None:
+    """Why a run can't be counted, if it can't."""
+    if run.status != "ok" or run.response is None:
+        return run.error or run.status
+    if run.http_status is not None and run.http_status >= httpx.codes.BAD_REQUEST:
+        return f"HTTP {run.http_status}"
+    return None
+
+
+def _cached_qedges(response: httpx.Response | None) -> int:
+    """The cached qEdge count a response's logs report (0 if none)."""
+    try:
+        body = cast(dict[str, Any], trapi.as_json(cast(httpx.Response, response)))
+        logs = body["logs"]
+    except Exception:
+        return 0
+    counts = [
+        int(match.group(1))
+        for log in logs or []
+        if (match := CACHED_QEDGES.search(log.get("message") or ""))
+    ]
+    return max(counts, default=0)
+
+
+def speedup_interval(
+    cold: list[float], warm: list[float], confidence: float, seed: int = 0
+) -> tuple[float, float]:
+    """A percentile-bootstrap interval for mean(cold) / mean(warm).
+
+    Cold/warm pairs are resampled together, since each pair ran back to back.
+    """
+    rng = random.Random(seed)
+    pairs = list(zip(cold, warm, strict=True))
+    ratios: list[float] = []
+    for _ in range(BOOTSTRAP_RESAMPLES):
+        sample = rng.choices(pairs, k=len(pairs))
+        warm_mean = statistics.fmean(w for _c, w in sample)
+        if warm_mean > 0:
+            ratios.append(statistics.fmean(c for c, _w in sample) / warm_mean)
+    ratios.sort()
+    tail = (1 - confidence) / 2
+    low = ratios[int(tail * (len(ratios) - 1))]
+    high = ratios[int((1 - tail) * (len(ratios) - 1))]
+    return round(low, 3), round(high, 3)
+
+
+async def _bench(
+    client: httpx.AsyncClient,
+    target: CacheBenchTarget,
+    rounds: int,
+    min_speedup: float,
+    confidence: float,
+) -> CacheBenchResult:
+    cold_query = _variant(target.query, bypass=True)
+    warm_query = _variant(target.query, bypass=False)
+    errors: list[str] = []
+    cold: list[float] = []
+    warm: list[float] = []
+    cached: list[int] = []
+
+    # Fill the cache first, so the first warm run isn't really cold
+    if (error := _failure(await _run(client, warm_query, target.url))) is not None:
+        errors.append(f"priming: {error}")
+    for _ in range(rounds):
+        cold_run = await _run(client, cold_query, target.url)
+        warm_run = await _run(client, warm_query, target.url)
+        failures = [_failure(cold_run), _failure(warm_run)]
+        if any(failures):
+            errors.extend(failure for failure in failures if failure)
+            continue
+        cold.append(cold_run.elapsed)
+        warm.append(warm_run.elapsed)
+        cached.append(_cached_qedges(warm_run.response))
+
+    speedup = interval = None
+    if cold and min(warm) > 0:
+        speedup = round(statistics.fmean(cold) / statistics.fmean(warm), 3)
+        interval = speedup_interval(cold, warm, confidence)
+    return {
+        "path": target.name,
+        "env": target.env,
+        "rounds": len(cold),
+        "cold": elapsed_stats(cold) if cold else None,
+        "warm": elapsed_stats(warm) if warm else None,
+        "speedup": speedup,
+        "speedup_ci": interval,
+        "cached_qedges": cached,
+        "errors": errors,
+        "regression": interval is None or interval[0] < min_speedup,
+    }
+
+
+async def _bench_all(
+    targets: list[CacheBenchTarget],
+    rounds: int,
+    min_speedup: float,
+    confidence: float,
+) -> list[CacheBenchResult]:
+    urls = list(dict.fromkeys(target.url for target in targets))
+    results: list[CacheBenchResult] = []
+    async with transport.async_client(urls) as client:
+        if CONFIG.transport.warmup:
+            await transport.warm_up_async(client, urls)
+        with console.status("Benchmarking cache...") as status:
+            for target in targets:
+                status.update(f"Benchmarking cache: {target.name} · {target.env}")
+                results.append(
+                    await _bench(client, target, rounds, min_speedup, confidence)
+                )
+    return results
+
+
+def run_cache_bench(
+    targets: list[CacheBenchTarget],
+    rounds: int,
+    min_speedup: float,
+    confidence: float = 0.95,
+) -> list[CacheBenchResult]:
+    """Benchmark each target's cold vs. warm runs, one target at a time.
+
+    Targets run one after another so they don't contend with each other.
+    """
+    return asyncio.run(_bench_all(targets, rounds, min_speedup, confidence))
+
+
+def print_cache_bench(results: list[CacheBenchResult], min_speedup: float) -> None:
+    """Print cache benchmark results as a table, flagging regressions."""
+    table = Table(
+        title="Cache Benchmark",
+        title_style="bold",
+        box=box.SIMPLE,
+        caption=f"Median elapsed seconds. Regression: speedup CI below {min_speedup:g}x.",
+    )
+    table.add_column("Query / Env", style="rule.line", overflow="fold")
+    for column in ("Rounds", "Cold", "Warm", "Speedup", "CI", "Cached qEdges"):
+        table.add_column(column, justify="right", no_wrap=True)
+
+    for result in results:
+        style = "red" if result["regression"] else "green"
+        cold, warm, interval = result["cold"], result["warm"], result["speedup_ci"]
+        cached = sorted(set(result["cached_qedges"]))
+        table.add_row(
+            f"{result['path']}\n[bright_black]{result['env']}[/]",
+            str(result["rounds"]),
+            f"{cold['median']:.3f}" if cold else "—",
+            f"{warm['median']:.3f}" if warm else "—",
+            f"[{style}]{result['speedup']:.2f}x[/]" if result["speedup"] else "—",
+            f"[{style}]{interval[0]:.2f}-{interval[1]:.2f}[/]" if interval else "—",
+            ", ".join(str(count) for count in cached) or "[red]none[/]",
+        )
+    console.print(table)
+
+    for result in results:
+        if result["errors"]:
+            console.print(
+                f"{result['path']} · {result['env']}: {', '.join(result['errors'])}",
+                style="red",
+                highlight=False,
+            )
+
+
+def emit_cache_bench(results: list[CacheBenchResult]) -> None:
+    """Write cache benchmark results to stdout as JSON."""
+    print(json.dumps(results, ensure_ascii=False))
@@ -0,0 +1,220 @@
+"""A local HTTP listener receiving asyncquery results by TRAPI ``callback``.
+
+While `receiving` is active, async query bodies get a ``callback`` URL pointing
+here, so a job's result arrives (with an exact completion time) instead of being
+discovered by polling; status polls continue only slowly, as a fallback.
+"""
+
+import asyncio
+import secrets
+import threading
+import time
+from collections.abc import Callable, Generator
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, override
+
+import httpx
+
+from trapi_testing_tools import transport
+from trapi_testing_tools.payload import Payload
+from trapi_testing_tools.spool import CHUNK_SIZE, SpooledBody, SpooledResponse
+
+if TYPE_CHECKING:
+    from trapi_testing_tools.config import CallbackConfig
+    from trapi_testing_tools.types import Query
+
+CALLBACK_GRACE = 2.0
+"""Seconds to still wait for a callback after polling shows the job finished."""
+
+
+@dataclass
+class Callback:
+    """A received callback: the posted result, and when it arrived."""
+
+    response: httpx.Response
+    received_at: float  # monotonic
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    if not future.done():  # it may have timed out meanwhile
+        future.set_result(None)
+
+
+@dataclass
+class PendingCallback:
+    """A callback URL handed to one job, and the wait for it to be called.
+
+    Threads wait with `wait`; coroutines with `wait_async`, which holds no thread
+    (the listener wakes them on their own event loop). `close` it once done
+    waiting, so the listener forgets it.
+    """
+
+    url: str
+    _release: Callable[[], None] = lambda: None
+    _arrived: threading.Event = field(default_factory=threading.Event)
+    _callback: Callback | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _waiters: "list[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]]" = field(
+        default_factory=list
+    )
+
+    def deliver(self, callback: Callback) -> None:
+        """Record the job's callback (the first one wins), waking its waiters."""
+        with self._lock:
+            if self._arrived.is_set():
+                return
+            self._callback = callback
+            self._arrived.set()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            with suppress(RuntimeError):  # the loop closed meanwhile
+                loop.call_soon_threadsafe(_resolve, future)
+
+    def wait(self, timeout: float) -> Callback | None:
+        """Block up to ``timeout`` seconds for the callback; None if not yet here."""
+        self._arrived.wait(max(timeout, 0.0))
+        return self._callback
+
+    async def wait_async(self, timeout: float) -> Callback | None:
+        """Await up to ``timeout`` seconds for the callback; None if not yet here."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        waiter = (loop, future)
+        with self._lock:
+            if self._arrived.is_set():
+                return self._callback
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(future, max(timeout, 0.0))
+        except TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        return self._callback
+
+    def close(self) -> None:
+        """Stop listening for the callback; a late one is answered with a 404."""
+        self._release()
+
+
+class CallbackReceiver:
+    """A threaded HTTP server accepting ``POST /callback/<token>``."""
+
+    def __init__(self, config: "CallbackConfig") -> None:
+        """Bind the listener (not yet serving) per ``config``."""
+        self._pending: dict[str, PendingCallback] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((config.host, config.port), self._handler())
+        host, port = self._server.server_address[:2]
+        self.base_url = (config.url or f"http://{host!s}:{port}").rstrip("/")
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def register(self) -> PendingCallback:
+        """A fresh callback URL to give one job, listened for until delivered/closed."""
+        token = secrets.token_urlsafe(12)
+        pending = PendingCallback(
+            f"{self.base_url}/callback/{token}", lambda: self._forget(token)
+        )
+        with self._lock:
+            self._pending[token] = pending
+        return pending
+
+    def _forget(self, token: str) -> None:
+        with self._lock:
+            self._pending.pop(token, None)
+
+    def _deliver(self, token: str, callback: Callback) -> bool:
+        with self._lock:
+            pending = self._pending.pop(token, None)
+        if pending is None:
+            return False
+        pending.deliver(callback)
+        return True
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            @override
+            def log_message(self, format: str, *args: Any) -> None:
+                pass  # Keep the terminal clean
+
+            def do_POST(self) -> None:  # noqa: N802
+                """Accept a job's result."""
+                received_at = time.monotonic()
+                remaining = int(self.headers.get("Content-Length") or 0)
+                body = SpooledBody(transport.spool_threshold())
+                while remaining > 0:
+                    chunk = self.rfile.read(min(remaining, CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    body.write(chunk)
+                    remaining -= len(chunk)
+                token = self.path.rstrip("/").rsplit("/", 1)[-1]
+                headers = {
+                    "Content-Type": self.headers.get("Content-Type", "application/json")
+                }
+                request = httpx.Request("POST", f"{receiver.base_url}{self.path}")
+                response = SpooledResponse(
+                    httpx.Response(200, headers=headers, request=request),
+                    body,
+                    elapsed=timedelta(0),
+                    wire_bytes=body.size,  # as read, before any content decoding
+                )
+                known = self.path.startswith("/callback/") and receiver._deliver(
+                    token, Callback(response, received_at)
+                )
+                self.send_response(200 if known else 404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        return Handler
+
+
+_receiver: CallbackReceiver | None = None
+
+
+def active() -> CallbackReceiver | None:
+    """The running callback receiver, if callback mode is on."""
+    return _receiver
+
+
+@contextmanager
+def receiving(config: "CallbackConfig", enabled: bool = True) -> Generator[None]:
+    """Run a callback receiver for the duration of the block (when ``enabled``)."""
+    global _receiver  # noqa: PLW0603
+    if not enabled:
+        yield
+        return
+    receiver = CallbackReceiver(config)
+    receiver.start()
+    _receiver = receiver
+    try:
+        yield
+    finally:
+        _receiver = None
+        receiver.stop()
+
+
+def with_callback(query: "Query", pending: PendingCallback | None) -> Payload | None:
+    """The query's payload with the job's ``callback`` URL set (dict bodies only).
+
+    Without a callback, that's the query's own payload, encoded once for every send.
+    """
+    if pending is None or not isinstance(query.body, dict):
+        return query.payload
+    return Payload.of({**query.body, "callback": pending.url})
@@ -0,0 +1,217 @@
+"""Recording query runs to a cassette directory, and replaying them offline.
+
+With ``tt test --record DIR`` every step's request (method, endpoint, params and
+a hash of its normalized body) and its final response (status, headers, timing
+and body) are written to ``DIR``; ``tt test --replay DIR`` serves them back
+without touching the network, reporting steps whose query has changed since.
+
+A cassette directory holds an ``index.json`` of entries keyed by environment,
+query file and step, plus a `blobs.BlobStore` of response bodies under
+``blobs/``, named by the SHA-256 of their content, so identical responses are
+stored once.
+"""
+
+import hashlib
+import json
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from typing import Literal, TypedDict, cast
+
+import httpx
+
+from trapi_testing_tools import blobs, timing, transport
+from trapi_testing_tools.report import StepRun, StepStatus
+from trapi_testing_tools.spool import CHUNK_SIZE, SpooledBody, SpooledResponse
+from trapi_testing_tools.timing import StepTiming
+from trapi_testing_tools.types import Query
+from trapi_testing_tools.utils import serialize_body
+
+CassetteMode = Literal["record", "replay"]
+
+# Bodies are stored decoded, so these no longer describe them
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CassetteEntry(TypedDict):
+    """One recorded step: what was asked, and what came back."""
+
+    env: str
+    method: str
+    endpoint: str | None
+    params: dict[str, object]
+    body_hash: str
+    target: str
+    status: StepStatus
+    http_status: int | None
+    error: str | None
+    elapsed_seconds: float
+    elapsed_uncertainty_seconds: float
+    headers: list[tuple[str, str]]
+    timing: StepTiming | None
+    blob: str | None  # SHA-256 of the (decoded) body, None if there was no response
+
+
+def body_hash(query: Query) -> str:
+    """The SHA-256 of a query's body, normalized (key order doesn't matter)."""
+    normalized = json.dumps(
+        serialize_body(query.body), sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def entry_key(env: str, path: Path, step: int) -> str:
+    """The index key of one step of a query file run against one environment."""
+    return f"{env}/{path.as_posix()}#{step}"
+
+
+class Cassette:
+    """A cassette directory, open for recording or replaying."""
+
+    def __init__(self, directory: Path, mode: CassetteMode) -> None:
+        """Open ``directory``, loading its index if there is one."""
+        self.directory = directory
+        self.mode: CassetteMode = mode
+        self.mismatches: list[str] = []
+        self._lock = threading.Lock()
+        self._blobs = blobs.BlobStore(directory / "blobs")
+        index = directory / "index.json"
+        self._entries: dict[str, CassetteEntry] = (
+            json.loads(index.read_text(encoding="utf8")) if index.exists() else {}
+        )
+        if mode == "replay" and not index.exists():
+            raise FileNotFoundError(f"No cassette index at {index}")
+
+    def _store_body(self, response: httpx.Response) -> str:
+        """Store a response's body, returning its digest."""
+        stored = self._blobs.put_bytes(response.iter_bytes(CHUNK_SIZE))
+        return stored[blobs.BLOB_KEY].removeprefix(blobs.DIGEST_PREFIX)
+
+    def record(self, key: str, env: str, query: Query, run: StepRun) -> None:
+        """Record a step's run (replacing any earlier recording of it)."""
+        response = run.response
+        entry: CassetteEntry = {
+            "env": env,
+            "method": query.method,
+            "endpoint": query.endpoint,
+            "params": query.params,
+            "body_hash": body_hash(query),
+            "target": run.target,
+            "status": run.status,
+            "http_status": run.http_status,
+            "error": run.error,
+            "elapsed_seconds": run.elapsed,
+            "elapsed_uncertainty_seconds": run.uncertainty,
+            "headers": list(response.headers.multi_items()) if response else [],
+            "timing": timing.phases(response) if response else None,
+            "blob": self._store_body(response) if response else None,
+        }
+        with self._lock:
+            self._entries[key] = entry
+
+    def entries(self) -> list[CassetteEntry]:
+        """Every recorded step."""
+        return list(self._entries.values())
+
+    def read_blob(self, digest: str) -> bytes:
+        """A recorded body, whole."""
+        return self._blobs.read_bytes(blobs.ref(digest))
+
+    def _mismatch(self, key: str, query: Query) -> str | None:
+        """How a query differs from its recording, if it does."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return "not recorded"
+        changed = [
+            field
+            for field, recorded, current in (
+                ("method", entry["method"], query.method),
+                ("endpoint", entry["endpoint"], query.endpoint),
+                ("params", entry["params"], query.params),
+                ("body", entry["body_hash"], body_hash(query)),
+            )
+            if recorded != current
+        ]
+        return f"{', '.join(changed)} changed since recording" if changed else None
+
+    def replay(self, key: str, query: Query, url: str) -> StepRun:
+        """The recorded run of a step, or an errored run if it doesn't match."""
+        mismatch = self._mismatch(key, query)
+        if mismatch is not None:
+            with self._lock:
+                self.mismatches.append(f"{key}: {mismatch}")
+            target = url + (query.endpoint or "")
+            return StepRun(
+                None, "error", None, f"cassette: {mismatch}", 0.0, target, query.method
+            )
+
+        entry = self._entries[key]
+        response = None
+        if entry["blob"] is not None:
+            body = SpooledBody(transport.spool_threshold())
+            stored = blobs.StoredBody(self._blobs.path(blobs.ref(entry["blob"])))
+            for chunk in stored.chunks():
+                body.write(chunk)
+            source = httpx.Response(
+                cast(int, entry["http_status"]),
+                headers=[
+                    (name, value)
+                    for name, value in entry["headers"]
+                    if name.lower() not in _DROPPED_HEADERS
+                ],
+                request=httpx.Request(entry["method"], entry["target"]),
+                extensions={"recorded_timing": entry["timing"]},
+            )
+            elapsed = timedelta(seconds=entry["elapsed_seconds"])
+            response = SpooledResponse(source, body, elapsed)
+        return StepRun(
+            response,
+            entry["status"],
+            entry["http_status"],
+            entry["error"],
+            entry["elapsed_seconds"],
+            entry["target"],
+            entry["method"],
+            entry["elapsed_uncertainty_seconds"],
+        )
+
+    def save(self) -> None:
+        """Write the index (recording only)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        index = self.directory / "index.json"
+        temporary = index.with_suffix(".json.tmp")
+        with self._lock:
+            temporary.write_text(
+                json.dumps(self._entries, indent=2, sort_keys=True), encoding="utf8"
+            )
+        temporary.replace(index)
+
+
+_cassette: Cassette | None = None
+
+
+def active() -> Cassette | None:
+    """The open cassette, if recording or replaying."""
+    return _cassette
+
+
+@contextmanager
+def using(directory: Path | None, mode: CassetteMode) -> Generator[Cassette | None]:
+    """Record to or replay from ``directory`` for the duration of the block.
+
+    Does nothing when ``directory`` is None. A recording's index is saved on exit.
+    """
+    global _cassette  # noqa: PLW0603
+    if directory is None:
+        yield None
+        return
+    cassette = Cassette(directory, mode)
+    _cassette = cassette
+    try:
+        yield cassette
+    finally:
+        _cassette = None
+        if mode == "record":
+            cassette.save()
@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.console import Console
+
+from trapi_testing_tools.bench import (
+    BENCHMARKS,
+    DEFAULT_SIZES,
+    BenchReport,
+    compare,
+    emit,
+    print_comparison,
+    print_report,
+    run_benchmarks,
+)
+
+console = Console(stderr=True)
+app = typer.Typer(
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+
+
+@app.command("bench", help="Benchmark tests and analyses against synthetic responses.")
+def bench(  # noqa: PLR0913
+    benchmarks: Annotated[
+        list[str] | None,
+        typer.Argument(
+            help="Benchmarks to run, by name or prefix (e.g. kg). Default: all."
+        ),
+    ] = None,
+    sizes: Annotated[
+        list[int] | None,
+        typer.Option(
+            "--size",
+            "-s",
+            min=10,
+            help="Response size(s) in edges (default 1000, 10000, 100000).",
+        ),
+    ] = None,
+    repeat: Annotated[
+        int, typer.Option("--repeat", "-n", min=2, help="Timed calls per benchmark.")
+    ] = 5,
+    output: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", dir_okay=False, help="Save results as JSON."),
+    ] = None,
+    baseline: Annotated[
+        Path | None,
+        typer.Option(
+            "--compare",
+            "-c",
+            exists=True,
+            dir_okay=False,
+            help="Compare against saved results, failing on significant regressions.",
+        ),
+    ] = None,
+    threshold: Annotated[
+        float,
+        typer.Option(
+            "--threshold",
+            "-t",
+            min=0,
+            help="Slowdown (e.g. 0.1 = 10%) a regression must exceed.",
+        ),
+    ] = 0.1,
+    alpha: Annotated[
+        float,
+        typer.Option(
+            "--alpha", min=0, max=1, help="Significance level for regressions."
+        ),
+    ] = 0.05,
+    pipe: Annotated[
+        bool,
+        typer.Option("--pipe", "-p", help="Output the results as JSON to stdout."),
+    ] = False,
+    list_benchmarks: Annotated[
+        bool, typer.Option("--list", "-l", help="List the benchmarks and exit.")
+    ] = False,
+) -> None:
+    """Time tests and analyses on synthetic responses of increasing size."""
+    if list_benchmarks:
+        for name in BENCHMARKS:
+            print(name)
+        return
+
+    names = [
+        name
+        for name in BENCHMARKS
+        if not benchmarks
+        or any(name == wanted or name.startswith(f"{wanted}.") for wanted in benchmarks)
+    ]
+    if not names:
+        console.print(f"No benchmarks match. Available: {', '.join(BENCHMARKS)}")
+        raise typer.Exit(1)
+
+    report = run_benchmarks(names, sizes or list(DEFAULT_SIZES), repeat)
+    print_report(report)
+    if output is not None:
+        output.write_text(json.dumps(report, indent=2), encoding="utf8")
+
+    comparisons = None
+    if baseline is not None:
+        saved: BenchReport = json.loads(baseline.read_text(encoding="utf8"))
+        comparisons = compare(saved, report, threshold, alpha)
+        print_comparison(comparisons)
+    if pipe:
+        emit(report if comparisons is None else {**report, "comparison": comparisons})
+    if comparisons and any(row["regression"] for row in comparisons):
+        raise typer.Exit(1)
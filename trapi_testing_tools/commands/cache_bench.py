@@ -0,0 +1,110 @@
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.console import Console
+
+from trapi_testing_tools.cache_bench import (
+    CacheBenchTarget,
+    emit_cache_bench,
+    print_cache_bench,
+    run_cache_bench,
+)
+from trapi_testing_tools.commands.utils import (
+    read_query_files,
+    set_environment,
+    set_queries,
+)
+from trapi_testing_tools.utils import ENVIRONMENT_MAPPING
+
+console = Console(stderr=True)
+app = typer.Typer(
+    no_args_is_help=True,
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+
+
+def _bench_targets(files: list[Path], environment: list[str]) -> list[CacheBenchTarget]:
+    """Pair each query file's last step with every environment.
+
+    Only POST steps with a dict body can have their cache bypassed.
+    """
+    targets: list[CacheBenchTarget] = []
+    for file, steps in read_query_files(files):
+        query = steps[-1]
+        if query.method != "POST" or not isinstance(query.body, dict):
+            console.print(
+                f"INFO: skipping {file}, its query isn't a POST with a body.",
+                style="italic bright_black",
+            )
+            continue
+        targets.extend(
+            CacheBenchTarget(str(file), env, ENVIRONMENT_MAPPING[env], query)
+            for env in environment
+        )
+    return targets
+
+
+@app.command(
+    "cache-bench | cb",
+    help="Measure how much faster cached queries run than cold ones.",
+)
+def cache_bench(  # noqa: PLR0913
+    queries: Annotated[
+        list[Path] | None,
+        typer.Argument(help="One or more query files or folders (recursive) to run."),
+    ] = None,
+    environment: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--environment",
+            "--env",
+            "-e",
+            help="Environment(s) to benchmark (e.g. bte.dev).",
+        ),
+    ] = None,
+    rounds: Annotated[
+        int,
+        typer.Option(
+            "--rounds",
+            "-n",
+            min=2,
+            help="Cold/warm pairs to run for each query and environment.",
+        ),
+    ] = 5,
+    min_speedup: Annotated[
+        float,
+        typer.Option(
+            "--min-speedup",
+            "-m",
+            min=1,
+            help="Flag a regression unless the speedup's confidence interval is entirely above this.",
+        ),
+    ] = 1.5,
+    confidence: Annotated[
+        float,
+        typer.Option(
+            "--confidence",
+            min=0.5,
+            max=0.999,
+            help="Confidence level of the speedup interval.",
+        ),
+    ] = 0.95,
+    pipe: Annotated[
+        bool,
+        typer.Option("--pipe", "-p", help="Output the results as JSON to stdout."),
+    ] = False,
+) -> None:
+    """Alternate cold (bypass_cache) and warm runs of queries, reporting the speedup."""
+    files, _ = set_queries(queries)
+    environment, _ = set_environment(environment)
+    targets = _bench_targets(files, environment)
+    if not targets:
+        raise typer.Abort()
+
+    results = run_cache_bench(targets, rounds, min_speedup, confidence)
+    print_cache_bench(results, min_speedup)
+    if pipe:
+        emit_cache_bench(results)
+    if any(result["regression"] for result in results):
+        raise typer.Exit(1)
@@ -7,7 +7,6 @@ from types import ModuleType
 from typing import Annotated
 
 import typer
-from InquirerPy.prompts.confirm import ConfirmPrompt
 from rich.console import Console
 
 import trapi_testing_tools
@@ -49,6 +48,8 @@ def curl(
 
     queries = parse_query(query_module)
 
+    from InquirerPy.prompts.confirm import ConfirmPrompt
+
     if (
         len(queries) > 1
         and not ConfirmPrompt(
@@ -97,6 +98,8 @@ def check_file(file: Path) -> ModuleType:
         return query
     except Exception as error:
         console.print(f"ERROR: failed to read query file due to {error!r}.")
+        from InquirerPy.prompts.confirm import ConfirmPrompt
+
         with redirect_stdout(stderr):
             if ConfirmPrompt(
                 "Print traceback for this error?", default=False
@@ -0,0 +1,90 @@
+from contextlib import closing
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.console import Console
+
+from trapi_testing_tools.history import (
+    Bucket,
+    connect,
+    default_path,
+    emit,
+    print_trends,
+    samples,
+    trends,
+)
+
+console = Console(stderr=True)
+app = typer.Typer(
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+
+
+@app.command("history | hist", help="Show latency trends of past tt test runs.")
+def history(  # noqa: PLR0913
+    queries: Annotated[
+        list[str] | None,
+        typer.Argument(
+            help="Query paths or path prefixes (e.g. queries/routine/sync). Default: all."
+        ),
+    ] = None,
+    environment: Annotated[
+        list[str] | None,
+        typer.Option("--environment", "--env", "-e", help="Only these environment(s)."),
+    ] = None,
+    days: Annotated[
+        int | None,
+        typer.Option("--days", "-D", min=1, help="Only runs from the last N days."),
+    ] = None,
+    bucket: Annotated[
+        Bucket,
+        typer.Option("--by", "-b", help="Group runs into periods by run, day or week."),
+    ] = "day",
+    detail: Annotated[
+        bool,
+        typer.Option(
+            "--detail",
+            "-d",
+            help="Also show each query's periods, highlighting server version changes.",
+        ),
+    ] = False,
+    pipe: Annotated[
+        bool,
+        typer.Option("--pipe", "-p", help="Output the trends as JSON to stdout."),
+    ] = False,
+    database: Annotated[
+        Path | None,
+        typer.Option(
+            "--database",
+            dir_okay=False,
+            help="History database to read (default: the one tt test records to).",
+        ),
+    ] = None,
+) -> None:
+    """Show per query and environment latency percentiles over time."""
+    path = database or default_path()
+    if not path.exists():
+        console.print(f"No run history yet ({path} doesn't exist).")
+        raise typer.Exit(1)
+    since = (
+        None
+        if days is None
+        else (datetime.now(UTC) - timedelta(days=days)).isoformat(timespec="seconds")
+    )
+    with closing(connect(path)) as connection:
+        grouped = samples(
+            connection,
+            [query.rstrip("/") for query in queries or []],
+            environment or [],
+            since,
+        )
+    if not grouped:
+        console.print("No recorded runs match.")
+        raise typer.Exit(1)
+
+    result = trends(grouped, bucket)
+    print_trends(result, detail)
+    if pipe:
+        emit(result)
@@ -0,0 +1,99 @@
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.console import Console
+
+from trapi_testing_tools.commands.utils import (
+    read_query_files,
+    set_environment,
+    set_queries,
+)
+from trapi_testing_tools.load import (
+    LoadTarget,
+    emit_load_report,
+    print_load_report,
+    run_load,
+)
+from trapi_testing_tools.utils import ENVIRONMENT_MAPPING
+
+console = Console(stderr=True)
+app = typer.Typer(
+    no_args_is_help=True,
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+
+
+def _load_targets(files: list[Path], environment: list[str]) -> list[LoadTarget]:
+    """Pair each query file's steps with every environment."""
+    return [
+        LoadTarget(str(file), env, ENVIRONMENT_MAPPING[env], steps)
+        for file, steps in read_query_files(files)
+        for env in environment
+    ]
+
+
+@app.command("load | l", help="Put sustained load on environments using query files.")
+def load(  # noqa: PLR0913
+    queries: Annotated[
+        list[Path] | None,
+        typer.Argument(help="One or more query files or folders (recursive) to run."),
+    ] = None,
+    environment: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--environment",
+            "--env",
+            "-e",
+            help="Environment(s) to load (e.g. retriever.dev). Queries are spread round-robin across all of them.",
+        ),
+    ] = None,
+    rps: Annotated[
+        float | None,
+        typer.Option(
+            "--rps",
+            "-r",
+            min=0.001,
+            help="Open loop: start query files at this rate, however many are still running.",
+        ),
+    ] = None,
+    concurrency: Annotated[
+        int | None,
+        typer.Option(
+            "--concurrency",
+            "-c",
+            min=1,
+            help="Closed loop: keep this many query files running at once.",
+        ),
+    ] = None,
+    duration: Annotated[
+        float,
+        typer.Option(
+            "--duration",
+            "-t",
+            min=0.001,
+            help="Seconds to keep starting new queries for.",
+        ),
+    ] = 30,
+    pipe: Annotated[
+        bool,
+        typer.Option("--pipe", "-p", help="Output the load report as JSON to stdout."),
+    ] = False,
+) -> None:
+    """Run query files at a target rate or concurrency, reporting latency and errors."""
+    if (rps is None) == (concurrency is None):
+        console.print("Give exactly one of --rps (open loop) or --concurrency.")
+        raise typer.Exit(1)
+
+    files, _ = set_queries(queries)
+    environment, _ = set_environment(environment)
+    targets = _load_targets(files, environment)
+    if not targets:
+        raise typer.Abort()
+
+    report = run_load(targets, duration, rps, concurrency)
+    print_load_report(report)
+    if pipe:
+        emit_load_report(report)
+    if any(stats["errors"] for stats in report["endpoints"]):
+        raise typer.Exit(1)
@@ -0,0 +1,120 @@
+import contextlib
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.console import Console
+
+from trapi_testing_tools.mock_server import Distribution, MockServer, MockSettings
+
+console = Console(stderr=True)
+app = typer.Typer(
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+
+
+def _distribution(spec: str, option: str) -> Distribution:
+    try:
+        return Distribution.parse(spec)
+    except ValueError as error:
+        console.print(f"Invalid {option}: {error}")
+        raise typer.Exit(1) from error
+
+
+@app.command("mock-server | mock", help="Serve a local mock TRAPI service.")
+def mock_server(  # noqa: PLR0913
+    fixtures: Annotated[
+        Path | None,
+        typer.Option(
+            "--fixtures",
+            "-f",
+            file_okay=False,
+            exists=True,
+            help="Directory of response fixtures, or a cassette from `tt test --record`.",
+        ),
+    ] = None,
+    host: Annotated[str, typer.Option("--host", help="Address to bind.")] = "127.0.0.1",
+    port: Annotated[int, typer.Option("--port", "-P", help="Port to bind.")] = 8787,
+    latency: Annotated[
+        str,
+        typer.Option(
+            "--latency",
+            "-l",
+            help="Seconds before each response: a number, or fixed:S, uniform:LOW,HIGH, exponential:MEAN or lognormal:MEDIAN,SIGMA.",
+        ),
+    ] = "0",
+    job_duration: Annotated[
+        str,
+        typer.Option(
+            "--job-duration",
+            "-j",
+            help="Seconds an asyncquery job runs for, as a distribution (see --latency).",
+        ),
+    ] = "1",
+    error_rate: Annotated[
+        float,
+        typer.Option(
+            "--error-rate",
+            min=0,
+            max=1,
+            help="Chance of answering any request with an injected error.",
+        ),
+    ] = 0.0,
+    error_status: Annotated[
+        list[int] | None,
+        typer.Option(
+            "--error-status",
+            help="Status code(s) injected errors use, picked at random (default 500, 502, 503).",
+        ),
+    ] = None,
+    bandwidth: Annotated[
+        int | None,
+        typer.Option(
+            "--bandwidth",
+            "-b",
+            min=1,
+            help="Cap each response's transfer rate, in bytes per second.",
+        ),
+    ] = None,
+    request_encoding: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--request-encoding",
+            help="Content-Encoding(s) accepted on request bodies; others get HTTP 415 (default gzip, deflate; `identity` for none).",
+        ),
+    ] = None,
+    seed: Annotated[
+        int | None,
+        typer.Option("--seed", help="Seed latencies and errors, for repeatable runs."),
+    ] = None,
+) -> None:
+    """Serve mock /query, /asyncquery, status and meta_knowledge_graph endpoints."""
+    settings = MockSettings(
+        fixtures=fixtures,
+        latency=_distribution(latency, "--latency"),
+        job_duration=_distribution(job_duration, "--job-duration"),
+        error_rate=error_rate,
+        error_statuses=tuple(error_status or (500, 502, 503)),
+        bandwidth=bandwidth,
+        request_encodings=tuple(request_encoding or ("gzip", "deflate")),
+        seed=seed,
+    )
+    try:
+        server = MockServer(settings, host, port)
+    except OSError as error:  # e.g. the port is already in use
+        console.print(f"ERROR: can't listen on {host}:{port}: {error}", style="red")
+        raise typer.Exit(1) from error
+    console.print(
+        f"Mock TRAPI service at {server.base_url} (Ctrl+C to stop)", highlight=False
+    )
+    with contextlib.suppress(KeyboardInterrupt):
+        server.serve_forever()
+    console.print(
+        "Responses by status: "
+        + (
+            ", ".join(f"{code} x{n}" for code, n in sorted(server.counts.items()))
+            or "none"
+        ),
+        style="italic bright_black",
+        highlight=False,
+    )
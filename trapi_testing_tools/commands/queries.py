@@ -0,0 +1,102 @@
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.console import Console
+
+import queries as query_list
+from trapi_testing_tools.commands.utils import set_queries
+from trapi_testing_tools.manifest import (
+    Manifest,
+    ManifestEntry,
+    Mode,
+    Selection,
+    default_path,
+    emit,
+    print_entries,
+)
+
+console = Console(stderr=True)
+app = typer.Typer(
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+
+
+@app.command(
+    "queries | q",
+    help="List query files with their steps, tests and tags, from the query manifest.",
+)
+def list_queries(  # noqa: PLR0913
+    queries: Annotated[
+        list[Path] | None,
+        typer.Argument(
+            help="Query files or folders (recursive) to list. Default: all of queries/."
+        ),
+    ] = None,
+    endpoints: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--endpoint",
+            help="Only queries with a step to this endpoint (a glob, e.g. /query). Repeatable (any).",
+        ),
+    ] = None,
+    methods: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--method",
+            help="Only queries with a step using this HTTP method. Repeatable (any).",
+        ),
+    ] = None,
+    mode: Annotated[
+        Mode | None,
+        typer.Option("--mode", help="Only sync queries, or async (asyncquery) ones."),
+    ] = None,
+    tags: Annotated[
+        list[str] | None,
+        typer.Option("--tag", help="Only queries with this tag. Repeatable (all)."),
+    ] = None,
+    refresh: Annotated[
+        bool,
+        typer.Option(
+            "--refresh",
+            help="Recompile every listed file, e.g. after changing a file one reads.",
+        ),
+    ] = False,
+    pipe: Annotated[
+        bool,
+        typer.Option("--pipe", "-p", help="Output the entries as JSON to stdout."),
+    ] = False,
+) -> None:
+    """List compiled query files, importing only those changed since last listed."""
+    files, _ = set_queries(queries or [Path(query_list.__path__[0])])
+    selection = Selection(endpoints or [], methods or [], mode, tags or [])
+    manifest = Manifest(default_path(), refresh=refresh)
+    entries: list[ManifestEntry] = []
+    failed = False
+    with console.status("Compiling query files..."):
+        for file in files:
+            if file.suffix != ".py":
+                continue
+            try:
+                entry = manifest.entry(file)
+            except Exception as error:
+                console.print(
+                    f"ERROR: failed to compile {file}: {error!r}", style="red"
+                )
+                failed = True
+                continue
+            if selection.matches(entry):
+                entries.append(entry)
+    manifest.save()
+
+    print_entries(entries)
+    console.print(
+        f"{len(entries)} of {len(files)} query file(s); {manifest.compiled} compiled, "
+        f"the rest served from {manifest.path}.",
+        style="italic bright_black",
+        highlight=False,
+    )
+    if pipe:
+        emit(entries)
+    if failed:
+        raise typer.Exit(1)
@@ -0,0 +1,63 @@
+import json
+import sys
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.console import Console
+
+from trapi_testing_tools.blobs import BlobStore, resolve
+from trapi_testing_tools.report import write_json
+
+console = Console(stderr=True)
+app = typer.Typer(
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+
+
+@app.command(
+    "resolve",
+    help="Put stored bodies back into a report or saved response written with --blobs.",
+)
+def resolve_blobs(
+    blob_store: Annotated[
+        Path,
+        typer.Option(
+            "--blobs",
+            "-b",
+            exists=True,
+            file_okay=False,
+            help="The blob store directory the references point into.",
+        ),
+    ],
+    file: Annotated[
+        Path | None,
+        typer.Argument(
+            exists=True,
+            dir_okay=False,
+            help="Report, NDJSON report or saved response (default: stdin).",
+        ),
+    ] = None,
+) -> None:
+    """Write the input to stdout with each blob reference replaced by its body.
+
+    Bodies are streamed from the store rather than decoded. Each line of NDJSON
+    input is resolved separately.
+    """
+    store = BlobStore(blob_store)
+    source = file.open(encoding="utf8") if file is not None else sys.stdin
+    out = sys.stdout.buffer
+    try:
+        with source:
+            text = source.read()
+        try:
+            records = [json.loads(text)]
+        except json.JSONDecodeError:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        for record in records:
+            write_json(resolve(record, store, lazy=True), out)
+            out.write(b"\n")
+    except (ValueError, FileNotFoundError) as error:
+        console.print(f"ERROR: {error}", style="red")
+        raise typer.Exit(1) from error
+    out.flush()
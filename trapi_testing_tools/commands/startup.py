@@ -0,0 +1,78 @@
+from typing import Annotated
+
+import typer
+from rich.console import Console
+
+from trapi_testing_tools.startup import (
+    all_commands,
+    emit,
+    print_results,
+    run_startup,
+)
+
+console = Console(stderr=True)
+app = typer.Typer(
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+
+
+@app.command(
+    "startup",
+    help="Measure each subcommand's import time against a startup budget.",
+)
+def startup(
+    commands: Annotated[
+        list[str] | None,
+        typer.Argument(
+            help="Subcommands to measure, by name or alias (`tt` for the bare app). Default: all."
+        ),
+    ] = None,
+    repeat: Annotated[
+        int, typer.Option("--repeat", "-n", min=1, help="Cold starts per command.")
+    ] = 5,
+    budget: Annotated[
+        float | None,
+        typer.Option(
+            "--budget",
+            "-b",
+            min=0,
+            help="Seconds every command may spend importing (default: per-command budgets).",
+        ),
+    ] = None,
+    pipe: Annotated[
+        bool,
+        typer.Option("--pipe", "-p", help="Output the results as JSON to stdout."),
+    ] = False,
+) -> None:
+    """Fail if any subcommand's imports take longer than its budget."""
+    known = all_commands()
+    selected: list[str] = []
+    for name in commands or known:
+        match = next(
+            (
+                command
+                for command in known
+                if name == command or name in command.split(" | ")
+            ),
+            None,
+        )
+        if match is None:
+            console.print(
+                f"Unknown command: {name}. Available: {', '.join(known)}", style="red"
+            )
+            raise typer.Exit(1)
+        selected.append(match)
+
+    try:
+        results = run_startup(selected, repeat, budget)
+    except RuntimeError as error:
+        console.print(f"Couldn't measure startup: {error}", style="red")
+        raise typer.Exit(1) from error
+    print_results(results)
+    if pipe:
+        emit(results)
+
+    over = [result["command"] for result in results if result["over_budget"]]
+    if over:
+        console.print(f"Over budget: {', '.join(over)}", style="bold red")
+        raise typer.Exit(1)
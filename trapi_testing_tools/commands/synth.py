@@ -0,0 +1,89 @@
+import sys
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.console import Console
+
+from trapi_testing_tools.synth import SynthSpec, synthesize
+
+console = Console(stderr=True)
+app = typer.Typer(
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+
+
+@app.command("synth", help="Generate a synthetic TRAPI response for scale testing.")
+def synth(  # noqa: PLR0913
+    nodes: Annotated[
+        int, typer.Option("--nodes", "-N", min=0, help="Knowledge graph nodes.")
+    ] = 1000,
+    edges: Annotated[
+        int, typer.Option("--edges", "-E", min=0, help="Knowledge graph edges.")
+    ] = 1000,
+    results: Annotated[
+        int, typer.Option("--results", "-R", min=0, help="Results.")
+    ] = 100,
+    analyses: Annotated[
+        int, typer.Option("--analyses", "-A", min=1, help="Analyses per result.")
+    ] = 1,
+    aux_graphs: Annotated[
+        int,
+        typer.Option("--aux-graphs", "-G", min=0, help="Auxiliary (support) graphs."),
+    ] = 0,
+    depth: Annotated[
+        int,
+        typer.Option(
+            "--depth", "-D", min=0, help="How deeply support graphs nest in each other."
+        ),
+    ] = 1,
+    attribute_bytes: Annotated[
+        int,
+        typer.Option(
+            "--attribute-bytes",
+            "-b",
+            min=0,
+            help="Size of an extra payload attribute added to every edge.",
+        ),
+    ] = 0,
+    logs: Annotated[int, typer.Option("--logs", "-L", min=0, help="Log entries.")] = 10,
+    broken: Annotated[
+        int,
+        typer.Option(
+            "--broken",
+            min=0,
+            help="Make this many results bind a node and edge missing from the knowledge graph.",
+        ),
+    ] = 0,
+    seed: Annotated[
+        int, typer.Option("--seed", help="Seed, for reproducible output.")
+    ] = 0,
+    output: Annotated[
+        Path | None,
+        typer.Option(
+            "--output", "-o", dir_okay=False, help="Write to a file instead of stdout."
+        ),
+    ] = None,
+) -> None:
+    """Stream a synthetic TRAPI response with the given counts to stdout or a file."""
+    spec = SynthSpec(
+        nodes=nodes,
+        edges=edges,
+        results=results,
+        analyses=analyses,
+        aux_graphs=aux_graphs,
+        depth=depth,
+        attribute_bytes=attribute_bytes,
+        logs=logs,
+        broken=broken,
+        seed=seed,
+    )
+    try:
+        if output is None:
+            synthesize(spec, sys.stdout)
+        else:
+            with output.open("w", encoding="utf8", buffering=1024 * 1024) as file:
+                synthesize(spec, file)
+    except ValueError as error:
+        console.print(f"Invalid response shape: {error}")
+        raise typer.Exit(1) from error
@@ -5,11 +5,15 @@ import typer
 from rich.console import Console
 
 import queries as query_list
+from trapi_testing_tools import baseline, history
 from trapi_testing_tools.commands.utils import (
+    select_queries,
     set_environment,
     set_output_modes,
     set_queries,
 )
+from trapi_testing_tools.config import CONFIG
+from trapi_testing_tools.manifest import Mode, Selection
 from trapi_testing_tools.run_query import run_queries
 from trapi_testing_tools.utils import (
     ENVIRONMENT_MAPPING,
@@ -43,6 +47,33 @@ def test(  # noqa: PLR0913
             "--all", "-a", help="Select all routine files (overrides file arguments)."
         ),
     ] = False,
+    endpoints: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--endpoint",
+            help="Only run queries with a step to this endpoint (a glob, e.g. /query). Repeatable (any).",
+        ),
+    ] = None,
+    methods: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--method",
+            help="Only run queries with a step using this HTTP method. Repeatable (any).",
+        ),
+    ] = None,
+    mode: Annotated[
+        Mode | None,
+        typer.Option(
+            "--mode", help="Only run sync queries, or async (asyncquery) ones."
+        ),
+    ] = None,
+    tags: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--tag",
+            help="Only run queries with this tag (see `tt queries`). Repeatable (all).",
+        ),
+    ] = None,
     debug: Annotated[
         bool,
         typer.Option(
@@ -92,36 +123,148 @@ def test(  # noqa: PLR0913
             help="Implies --pipe; emit the run/test report with no response bodies.",
         ),
     ] = False,
+    ndjson: Annotated[
+        bool,
+        typer.Option(
+            "--ndjson",
+            help="Implies --pipe; emit each query's result as a JSON line as soon as it finishes, then a summary line.",
+        ),
+    ] = False,
+    blob_store: Annotated[
+        Path | None,
+        typer.Option(
+            "--blobs",
+            file_okay=False,
+            help="Keep piped/saved JSON response bodies in a content-addressed store directory, referenced by hash (see `tt resolve`).",
+        ),
+    ] = None,
+    no_history: Annotated[
+        bool,
+        typer.Option(
+            "--no-history",
+            help="Don't record this run's timings to the run history (see `tt history`).",
+        ),
+    ] = False,
+    baseline_sources: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--baseline",
+            help="Fail on latency/response size regressions against a -p/-r/--ndjson report file, or `history` (`history:DAYS`) for recorded runs. Repeatable (pooled).",
+        ),
+    ] = None,
+    concurrency: Annotated[
+        int,
+        typer.Option(
+            "--concurrency",
+            "-c",
+            min=1,
+            help="Run up to N query/environment pairs at once. Each query's output is printed as a block when it finishes.",
+        ),
+    ] = 1,
+    collect_async: Annotated[
+        bool,
+        typer.Option(
+            "--collect-async",
+            "-A",
+            help="Submit every asyncquery up front, then poll them all together; each job's tests run as soon as it completes.",
+        ),
+    ] = False,
+    use_callback: Annotated[
+        bool,
+        typer.Option(
+            "--callback",
+            help="Receive asyncquery results at a local callback listener (see config `callback`), polling only as a fallback.",
+        ),
+    ] = False,
+    repeat: Annotated[
+        int,
+        typer.Option(
+            "--repeat",
+            "-n",
+            min=1,
+            help="Run each query N times, testing every run, and report elapsed-time statistics and a pass rate.",
+        ),
+    ] = 1,
+    warmup: Annotated[
+        int,
+        typer.Option(
+            "--warmup",
+            "-w",
+            min=0,
+            help="Run each query K extra times first, leaving them out of the statistics.",
+        ),
+    ] = 0,
+    record: Annotated[
+        Path | None,
+        typer.Option(
+            "--record",
+            file_okay=False,
+            help="Record every request and response to a cassette directory, for --replay.",
+        ),
+    ] = None,
+    replay: Annotated[
+        Path | None,
+        typer.Option(
+            "--replay",
+            file_okay=False,
+            exists=True,
+            help="Serve responses from a --record cassette directory instead of the network, failing steps whose query changed.",
+        ),
+    ] = None,
 ) -> None:
     """Run one or more queries against one or more environments."""
     # cache_tests()
     used_interactive = False
+    if record is not None and replay is not None:
+        console.print("Give at most one of --record or --replay.")
+        raise typer.Exit(1)
 
     if all_routine:
         queries = list(Path(query_list.__path__[0]).rglob("routine/**/*.py"))
     queries, used_interactive = set_queries(queries)
+    selection = Selection(endpoints or [], methods or [], mode, tags or [])
+    queries = select_queries(queries, selection)
     environment, used_interactive = set_environment(environment)
     output_modes = set_output_modes(
-        view, save, no_save, pipe or report, queries, allow_multi=True
+        view, save, no_save, pipe or report or ndjson, queries, allow_multi=True
     )
 
     # Ouptut hint to repeat quicker
     if used_interactive:
         opts = [f"-e {env}" for env in environment]
-        if all_routine:
-            opts.append("-a")
-        if debug:
-            opts.append("-d")
         if view is not None:
             opts.append("-v" if view else "-V")
         if save is not None:
             opts.append(f"-s {save}")
-        if no_save:
-            opts.append("-S")
-        if pipe:
-            opts.append("-p")
-        if report:
-            opts.append("-r")
+        if concurrency > 1:
+            opts.append(f"-c {concurrency}")
+        if repeat > 1:
+            opts.append(f"-n {repeat}")
+        if warmup:
+            opts.append(f"-w {warmup}")
+        if record is not None:
+            opts.append(f"--record {record}")
+        if replay is not None:
+            opts.append(f"--replay {replay}")
+        if blob_store is not None:
+            opts.append(f"--blobs {blob_store}")
+        opts.extend(f"--baseline {source}" for source in baseline_sources or [])
+        opts.extend(selection.flags())
+        opts.extend(
+            flag
+            for flag, given in (
+                ("-a", all_routine),
+                ("-d", debug),
+                ("-S", no_save),
+                ("-p", pipe),
+                ("-r", report),
+                ("--ndjson", ndjson),
+                ("-A", collect_async),
+                ("--callback", use_callback),
+                ("--no-history", no_history),
+            )
+            if given
+        )
         console.print(
             f"\\[Hint] Re-run this command more quickly using: tt test {' '.join(opts)} {' '.join(str(q.relative_to(Path.cwd())) for q in queries)}",
             style="italic bright_black",
@@ -137,7 +280,27 @@ def test(  # noqa: PLR0913
         save,
         debug,
         report,
+        concurrency,
+        collect_async,
+        use_callback,
+        repeat,
+        warmup,
+        record,
+        replay,
+        ndjson,
+        blob_store,
+        history.default_path() if CONFIG.history and not no_history else None,
+        _load_baseline(baseline_sources) if baseline_sources else None,
     )
 
     if not passed:
         raise typer.Exit(1)
+
+
+def _load_baseline(sources: list[str]) -> baseline.Measurements:
+    """Load ``--baseline`` measurements, exiting if they can't be."""
+    try:
+        return baseline.load(sources, CONFIG.baseline)
+    except (OSError, ValueError) as error:
+        console.print(f"Couldn't load the baseline: {error}", style="red")
+        raise typer.Exit(1) from error
@@ -3,18 +3,24 @@ from collections.abc import Sized
 from contextlib import redirect_stdout
 from pathlib import Path
 from sys import stderr
-from typing import Literal, overload
+from typing import TYPE_CHECKING, Literal, overload
 
 import typer
-from InquirerPy.prompts.fuzzy import FuzzyPrompt
 from rich.console import Console
 
 import analysis as analysis_list
 import queries as query_list
-from analysis.base_analysis import Analysis, AnalysisClass, ParametrizedAnalysis
-from trapi_testing_tools.types import OutputModes
+import trapi_testing_tools
+from trapi_testing_tools import manifest
+from trapi_testing_tools.manifest import Manifest, Selection
+from trapi_testing_tools.types import OutputModes, Query
 from trapi_testing_tools.utils import ENVIRONMENT_MAPPING, is_interactive
 
+if TYPE_CHECKING:
+    # Analyses (and translator_tom under them) are imported only when selected, and
+    # prompts only when shown, to keep every command's startup fast (`tt startup`).
+    from analysis.base_analysis import AnalysisClass
+
 console = Console(stderr=True)
 
 
@@ -49,6 +55,8 @@ def set_queries(
             )
             for path in Path(query_list.__path__[0]).rglob("**/*.py")
         ]
+        from InquirerPy.prompts.fuzzy import FuzzyPrompt
+
         with redirect_stdout(stderr):
             selection: list[str] = FuzzyPrompt(
                 message="Select query file(s)...",
@@ -92,6 +100,71 @@ def set_queries(
     return queries, used_interactive
 
 
+def select_queries(queries: list[Path], selection: Selection) -> list[Path]:
+    """Keep the query files matching ``selection``, judged from the manifest.
+
+    Files that can't be compiled are kept, so running them reports why; non-Python
+    files are kept too (they're skipped with a note when run). Exits if nothing
+    matches.
+    """
+    if not selection:
+        return queries
+    compiled = Manifest(manifest.default_path())
+    selected: list[Path] = []
+    for path in queries:
+        if path.suffix != ".py":
+            selected.append(path)
+            continue
+        try:
+            if selection.matches(compiled.entry(path)):
+                selected.append(path)
+        except Exception as error:
+            console.print(
+                f"WARNING: couldn't compile {path} to select it ({error!r}); keeping it.",
+                style="yellow",
+            )
+            selected.append(path)
+    compiled.save()
+    if not selected:
+        console.print(f"No query files match {' '.join(selection.flags())}.")
+        raise typer.Exit(1)
+    console.print(
+        f"INFO: selected {len(selected)} of {len(queries)} query file(s).",
+        style="italic bright_black",
+    )
+    return selected
+
+
+def read_query_files(files: list[Path]) -> list[tuple[Path, list[Query]]]:
+    """Read each query file's steps (relative to the repo root), without tests.
+
+    Served from the query manifest, so unchanged files aren't imported. Non-Python
+    files are skipped; a file that fails to import or parse, or is a query matrix
+    (whose bodies are only built per variant by `tt test`), exits.
+    """
+    root = Path(trapi_testing_tools.__path__[0]).parent
+    compiled = Manifest(manifest.default_path())
+    parsed: list[tuple[Path, list[Query]]] = []
+    for path in files:
+        file = path.resolve().relative_to(root)
+        if file.suffix != ".py":
+            continue
+        try:
+            entry = compiled.entry(path)
+        except Exception as error:
+            console.print(f"ERROR: failed to read query file {file}: {error!r}")
+            raise typer.Exit(1) from error
+        if entry["matrix"]:
+            console.print(
+                f"ERROR: {file} is a query matrix; only `tt test` can run one"
+            )
+            compiled.save()
+            raise typer.Exit(1)
+        parsed.append((file, manifest.queries(entry)))
+    compiled.save()
+    return parsed
+
+
 def set_environment(
     environment: list[str] | None, multi: bool = True
 ) -> tuple[list[str], bool]:
@@ -102,6 +175,8 @@ def set_environment(
     """
     used_interactive = False
     if not environment:
+        from InquirerPy.prompts.fuzzy import FuzzyPrompt
+
         with redirect_stdout(stderr):
             selection = FuzzyPrompt(
                 message="Select environment(s)..."
@@ -161,9 +236,11 @@ def set_output_modes(  # noqa: PLR0913
     return view_mode, save_mode
 
 
-def discover_analyses() -> dict[str, AnalysisClass]:
+def discover_analyses() -> dict[str, "AnalysisClass"]:
     """Import every analysis module and collect the declared analyses by name."""
-    found = dict[str, AnalysisClass]()
+    from analysis.base_analysis import Analysis, ParametrizedAnalysis
+
+    found: dict[str, AnalysisClass] = {}
     base_dir = Path(analysis_list.__path__[0])
     for path in base_dir.rglob("**/*.py"):
         if path.stem in ("__init__", "base_analysis"):
@@ -190,7 +267,7 @@ def discover_analyses() -> dict[str, AnalysisClass]:
     return found
 
 
-def set_analyses(names: list[str] | None) -> tuple[list[AnalysisClass], bool]:
+def set_analyses(names: list[str] | None) -> tuple[list["AnalysisClass"], bool]:
     """Given the command arguments, ensure analyses are selected."""
     available = discover_analyses()
     used_interactive = False
@@ -200,6 +277,8 @@ def set_analyses(names: list[str] | None) -> tuple[list[AnalysisClass], bool]:
         for name, cls in sorted(available.items()):
             doc = (cls.__doc__ or "").strip().removesuffix(".")
             label_to_name[f"{name}  —  {doc}" if doc else name] = name
+        from InquirerPy.prompts.fuzzy import FuzzyPrompt
+
         with redirect_stdout(stderr):
             selection: list[str] = FuzzyPrompt(
                 message="Select analyses...",
@@ -214,7 +293,7 @@ def set_analyses(names: list[str] | None) -> tuple[list[AnalysisClass], bool]:
         names = [label_to_name[label] for label in selection]
         used_interactive = True
 
-    selected = list[AnalysisClass]()
+    selected: list[AnalysisClass] = []
     for name in names:
         cls = available.get(name) or next(
             (c for n, c in available.items() if n.lower() == name.lower()), None
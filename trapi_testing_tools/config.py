@@ -1,7 +1,7 @@
 from copy import deepcopy
-from typing import ClassVar, override
+from typing import ClassVar, Literal, override
 
-from pydantic import Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from pydantic_settings import (
     BaseSettings,
     PydanticBaseSettingsSource,
@@ -9,6 +9,11 @@ from pydantic_settings import (
     YamlConfigSettingsSource,
 )
 
+# Every command imports this module, so keep its imports light (see `tt startup`):
+# the settings of heavier modules are defined here rather than imported from them.
+from trapi_testing_tools.payload import Encoding
+from trapi_testing_tools.polling import PollStrategy
+
 DEFAULT_ENVS = {
     "ars": {
         "prod": "https://ars-prod.transltr.io/ars/api/messages",
@@ -21,6 +26,7 @@ DEFAULT_ENVS = {
         "ci": "https://retriever.ci.transltr.io",
         "dev": "https://dev.retriever.biothings.io",
     },
+    "mock": {"local": "http://127.0.0.1:8787"},  # `tt mock-server`
     "shepherd": {
         "aragorn.dev": "https://shepherd.renci.org/aragorn",
         "arax.dev": "https://shepherd.renci.org/arax",
@@ -34,6 +40,49 @@ DEFAULT_ENVS = {
 }
 
 
+class BaselineConfig(BaseModel):
+    """How runs are judged against a baseline."""
+
+    model_config: ClassVar[ConfigDict] = ConfigDict(frozen=True)
+
+    test: Literal["permutation", "mann-whitney", "none"] = "permutation"
+    alpha: float = 0.05  # significance level
+    latency_tolerance: float = 0.2  # e.g. 0.2: up to 20% slower is fine
+    size_tolerance: float = 0.2
+    min_latency_seconds: float = 0.1  # slowdowns smaller than this never count
+    history_days: int = 14  # how far back `--baseline history` looks
+
+
+class CallbackConfig(BaseModel):
+    """Where the callback listener binds, and the URL services should call.
+
+    ``url`` is the base URL services reach the listener at (e.g. through a tunnel
+    when testing a remote service); it defaults to the listener's own address.
+    """
+
+    model_config: ClassVar[ConfigDict] = ConfigDict(frozen=True)
+
+    host: str = "127.0.0.1"
+    port: int = 0  # 0 picks a free port
+    url: str | None = None
+
+
+class TransportConfig(BaseModel):
+    """Connection pooling and protocol settings for every HTTP client."""
+
+    model_config: ClassVar[ConfigDict] = ConfigDict(frozen=True)
+
+    max_connections: int = 100  # across all hosts
+    per_host_connections: int = 20  # for each targeted environment's host
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0  # seconds an idle connection is kept
+    http2: bool = False  # needs the `h2` package (`httpx[http2]`)
+    warmup: bool = True  # open connections to every environment before a run
+    spool_threshold: int = 32 * 1024 * 1024  # body bytes kept in memory, then on disk
+    request_encoding: Encoding = "identity"  # compress request bodies (gzip/deflate)
+    request_encoding_threshold: int = 16 * 1024  # smaller bodies are sent as they are
+
+
 class TTTConfig(BaseSettings):
     """Basic config for the TRAPI Testing Tools."""
 
@@ -41,6 +90,11 @@ class TTTConfig(BaseSettings):
     test_repo: str = "NCATSTranslator/Tests"
     default_environment: str = "retriever"
     viewer: str = "fx"
+    history: bool = True  # record every `tt test` run's timings (see `history`)
+    baseline: BaselineConfig = Field(default_factory=BaselineConfig)
+    polling: PollStrategy = Field(default_factory=PollStrategy)
+    callback: CallbackConfig = Field(default_factory=CallbackConfig)
+    transport: TransportConfig = Field(default_factory=TransportConfig)
     environments: dict[str, dict[str, str]] = Field(
         default_factory=lambda: DEFAULT_ENVS
     )
@@ -0,0 +1,78 @@
+"""An HDR-style latency histogram: bounded memory, bounded relative error."""
+
+import math
+from collections import Counter
+from typing import TypedDict
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+"""The percentiles summarized by default."""
+
+
+class LatencySummary(TypedDict):
+    """A histogram's headline numbers, in seconds."""
+
+    count: int
+    min: float | None
+    mean: float | None
+    max: float | None
+    percentiles: dict[str, float | None]  # e.g. {"p50": ..., "p99.9": ...}
+
+
+class LatencyHistogram:
+    """Records latencies in logarithmic buckets, like an HdrHistogram.
+
+    Each bucket is ``precision`` (relatively) wider than the last, so any value
+    (and so any percentile) is reported within that relative error, while memory
+    grows only with the range of values rather than their number. Count, min,
+    max and mean are exact.
+    """
+
+    def __init__(self, precision: float = 0.01) -> None:
+        """Bucket values to within ``precision`` relative error (0.01 = 1%)."""
+        self._log_base = math.log1p(precision)
+        self._buckets: Counter[int] = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record one latency."""
+        seconds = max(seconds, 1e-6)
+        self._buckets[math.ceil(math.log(seconds) / self._log_base)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percent: float) -> float | None:
+        """The latency ``percent``% of recordings were at or below (None if empty)."""
+        if self.count == 0:
+            return None
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= max(rank, 1):
+                # The bucket's (log-scale) midpoint, within the recorded range
+                value = math.exp((index - 0.5) * self._log_base)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self, percentiles: tuple[float, ...] = PERCENTILES) -> LatencySummary:
+        """Count, min/mean/max, and the given percentiles."""
+        empty = self.count == 0
+        return {
+            "count": self.count,
+            "min": None if empty else round(self.min, 6),
+            "mean": None if empty else round(self.total / self.count, 6),
+            "max": None if empty else round(self.max, 6),
+            "percentiles": {
+                f"p{percent:g}": _rounded(self.percentile(percent))
+                for percent in percentiles
+            },
+        }
+
+
+def _rounded(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds, 6)
@@ -0,0 +1,481 @@
+"""A local database of every ``tt test`` run, for latency trends (`tt history`).
+
+Each run's query results are recorded to SQLite in the tool's cache directory:
+per query, its elapsed time and outcome; per step, its timing phases, HTTP
+status, body size, the server's reported TRAPI/Biolink versions, and each test's
+outcome; per variant of a query matrix, its elapsed time and outcome. Response
+bodies aren't kept. Warmup runs and ``--replay`` runs aren't recorded.
+"""
+
+import json
+import sqlite3
+from contextlib import closing
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Literal, TypedDict
+
+from platformdirs import PlatformDirs
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from trapi_testing_tools.report import ElapsedStats, QueryResult, elapsed_stats
+
+console = Console(stderr=True)
+
+Bucket = Literal["run", "day", "week"]
+_SPARKS = "▁▂▃▄▅▆▇█"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,  -- ISO 8601, UTC
+    envs TEXT NOT NULL,  -- JSON list
+    passed INTEGER NOT NULL,
+    elapsed_seconds REAL NOT NULL,
+    connection_setup TEXT NOT NULL  -- JSON object, env -> seconds
+);
+CREATE TABLE IF NOT EXISTS queries (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    env TEXT NOT NULL,
+    type TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    error TEXT,
+    elapsed_seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS queries_by_path_env ON queries (path, env);
+CREATE TABLE IF NOT EXISTS steps (
+    id INTEGER PRIMARY KEY,
+    query_id INTEGER NOT NULL REFERENCES queries (id) ON DELETE CASCADE,
+    step INTEGER NOT NULL,
+    target TEXT NOT NULL,
+    method TEXT NOT NULL,
+    status TEXT NOT NULL,
+    http_status INTEGER,
+    passed INTEGER NOT NULL,
+    elapsed_seconds REAL NOT NULL,
+    elapsed_uncertainty_seconds REAL NOT NULL,
+    connect_seconds REAL,
+    tls_seconds REAL,
+    ttfb_seconds REAL,
+    download_seconds REAL,
+    wire_bytes INTEGER,
+    decoded_bytes INTEGER,
+    schema_version TEXT,
+    biolink_version TEXT
+);
+CREATE TABLE IF NOT EXISTS variants (
+    query_id INTEGER NOT NULL REFERENCES queries (id) ON DELETE CASCADE,
+    label TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    error TEXT,
+    elapsed_seconds REAL  -- NULL if it couldn't be built, so never ran
+);
+CREATE TABLE IF NOT EXISTS tests (
+    step_id INTEGER NOT NULL REFERENCES steps (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    info TEXT  -- JSON
+);
+"""
+
+
+def default_path() -> Path:
+    """The history database, next to the `cache_tests` cache."""
+    dirs = PlatformDirs("trapi-testing-tools", "biothings")
+    return dirs.user_cache_path / "history.sqlite3"
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open (creating if need be) a history database."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+# A step's row, and its tests' rows
+_StepRows = tuple[tuple[Any, ...], list[tuple[str, bool, str]]]
+# A query's row, its steps' rows, and its matrix variants' rows
+_QueryRows = tuple[tuple[Any, ...], list[_StepRows], list[tuple[Any, ...]]]
+
+
+class RunRecorder:
+    """Collects a run's query results as they finish, to save when it's over.
+
+    Results are reduced to their rows right away, so response bodies they hold
+    aren't kept alive.
+    """
+
+    def __init__(self) -> None:
+        """Start recording a run (starting now)."""
+        self.started_at = datetime.now(UTC).isoformat(timespec="seconds")
+        self._queries: list[_QueryRows] = []
+
+    def add(self, result: QueryResult) -> None:
+        """Take one query result (one run of one query against one env)."""
+        steps: list[_StepRows] = []
+        for index, step in enumerate(result["steps"]):
+            timing = step["timing"]
+            phases = (
+                (
+                    timing["connect_seconds"],
+                    timing["tls_seconds"],
+                    timing["ttfb_seconds"],
+                    timing["download_seconds"],
+                    timing["wire_bytes"],
+                    timing["decoded_bytes"],
+                )
+                if timing is not None
+                else (None,) * 6
+            )
+            row = (
+                index,
+                step["target"],
+                step["method"],
+                step["status"],
+                step["http_status"],
+                step["passed"],
+                step["elapsed_seconds"],
+                step["elapsed_uncertainty_seconds"],
+                *phases,
+                step.get("schema_version"),
+                step.get("biolink_version"),
+            )
+            tests = [
+                (case["name"], case["passed"], json.dumps(case["info"]))
+                for case in step["tests"]["cases"]
+            ]
+            steps.append((row, tests))
+        matrix = result.get("matrix")
+        variants = [
+            (
+                variant["label"],
+                variant["passed"],
+                variant["error"],
+                variant["elapsed_seconds"],
+            )
+            for variant in (matrix["results"] if matrix is not None else [])
+        ]
+        self._queries.append(
+            (
+                (
+                    result["path"],
+                    result["env"],
+                    result["type"],
+                    result["passed"],
+                    result["error"],
+                    result["elapsed_seconds"],
+                ),
+                steps,
+                variants,
+            )
+        )
+
+    def save(
+        self,
+        path: Path,
+        envs: list[str],
+        passed: bool,
+        elapsed: float,
+        connection_setup: dict[str, float | None],
+    ) -> None:
+        """Write the run and everything collected to the database at ``path``."""
+        with closing(connect(path)) as connection, connection:
+            run_id = connection.execute(
+                "INSERT INTO runs (started_at, envs, passed, elapsed_seconds,"
+                " connection_setup) VALUES (?, ?, ?, ?, ?)",
+                (
+                    self.started_at,
+                    json.dumps(envs),
+                    passed,
+                    round(elapsed, 3),
+                    json.dumps(connection_setup),
+                ),
+            ).lastrowid
+            for query, steps, variants in self._queries:
+                query_id = connection.execute(
+                    "INSERT INTO queries (run_id, path, env, type, passed, error,"
+                    " elapsed_seconds) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, *query),
+                ).lastrowid
+                for step, tests in steps:
+                    step_id = connection.execute(
+                        "INSERT INTO steps (query_id, step, target, method, status,"
+                        " http_status, passed, elapsed_seconds,"
+                        " elapsed_uncertainty_seconds, connect_seconds, tls_seconds,"
+                        " ttfb_seconds, download_seconds, wire_bytes, decoded_bytes,"
+                        " schema_version, biolink_version)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (query_id, *step),
+                    ).lastrowid
+                    connection.executemany(
+                        "INSERT INTO tests (step_id, name, passed, info)"
+                        " VALUES (?, ?, ?, ?)",
+                        [(step_id, *test) for test in tests],
+                    )
+                connection.executemany(
+                    "INSERT INTO variants (query_id, label, passed, error,"
+                    " elapsed_seconds) VALUES (?, ?, ?, ?, ?)",
+                    [(query_id, *variant) for variant in variants],
+                )
+
+
+# ##### reading #####
+
+
+class Sample(TypedDict):
+    """One recorded run of one query against one environment."""
+
+    started_at: str
+    passed: bool
+    elapsed_seconds: float
+    ttfb_seconds: float | None  # summed over the query's steps
+    decoded_bytes: int | None  # of the final step's body
+    wire_bytes: int | None  # of the final step's body, as sent
+    responded: bool  # whether it has steps and every one got a response ("ok")
+    versions: str | None  # the final step's "schema/biolink" versions
+    variant_elapsed: list[float]  # a query matrix's variants that ran; else empty
+
+
+class Period(TypedDict):
+    """A query/environment's samples within one bucket of time."""
+
+    period: str
+    runs: int
+    pass_rate: float
+    elapsed: ElapsedStats
+    ttfb_median: float | None
+    bytes_median: int | None
+    versions: list[str]  # distinct server versions seen
+
+
+class Trend(TypedDict):
+    """A query/environment's history, bucketed."""
+
+    path: str
+    env: str
+    periods: list[Period]
+    change: float | None  # relative change of the median, first period to last
+
+
+def samples(
+    connection: sqlite3.Connection,
+    queries: list[str],
+    envs: list[str],
+    since: str | None,
+) -> dict[tuple[str, str], list[Sample]]:
+    """Recorded samples by (query path, environment), oldest first.
+
+    ``queries`` are path prefixes and ``envs`` exact names; empty means all.
+    """
+    where = ["q.error IS NULL"]
+    params: list[Any] = []
+    if queries:
+        # A plain prefix match: LIKE would treat `_` and `%` in paths as wildcards
+        where.append(
+            "(" + " OR ".join("substr(q.path, 1, length(?)) = ?" for _ in queries) + ")"
+        )
+        params.extend(value for prefix in queries for value in (prefix, prefix))
+    if envs:
+        where.append(f"q.env IN ({', '.join('?' * len(envs))})")
+        params.extend(envs)
+    if since is not None:
+        where.append("r.started_at >= ?")
+        params.append(since)
+    rows = connection.execute(
+        f"""
+        SELECT q.path, q.env, r.started_at, q.passed, q.elapsed_seconds,
+            (SELECT SUM(s.ttfb_seconds) FROM steps s WHERE s.query_id = q.id),
+            last.decoded_bytes, last.wire_bytes, last.schema_version,
+            last.biolink_version,
+            EXISTS (SELECT 1 FROM steps s WHERE s.query_id = q.id)
+                AND NOT EXISTS (
+                    SELECT 1 FROM steps s WHERE s.query_id = q.id AND s.status != 'ok'
+                ),
+            (
+                SELECT json_group_array(v.elapsed_seconds) FROM variants v
+                WHERE v.query_id = q.id AND v.error IS NULL
+                    AND v.elapsed_seconds IS NOT NULL
+            )
+        FROM queries q
+        JOIN runs r ON r.id = q.run_id
+        LEFT JOIN steps last ON last.id = (
+            SELECT MAX(s.id) FROM steps s WHERE s.query_id = q.id
+        )
+        WHERE {" AND ".join(where)}
+        ORDER BY r.started_at, q.id
+        """,
+        params,
+    )
+    grouped: dict[tuple[str, str], list[Sample]] = {}
+    for (
+        path,
+        env,
+        started_at,
+        passed,
+        elapsed,
+        ttfb,
+        size,
+        wire_size,
+        schema,
+        biolink,
+        responded,
+        variant_elapsed,
+    ) in rows:
+        versions = f"{schema}/{biolink}" if schema or biolink else None
+        grouped.setdefault((path, env), []).append(
+            {
+                "started_at": started_at,
+                "passed": bool(passed),
+                "elapsed_seconds": elapsed,
+                "ttfb_seconds": ttfb,
+                "decoded_bytes": size,
+                "wire_bytes": wire_size,
+                "responded": bool(responded),
+                "versions": versions,
+                "variant_elapsed": json.loads(variant_elapsed),
+            }
+        )
+    return grouped
+
+
+def _period(started_at: str, bucket: Bucket) -> str:
+    if bucket == "run":
+        return started_at
+    moment = datetime.fromisoformat(started_at)
+    if bucket == "week":
+        year, week, _ = moment.isocalendar()
+        return f"{year}-W{week:02d}"
+    return moment.date().isoformat()
+
+
+def _median(values: list[Any]) -> Any:
+    ordered = sorted(value for value in values if value is not None)
+    return ordered[(len(ordered) - 1) // 2] if ordered else None
+
+
+def trends(grouped: dict[tuple[str, str], list[Sample]], bucket: Bucket) -> list[Trend]:
+    """Bucket each query/environment's samples by run, day or week."""
+    result: list[Trend] = []
+    for (path, env), group in sorted(grouped.items()):
+        by_period: dict[str, list[Sample]] = {}
+        for sample in group:
+            by_period.setdefault(_period(sample["started_at"], bucket), []).append(
+                sample
+            )
+        periods: list[Period] = [
+            {
+                "period": period,
+                "runs": len(members),
+                "pass_rate": round(
+                    sum(sample["passed"] for sample in members) / len(members), 4
+                ),
+                "elapsed": elapsed_stats(
+                    [sample["elapsed_seconds"] for sample in members]
+                ),
+                "ttfb_median": _median([sample["ttfb_seconds"] for sample in members]),
+                "bytes_median": _median(
+                    [sample["decoded_bytes"] for sample in members]
+                ),
+                "versions": list(
+                    dict.fromkeys(
+                        sample["versions"] for sample in members if sample["versions"]
+                    )
+                ),
+            }
+            for period, members in by_period.items()
+        ]
+        first, last = periods[0]["elapsed"]["median"], periods[-1]["elapsed"]["median"]
+        change = round(last / first - 1, 4) if len(periods) > 1 and first else None
+        result.append({"path": path, "env": env, "periods": periods, "change": change})
+    return result
+
+
+def _sparkline(values: list[float]) -> str:
+    low, high = min(values), max(values)
+    span = (high - low) or 1
+    return "".join(
+        _SPARKS[round((value - low) / span * (len(_SPARKS) - 1))] for value in values
+    )
+
+
+def _change(change: float | None) -> str:
+    if change is None:
+        return ""
+    style = "red" if change > 0.1 else "green" if change < -0.1 else ""  # noqa: PLR2004
+    text = f"{change:+.1%}"
+    return f"[{style}]{text}[/]" if style else text
+
+
+def print_trends(result: list[Trend], detail: bool) -> None:
+    """Print a summary row per query/environment, and with ``detail`` each period.
+
+    Periods in which the server reported new versions (likely a deploy) are
+    highlighted in the detail tables.
+    """
+    summary = Table(
+        title="Latency history",
+        title_style="bold",
+        box=box.SIMPLE,
+        caption="Elapsed seconds in the latest period; trend and change over periods.",
+    )
+    summary.add_column("Query", style="rule.line", overflow="fold")
+    summary.add_column("Env", overflow="fold")
+    for column in ("Runs", "Median", "p95", "Trend", "Change"):
+        summary.add_column(column, justify="right", no_wrap=True)
+    summary.add_column("Versions", overflow="fold")
+    for trend in result:
+        periods = trend["periods"]
+        latest = periods[-1]
+        summary.add_row(
+            trend["path"],
+            trend["env"],
+            str(sum(period["runs"] for period in periods)),
+            f"{latest['elapsed']['median']:.3f}",
+            f"{latest['elapsed']['p95']:.3f}",
+            _sparkline([period["elapsed"]["median"] for period in periods]),
+            _change(trend["change"]),
+            ", ".join(latest["versions"]),
+        )
+    console.print(summary)
+    if not detail:
+        return
+
+    for trend in result:
+        table = Table(
+            title=f"{trend['path']}  ·  {trend['env']}",
+            title_style="bold",
+            box=box.SIMPLE,
+        )
+        table.add_column("Period", style="rule.line", no_wrap=True)
+        for column in ("Runs", "Passed", "Median", "p95", "Max", "TTFB", "Size"):
+            table.add_column(column, justify="right", no_wrap=True)
+        table.add_column("Versions", overflow="fold")
+        previous: list[str] = []
+        for period in trend["periods"]:
+            versions = period["versions"]
+            deployed = bool(previous) and bool(versions) and versions != previous
+            previous = versions or previous
+            ttfb, size = period["ttfb_median"], period["bytes_median"]
+            table.add_row(
+                period["period"],
+                str(period["runs"]),
+                f"{period['pass_rate']:.0%}",
+                f"{period['elapsed']['median']:.3f}",
+                f"{period['elapsed']['p95']:.3f}",
+                f"{period['elapsed']['max']:.3f}",
+                "" if ttfb is None else f"{ttfb:.3f}",
+                "" if size is None else f"{size:,}",
+                ", ".join(versions),
+                style="yellow" if deployed else None,
+            )
+        console.print(table)
+
+
+def emit(result: list[Trend]) -> None:
+    """Write trends to stdout as JSON."""
+    print(json.dumps(result, ensure_ascii=False))
@@ -0,0 +1,327 @@
+"""Sustained load generation from query files (`tt load`).
+
+Query files (including multi-step ``steps``) are run round-robin against every
+target environment for a fixed duration, either open-loop at a target rate or
+closed-loop with a fixed number of workers. Open-loop arrivals are dispatched on
+schedule regardless of how many are still in flight, and latency is measured
+from each arrival's *intended* start, so a stalled service shows up in the tail
+instead of quietly slowing the generator down (coordinated omission).
+"""
+
+import asyncio
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Literal, TypedDict, cast
+
+import httpx
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+from trapi_testing_tools import async_jobs, transport
+from trapi_testing_tools.config import CONFIG
+from trapi_testing_tools.histogram import LatencyHistogram, LatencySummary
+from trapi_testing_tools.types import Query
+
+console = Console(stderr=True)
+
+
+class EndpointStats(TypedDict):
+    """Load results for one endpoint of one environment."""
+
+    env: str
+    endpoint: str  # "METHOD /path"
+    requests: int
+    errors: dict[str, int]  # by kind, e.g. "HTTP 503", "timeout", "error"
+    error_rate: float
+    throughput_rps: float  # completed requests per second of the run
+    latency: LatencySummary
+
+
+class LoadReport(TypedDict):
+    """The whole ``tt load --pipe`` output."""
+
+    mode: Literal["open", "closed"]
+    target_rps: float | None  # open loop only
+    concurrency: int | None  # closed loop only
+    duration_seconds: float  # how long new work was started for
+    elapsed_seconds: float  # including waiting for in-flight work to finish
+    iterations: int  # query files started
+    max_schedule_lag_seconds: float  # how late open-loop arrivals were dispatched
+    endpoints: list[EndpointStats]
+
+
+@dataclass
+class LoadTarget:
+    """One query file's steps, to be run against one environment."""
+
+    name: str
+    env: str
+    url: str
+    steps: list[Query]
+
+
+@dataclass
+class _EndpointRecord:
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: Counter[str] = field(default_factory=Counter)
+
+
+@dataclass
+class _Recorder:
+    """Collects per-endpoint results while the load runs."""
+
+    records: dict[tuple[str, str], _EndpointRecord] = field(default_factory=dict)
+    iterations: int = 0
+    in_flight: int = 0
+    error_count: int = 0
+    max_lag: float = 0.0
+
+    def record(
+        self, env: str, endpoint: str, latency: float, error: str | None
+    ) -> None:
+        record = self.records.setdefault((env, endpoint), _EndpointRecord())
+        record.histogram.record(latency)
+        if error is not None:
+            record.errors[error] += 1
+            self.error_count += 1
+
+
+def _endpoint(query: Query) -> str:
+    return f"{query.method} {query.endpoint or '/'}"
+
+
+async def _run_step(client: httpx.AsyncClient, query: Query, url: str) -> str | None:
+    """Run one step to completion, discarding its body; returns its error kind."""
+    try:
+        if "asyncquery" in (query.endpoint or ""):
+            run = await async_jobs.collect(
+                client, await async_jobs.submit(client, query, url)
+            )
+            if run.status != "ok":
+                return run.status
+            status_code = run.http_status
+        else:
+            response = await transport.asend(
+                client,
+                query.method,
+                url + (query.endpoint or ""),
+                payload=query.payload,
+                spooled=False,
+                params=query.params,
+                headers=query.headers,
+            )
+            try:
+                async for _chunk in response.aiter_raw():
+                    pass
+            finally:
+                await response.aclose()
+            status_code = response.status_code
+    except httpx.TimeoutException:
+        return "timeout"
+    except httpx.HTTPError:
+        return "error"
+    if status_code is None or status_code >= httpx.codes.BAD_REQUEST:
+        return f"HTTP {status_code}"
+    return None
+
+
+async def _iterate(
+    client: httpx.AsyncClient, target: LoadTarget, start: float, recorder: _Recorder
+) -> None:
+    """Run a query file's steps in order, stopping at the first failed step.
+
+    The first step's latency counts from ``start`` (its intended start time).
+    """
+    recorder.iterations += 1
+    recorder.in_flight += 1
+    try:
+        for query in target.steps:
+            error = await _run_step(client, query, target.url)
+            now = time.monotonic()
+            recorder.record(target.env, _endpoint(query), now - start, error)
+            start = now
+            if error is not None:
+                break
+    finally:
+        recorder.in_flight -= 1
+
+
+async def _open_loop(
+    client: httpx.AsyncClient,
+    targets: list[LoadTarget],
+    rps: float,
+    duration: float,
+    recorder: _Recorder,
+) -> None:
+    """Dispatch iterations every ``1/rps`` seconds, however many are in flight."""
+    start = time.monotonic()
+    running: set[asyncio.Task[None]] = set()
+    arrival = 0
+    while (scheduled := start + arrival / rps) < start + duration:
+        delay = scheduled - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        recorder.max_lag = max(recorder.max_lag, time.monotonic() - scheduled)
+        task = asyncio.create_task(
+            _iterate(client, targets[arrival % len(targets)], scheduled, recorder)
+        )
+        running.add(task)
+        task.add_done_callback(running.discard)
+        arrival += 1
+    await asyncio.gather(*running)
+
+
+async def _closed_loop(
+    client: httpx.AsyncClient,
+    targets: list[LoadTarget],
+    concurrency: int,
+    duration: float,
+    recorder: _Recorder,
+) -> None:
+    """Keep ``concurrency`` workers each running one iteration after another."""
+    deadline = time.monotonic() + duration
+
+    async def worker(offset: int) -> None:
+        turn = offset
+        while time.monotonic() < deadline:
+            target = targets[turn % len(targets)]
+            await _iterate(client, target, time.monotonic(), recorder)
+            turn += concurrency
+
+    await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+
+
+async def _run(
+    targets: list[LoadTarget],
+    rps: float | None,
+    concurrency: int | None,
+    duration: float,
+    recorder: _Recorder,
+) -> None:
+    urls = list(dict.fromkeys(target.url for target in targets))
+    async with transport.async_client(urls) as client:
+        if CONFIG.transport.warmup:
+            await transport.warm_up_async(client, urls)
+        started = time.monotonic()
+        with console.status("Starting load...") as status:
+
+            async def show_progress() -> None:
+                while True:
+                    status.update(
+                        f"Load: {recorder.iterations} started · "
+                        f"{recorder.in_flight} in flight · "
+                        f"{recorder.error_count} errors · "
+                        f"{time.monotonic() - started:.0f}/{duration:g}s"
+                    )
+                    await asyncio.sleep(0.5)
+
+            progress = asyncio.create_task(show_progress())
+            try:
+                if rps is not None:
+                    await _open_loop(client, targets, rps, duration, recorder)
+                else:
+                    await _closed_loop(
+                        client, targets, cast(int, concurrency), duration, recorder
+                    )
+            finally:
+                progress.cancel()
+
+
+def run_load(
+    targets: list[LoadTarget],
+    duration: float,
+    rps: float | None = None,
+    concurrency: int | None = None,
+) -> LoadReport:
+    """Put load on the targets for ``duration`` seconds, returning the results.
+
+    Give exactly one of ``rps`` (open loop) or ``concurrency`` (closed loop).
+    """
+    recorder = _Recorder()
+    started = time.monotonic()
+    asyncio.run(_run(targets, rps, concurrency, duration, recorder))
+    elapsed = time.monotonic() - started
+
+    endpoints: list[EndpointStats] = []
+    for (env, endpoint), record in recorder.records.items():
+        requests = record.histogram.count
+        errors = sum(record.errors.values())
+        endpoints.append(
+            {
+                "env": env,
+                "endpoint": endpoint,
+                "requests": requests,
+                "errors": dict(record.errors),
+                "error_rate": errors / requests if requests else 0.0,
+                "throughput_rps": requests / elapsed if elapsed else 0.0,
+                "latency": record.histogram.summary(),
+            }
+        )
+    return {
+        "mode": "open" if rps is not None else "closed",
+        "target_rps": rps,
+        "concurrency": concurrency if rps is None else None,
+        "duration_seconds": duration,
+        "elapsed_seconds": round(elapsed, 3),
+        "iterations": recorder.iterations,
+        "max_schedule_lag_seconds": round(recorder.max_lag, 4),
+        "endpoints": endpoints,
+    }
+
+
+def _ms(seconds: float | None) -> str:
+    if seconds is None:
+        return "—"
+    ms = seconds * 1000
+    return f"{ms:.1f}" if ms < 100 else f"{ms:.0f}"  # noqa: PLR2004
+
+
+def print_load_report(report: LoadReport) -> None:
+    """Print a load report as a table of per-endpoint results."""
+    open_loop = report["mode"] == "open"
+    table = Table(
+        title="Load Results",
+        title_style="bold",
+        box=box.SIMPLE,
+        caption="Latencies in ms"
+        + (", measured from each request's intended start." if open_loop else "."),
+    )
+    table.add_column("Env / Endpoint", style="rule.line", overflow="fold")
+    for column in ("Reqs", "Errors", "RPS", "p50", "p90", "p99", "p99.9", "Max"):
+        table.add_column(column, justify="right", no_wrap=True)
+
+    for stats in report["endpoints"]:
+        latency = stats["latency"]
+        percentiles = latency["percentiles"]
+        error_style = "red" if stats["error_rate"] else "green"
+        table.add_row(
+            f"{stats['env']}\n[bright_black]{stats['endpoint']}[/]",
+            str(stats["requests"]),
+            f"[{error_style}]{stats['error_rate']:.1%}[/]",
+            f"{stats['throughput_rps']:.2f}",
+            *(_ms(percentiles[f"p{p}"]) for p in ("50", "90", "99", "99.9")),
+            _ms(latency["max"]),
+        )
+    console.print(table)
+
+    for stats in report["endpoints"]:
+        if stats["errors"]:
+            kinds = ", ".join(f"{kind} x{n}" for kind, n in stats["errors"].items())
+            console.print(f"{stats['env']} {stats['endpoint']}: {kinds}", style="red")
+
+    if open_loop:
+        achieved = report["iterations"] / report["duration_seconds"]
+        console.print(
+            f"Target {report['target_rps']:g} rps, dispatched {achieved:.2f} rps "
+            f"(max dispatch lag {report['max_schedule_lag_seconds'] * 1000:.1f}ms)",
+            style="italic bright_black",
+            highlight=False,
+        )
+
+
+def emit_load_report(report: LoadReport) -> None:
+    """Write a load report to stdout as JSON."""
+    print(json.dumps(report, ensure_ascii=False))
@@ -1,40 +1,127 @@
+import importlib
 import re
 import sys
 from re import Pattern
-from typing import override
+from typing import TYPE_CHECKING, NamedTuple, override
 
 import typer
-from click import Context
-from click.core import Command
-from rich.console import Console
-from typer.core import TyperGroup
-
-from trapi_testing_tools.commands.analyze import app as analyze_app
-from trapi_testing_tools.commands.curl import app as curl_app
-from trapi_testing_tools.commands.harness import app as harness_app
-from trapi_testing_tools.commands.ping import app as ping_app
-from trapi_testing_tools.commands.pk import app as pk_app
-from trapi_testing_tools.commands.test import app as test_app
-from trapi_testing_tools.commands.validate import app as validate_app
-
-console = Console(stderr=True)
+from typer.core import TyperCommand, TyperGroup
+
+if TYPE_CHECKING:  # typer's commands are of the click it vendors
+    from typer._click import Command, Context, HelpFormatter
+
+
+class LazyCommand(NamedTuple):
+    """A subcommand, imported only when it's invoked."""
+
+    module: str  # defines a Typer `app` holding the one command
+    help: str  # listed by `tt --help` without importing the module
+
+
+COMMANDS: dict[str, LazyCommand] = {
+    "test | t": LazyCommand("trapi_testing_tools.commands.test", "Run a query."),
+    "analyze | a": LazyCommand(
+        "trapi_testing_tools.commands.analyze",
+        "Run one or more analyses on a TRAPI response.",
+    ),
+    "validate | v": LazyCommand(
+        "trapi_testing_tools.commands.validate", "Validate the given TRAPI content."
+    ),
+    "ping | p": LazyCommand(
+        "trapi_testing_tools.commands.ping",
+        "Quickly check if servers are responsive by getting their metakg.",
+    ),
+    "harness | h": LazyCommand("trapi_testing_tools.commands.harness", ""),
+    "pk": LazyCommand(
+        "trapi_testing_tools.commands.pk",
+        "Drill down into ARS PK to get a response of interest.",
+    ),
+    "curl | c": LazyCommand(
+        "trapi_testing_tools.commands.curl", "Get a query in curl format."
+    ),
+    "queries | q": LazyCommand(
+        "trapi_testing_tools.commands.queries",
+        "List query files with their steps, tests and tags, from the query manifest.",
+    ),
+    "load | l": LazyCommand(
+        "trapi_testing_tools.commands.load",
+        "Put sustained load on environments using query files.",
+    ),
+    "cache-bench | cb": LazyCommand(
+        "trapi_testing_tools.commands.cache_bench",
+        "Measure how much faster cached queries run than cold ones.",
+    ),
+    "mock-server | mock": LazyCommand(
+        "trapi_testing_tools.commands.mock_server", "Serve a local mock TRAPI service."
+    ),
+    "synth": LazyCommand(
+        "trapi_testing_tools.commands.synth",
+        "Generate a synthetic TRAPI response for scale testing.",
+    ),
+    "bench": LazyCommand(
+        "trapi_testing_tools.commands.bench",
+        "Benchmark tests and analyses against synthetic responses.",
+    ),
+    "resolve": LazyCommand(
+        "trapi_testing_tools.commands.resolve",
+        "Put stored bodies back into a report or saved response written with --blobs.",
+    ),
+    "history | hist": LazyCommand(
+        "trapi_testing_tools.commands.history",
+        "Show latency trends of past tt test runs.",
+    ),
+    "startup": LazyCommand(
+        "trapi_testing_tools.commands.startup",
+        "Measure each subcommand's import time against a startup budget.",
+    ),
+}
+"""Subcommands by name (with aliases), in listing order."""
+
+
+def load_command(name: str) -> "Command":
+    """Import a subcommand's module and build its command."""
+    module = importlib.import_module(COMMANDS[name].module)
+    return typer.main.get_group(module.app).commands[name]
 
 
 class AliasGroup(TyperGroup):
-    """Special AliasGroup that allows typer commands to have aliases."""
+    """Special AliasGroup that allows typer commands to have aliases.
+
+    Subcommands in `COMMANDS` are imported only when resolved, so running one
+    doesn't pay for importing every other; listing them in help imports none.
+    """
 
     _CMD_SPLIT_P: Pattern[str] = re.compile(r" ?[,|] ?")
+    _listing: bool = False
+
+    @override
+    def list_commands(self, ctx: "Context") -> list[str]:
+        """List the commands, lazy ones included."""
+        names = super().list_commands(ctx)
+        return [*names, *(name for name in COMMANDS if name not in names)]
 
     @override
-    def get_command(self, ctx: Context, cmd_name: str) -> Command | None:
+    def get_command(self, ctx: "Context", cmd_name: str) -> "Command | None":
         """Get a command given the name."""
         cmd_name = self._group_cmd_name(default_name=cmd_name)
+        if cmd_name in COMMANDS and cmd_name not in self.commands:
+            if self._listing:  # help only needs the name and help text
+                return TyperCommand(cmd_name, help=COMMANDS[cmd_name].help)
+            self.commands[cmd_name] = load_command(cmd_name)
         return super().get_command(ctx, cmd_name)
 
+    @override
+    def format_help(self, ctx: "Context", formatter: "HelpFormatter") -> None:
+        """Format the help without importing every subcommand."""
+        self._listing = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            self._listing = False
+
     def _group_cmd_name(self, default_name: str) -> str:
-        for cmd in self.commands.values():
-            name = cmd.name
-            if name and default_name in self._CMD_SPLIT_P.split(name):
+        for name in [*self.commands, *COMMANDS]:
+            if default_name in self._CMD_SPLIT_P.split(name):
                 return name
         return default_name
 
@@ -46,13 +133,10 @@ app = typer.Typer(
     help="A collection of tools for testing and analyzing all things TRAPI.",
 )
 
-app.add_typer(test_app)
-app.add_typer(analyze_app)
-app.add_typer(validate_app)
-app.add_typer(ping_app)
-app.add_typer(harness_app)
-app.add_typer(pk_app)
-app.add_typer(curl_app)
+
+@app.callback()
+def _root() -> None:
+    """Run a subcommand (every subcommand is lazy, so the app needs a callback)."""
 
 
 def main() -> None:
@@ -0,0 +1,304 @@
+"""A compiled manifest of query files, for discovery and selection (`tt queries`).
+
+Learning what a query file does means importing it and parsing its steps, and
+files built with `query_utils` construct TOM objects as they're imported. The
+manifest, kept in the tool's cache directory, holds each file's compiled steps
+(method, endpoint, params, headers, JSON body, polling and test names) and its
+tags, keyed by path. A file whose mtime and size are unchanged, or whose content
+still hashes the same, is served from the manifest without importing it; any
+other file is imported and compiled again.
+
+A file's tags are its module-level ``tags`` (a list of strings) plus the names of
+the directories it's in under ``queries/`` (e.g. ``routine``, ``async``), and
+``matrix`` for a query matrix (see `matrix`), so
+queries can be selected by endpoint, method, sync/async or tag from the
+manifest alone. Running a query still imports it, as its tests are classes.
+
+The manifest tracks the query file itself: a file it reads (e.g. with
+``query_utils.load_json``) or a battery it calls changing doesn't invalidate it,
+so use ``tt queries --refresh`` after changing those.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypedDict
+
+from platformdirs import PlatformDirs
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+import queries as query_list
+import trapi_testing_tools
+
+if TYPE_CHECKING:
+    from trapi_testing_tools.types import HTTPMethod, Query
+
+console = Console(stderr=True)
+
+MANIFEST_VERSION = 3
+"""Bumped whenever entries change shape, discarding older manifests."""
+
+Mode = Literal["sync", "async"]
+
+
+class StepEntry(TypedDict):
+    """One compiled step of a query file."""
+
+    method: "HTTPMethod"
+    endpoint: str | None
+    params: dict[str, Any]
+    headers: dict[str, str]
+    body: dict[str, Any] | list[Any] | None  # as sent, TOM objects serialized
+    polling: dict[str, Any] | None  # the step's PollStrategy fields, if it has one
+    tests: list[str]  # test names, as printed when they run
+
+
+class ManifestEntry(TypedDict):
+    """A query file, compiled."""
+
+    path: str  # relative to the repo root
+    mtime_ns: int
+    size: int
+    sha256: str
+    steps: list[StepEntry]
+    tags: list[str]
+    matrix: bool  # a query matrix, whose steps have no body (see `matrix`)
+
+
+def default_path() -> Path:
+    """The manifest, next to the `cache_tests` cache."""
+    dirs = PlatformDirs("trapi-testing-tools", "biothings")
+    return dirs.user_cache_path / "manifest.json"
+
+
+def _root() -> Path:
+    return Path(trapi_testing_tools.__path__[0]).parent
+
+
+def _sha256(file: Path) -> str:
+    return hashlib.sha256(file.read_bytes()).hexdigest()
+
+
+def _directory_tags(file: Path) -> list[str]:
+    """The directories a query file is in under ``queries/``."""
+    try:
+        relative = file.relative_to(Path(query_list.__path__[0]).resolve())
+    except ValueError:
+        return []
+    return list(relative.parent.parts)
+
+
+def compile_file(file: Path) -> ManifestEntry:
+    """Import a query file (an absolute path) and compile its manifest entry.
+
+    Raises:
+        Exception: anything importing or parsing the query file raises.
+    """
+    from tests.base_test import test_name
+    from trapi_testing_tools.matrix import is_matrix
+    from trapi_testing_tools.utils import parse_query, serialize_body
+
+    relative = file.relative_to(_root())
+    module = importlib.import_module(".".join(relative.with_suffix("").parts))
+    steps: list[StepEntry] = [
+        {
+            "method": query.method,
+            "endpoint": query.endpoint,
+            "params": query.params,
+            "headers": query.headers,
+            "body": serialize_body(query.body),  # already serialized by parse_query
+            "polling": (
+                None if query.polling is None else query.polling.model_dump(mode="json")
+            ),
+            "tests": [test_name(test) for test in query.tests or []],
+        }
+        for query in parse_query(module)
+    ]
+    tags = getattr(module, "tags", [])
+    if not isinstance(tags, list) or any(not isinstance(tag, str) for tag in tags):  # pyright:ignore[reportUnknownVariableType]
+        raise AttributeError("Query tags must be a list of strings.")
+    stat = file.stat()
+    matrix = is_matrix(module)
+    entry: ManifestEntry = {
+        "path": str(relative),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": _sha256(file),
+        "steps": steps,
+        "tags": list(
+            dict.fromkeys(
+                [
+                    *_directory_tags(file),
+                    *(["matrix"] if matrix else []),
+                    *tags,  # pyright:ignore[reportUnknownArgumentType]
+                ]
+            )
+        ),
+        "matrix": matrix,
+    }
+    json.dumps(entry)  # raises TypeError for anything that can't be kept
+    return entry
+
+
+class Manifest:
+    """Compiled query files by absolute path, persisted as JSON.
+
+    Use `entry` to get a file's (possibly freshly compiled) entry, then `save`.
+    """
+
+    def __init__(self, path: Path, refresh: bool = False) -> None:
+        """Load the manifest at ``path``; with ``refresh``, start empty."""
+        self.path = path
+        self.entries: dict[str, ManifestEntry] = {}
+        self.compiled = 0  # files imported, rather than served from the manifest
+        self._dirty = False
+        if refresh or not path.exists():
+            return
+        try:
+            stored = json.loads(path.read_text(encoding="utf8"))
+        except (OSError, ValueError):
+            return  # unreadable, so rebuilt as files are compiled
+        if isinstance(stored, dict) and stored.get("version") == MANIFEST_VERSION:
+            self.entries = stored["entries"]
+
+    def entry(self, file: Path) -> ManifestEntry:
+        """A query file's entry, compiling it if it changed since it was stored.
+
+        Raises:
+            OSError: if the file can't be read.
+            Exception: anything compiling the file raises (see `compile_file`).
+        """
+        file = file.resolve()
+        key = str(file)
+        stored = self.entries.get(key)
+        stat = file.stat()
+        if stored is not None:
+            if (
+                stored["mtime_ns"] == stat.st_mtime_ns
+                and stored["size"] == stat.st_size
+            ):
+                return stored
+            if stored["sha256"] == _sha256(file):  # touched, not changed
+                stored["mtime_ns"] = stat.st_mtime_ns
+                self._dirty = True
+                return stored
+        entry = compile_file(file)
+        self.entries[key] = entry
+        self.compiled += 1
+        self._dirty = True
+        return entry
+
+    def save(self) -> None:
+        """Write the manifest if anything changed (atomically, so runs can overlap)."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_suffix(f".{os.getpid()}.tmp")
+        partial.write_text(
+            json.dumps({"version": MANIFEST_VERSION, "entries": self.entries}),
+            encoding="utf8",
+        )
+        partial.replace(self.path)
+        self._dirty = False
+
+
+def is_async(entry: ManifestEntry) -> bool:
+    """Whether any step of the query is an asyncquery."""
+    return any("asyncquery" in (step["endpoint"] or "") for step in entry["steps"])
+
+
+def queries(entry: ManifestEntry) -> "list[Query]":
+    """Rebuild an entry's steps as queries, without their tests.
+
+    A query matrix's step has no body (see `ManifestEntry.matrix`).
+    """
+    from trapi_testing_tools.polling import PollStrategy
+    from trapi_testing_tools.types import Query
+
+    return [
+        Query(
+            method=step["method"],
+            endpoint=step["endpoint"],
+            params=step["params"],
+            headers=step["headers"],
+            body=step["body"],
+            polling=(
+                None
+                if step["polling"] is None
+                else PollStrategy.model_validate(step["polling"])
+            ),
+        )
+        for step in entry["steps"]
+    ]
+
+
+class Selection(NamedTuple):
+    """Which query files to keep, judged from their manifest entries.
+
+    A file matches when any of its steps matches any given endpoint (a glob, e.g.
+    ``/query`` or ``*query``) and any given method, it's of the given mode (async
+    if any step is an asyncquery), and it has every given tag.
+    """
+
+    endpoints: list[str]
+    methods: list[str]
+    mode: Mode | None
+    tags: list[str]
+
+    def __bool__(self) -> bool:
+        """Whether this selects anything out at all."""
+        return bool(self.endpoints or self.methods or self.mode or self.tags)
+
+    def matches(self, entry: ManifestEntry) -> bool:
+        """Whether a compiled query file is selected."""
+        steps = entry["steps"]
+        if self.endpoints and not any(
+            fnmatch(step["endpoint"] or "", pattern)
+            for step in steps
+            for pattern in self.endpoints
+        ):
+            return False
+        methods = {method.upper() for method in self.methods}
+        if methods and not any(step["method"] in methods for step in steps):
+            return False
+        if self.mode is not None and is_async(entry) != (self.mode == "async"):
+            return False
+        return all(tag in entry["tags"] for tag in self.tags)
+
+    def flags(self) -> list[str]:
+        """The command-line options making this selection."""
+        return [
+            *(f"--endpoint {endpoint}" for endpoint in self.endpoints),
+            *(f"--method {method}" for method in self.methods),
+            *([f"--mode {self.mode}"] if self.mode is not None else []),
+            *(f"--tag {tag}" for tag in self.tags),
+        ]
+
+
+def print_entries(entries: list[ManifestEntry]) -> None:
+    """Print compiled query files as a table."""
+    table = Table(title="Query files", title_style="bold", box=box.SIMPLE)
+    table.add_column("Query", style="rule.line", overflow="fold")
+    table.add_column("Steps", overflow="fold")
+    table.add_column("Tests", justify="right", no_wrap=True)
+    table.add_column("Tags", overflow="fold")
+    for entry in entries:
+        table.add_row(
+            entry["path"],
+            "\n".join(
+                f"{step['method']} {step['endpoint']}" for step in entry["steps"]
+            ),
+            str(sum(len(step["tests"]) for step in entry["steps"])),
+            ", ".join(entry["tags"]),
+        )
+    console.print(table)
+
+
+def emit(output: Any) -> None:
+    """Write entries to stdout as JSON."""
+    print(json.dumps(output, ensure_ascii=False))
@@ -0,0 +1,151 @@
+"""Data-driven query matrices: one query file run once per row of a table.
+
+A query file with a module-level ``matrix`` (the path of a CSV, TSV or JSONL
+table, relative to the query file) is a matrix. Its ``body`` is a template for
+each row's body: either a dict/list whose strings name columns as ``{column}``
+(a string that's only a placeholder takes the value as is, so JSONL lists and
+numbers keep their type), or a function taking the row (a dict) and returning
+the body, e.g. built with `query_utils.one_hop`. Placeholders in ``params`` are
+filled the same way. Every other setting (method, endpoint, tests, ...) is
+shared by the variants.
+
+Rows are read, and their bodies built, only as variants are run (see `rows`), so
+a large table never has every body in memory at once. A variant is labelled by
+its row's ``id`` column, or else its row number (from 1).
+"""
+
+import csv
+import json
+import re
+from collections.abc import Callable, Iterator
+from dataclasses import replace
+from pathlib import Path
+from types import ModuleType
+from typing import Any, NamedTuple, cast
+
+from trapi_testing_tools.types import Query
+
+ID_COLUMN = "id"
+"""The column naming each variant, if the table has one."""
+
+_PLACEHOLDER = re.compile(r"\{([A-Za-z_]\w*)\}")
+
+Row = dict[str, Any]
+
+
+class Variant(NamedTuple):
+    """One row of a matrix's table, not yet built into queries."""
+
+    index: int  # position in the table, from 0
+    label: str
+    row: Row
+
+
+def is_matrix(module: ModuleType) -> bool:
+    """Whether a query module is a matrix."""
+    return getattr(module, "matrix", None) is not None
+
+
+def table_path(module: ModuleType) -> Path:
+    """A matrix's table, resolved against its query file."""
+    path = Path(module.matrix)
+    if not path.is_absolute():
+        path = Path(str(module.__file__)).parent / path
+    return path
+
+
+def rows(path: Path) -> Iterator[Row]:
+    """Read a table's rows one at a time.
+
+    Raises:
+        ValueError: if the table isn't CSV/TSV/JSONL, or a JSONL line isn't an
+            object.
+        OSError: if it can't be read.
+    """
+    suffix = path.suffix.lower()
+    if suffix not in {".csv", ".tsv", ".jsonl", ".ndjson"}:
+        raise ValueError(f"{path} isn't a .csv, .tsv or .jsonl table")
+    with path.open(encoding="utf-8-sig", newline="") as file:
+        if suffix in {".csv", ".tsv"}:
+            yield from csv.DictReader(file, delimiter="\t" if suffix == ".tsv" else ",")
+            return
+        for number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError(f"{path}:{number} isn't a JSON object")
+            yield row
+
+
+def variants(module: ModuleType) -> Iterator[Variant]:
+    """A matrix's variants, in table order, read lazily.
+
+    Raises:
+        ValueError: if the module has steps, or as `rows` does; when the table is
+            first read.
+        OSError: as `rows` does.
+    """
+    if hasattr(module, "steps"):
+        raise ValueError("a matrix is one query; it can't have steps")
+    for index, row in enumerate(rows(table_path(module))):
+        label = row.get(ID_COLUMN)
+        if label is None or label == "":
+            label = index + 1
+        yield Variant(index, str(label), row)
+
+
+def fill(template: Any, row: Row) -> Any:
+    """A copy of a dict/list template with each ``{column}`` filled from ``row``.
+
+    Raises:
+        KeyError: if the template names a column the row doesn't have.
+    """
+    if isinstance(template, dict):
+        return {key: fill(value, row) for key, value in template.items()}  # pyright:ignore[reportUnknownVariableType]
+    if isinstance(template, list):
+        return [fill(value, row) for value in template]  # pyright:ignore[reportUnknownVariableType]
+    if not isinstance(template, str):
+        return template
+
+    def value(match: re.Match[str]) -> str:
+        return str(_column(row, match.group(1)))
+
+    whole = _PLACEHOLDER.fullmatch(template)
+    if whole is not None:
+        return _column(row, whole.group(1))
+    return _PLACEHOLDER.sub(value, template)
+
+
+def _column(row: Row, name: str) -> Any:
+    if name not in row:
+        raise KeyError(
+            f"the template uses {{{name}}}, which the table has no column for"
+        )
+    return row[name]
+
+
+def build(module: ModuleType, base: Query, variant: Variant) -> list[Query]:
+    """A variant's query: the matrix's shared settings with its row filled in.
+
+    ``base`` is the module's parsed query (see `utils.parse_query`), which has no
+    body.
+
+    Raises:
+        Exception: anything filling the template, or the template function, raises.
+    """
+    from trapi_testing_tools.utils import serialize_body
+
+    template = getattr(module, "body", None)
+    body = (
+        cast(Callable[[Row], Any], template)(variant.row)
+        if callable(template)
+        else fill(template, variant.row)
+    )
+    return [
+        replace(
+            base,
+            params=fill(base.params, variant.row),
+            body=serialize_body(body),
+        )
+    ]
@@ -0,0 +1,352 @@
+"""A local mock TRAPI service (`tt mock-server`), for running queries offline.
+
+Serves ``/query``, ``/asyncquery``, ``/asyncquery_status/<job_id>`` and
+``/meta_knowledge_graph`` (under any base path, and the ``/team/<name>/...`` and
+``/smartapi/<id>/...`` variants), with configurable latency, async job duration,
+injected errors and a bandwidth cap, so the concurrency, polling and load paths
+of the tools can be exercised end to end without a real service.
+
+Responses come from a fixtures directory: a file named for the request's path
+(e.g. ``team/Text Mining Provider/query.json``) or else for its endpoint
+(``query.json``, ``meta_knowledge_graph.json``). A cassette recorded by
+``tt test --record`` (see `cassette`) works too, serving each recorded endpoint's
+status and body. Anything else gets a minimal valid response.
+"""
+
+import contextlib
+import gzip
+import heapq
+import json
+import math
+import random
+import re
+import secrets
+import threading
+import time
+import zlib
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Literal, cast, get_args, override
+from urllib.parse import unquote
+
+import httpx
+
+from trapi_testing_tools import transport
+from trapi_testing_tools.cassette import Cassette
+
+WRITE_CHUNK = 64 * 1024
+JOB_TTL = 300.0
+"""Seconds a finished async job's result is kept if it's never fetched."""
+
+DistributionKind = Literal["fixed", "uniform", "exponential", "lognormal"]
+
+_ENDPOINT = re.compile(
+    r"/(?:(?:team|smartapi)/[^/]+/)?(query|asyncquery|meta_knowledge_graph)$"
+)
+_STATUS = re.compile(r"/asyncquery_status/([^/]+)$")
+_RESULT = re.compile(r"/asyncquery_response/([^/]+)$")
+
+_DECODERS: dict[str, Callable[[bytes], bytes]] = {
+    "identity": lambda raw: raw,
+    "gzip": gzip.decompress,
+    "deflate": zlib.decompress,
+}
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """A distribution of durations in seconds, parsed from e.g. ``lognormal:1,0.5``.
+
+    ``fixed:S``, ``uniform:LOW,HIGH``, ``exponential:MEAN`` or
+    ``lognormal:MEDIAN,SIGMA``; a bare number is ``fixed``.
+    """
+
+    kind: DistributionKind
+    params: tuple[float, ...]
+
+    @classmethod
+    def parse(cls, spec: str) -> "Distribution":
+        """Parse a distribution spec, raising `ValueError` if it's invalid."""
+        kind, _, args = spec.partition(":") if ":" in spec else ("fixed", "", spec)
+        if kind not in get_args(DistributionKind):
+            raise ValueError(f"unknown distribution {kind!r} in {spec!r}")
+        params = tuple(float(arg) for arg in args.split(","))
+        expected = {"fixed": 1, "uniform": 2, "exponential": 1, "lognormal": 2}[kind]
+        if len(params) != expected or any(param < 0 for param in params):
+            raise ValueError(
+                f"{kind} takes {expected} non-negative number(s), got {spec!r}"
+            )
+        return cls(cast(DistributionKind, kind), params)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one duration."""
+        match self.kind:
+            case "fixed":
+                return self.params[0]
+            case "uniform":
+                return rng.uniform(*self.params)
+            case "exponential":
+                mean = self.params[0]
+                return rng.expovariate(1 / mean) if mean else 0.0
+            case "lognormal":
+                median, sigma = self.params
+                return rng.lognormvariate(math.log(median), sigma) if median else 0.0
+
+
+@dataclass(frozen=True)
+class MockSettings:
+    """How the mock service behaves."""
+
+    fixtures: Path | None = None
+    latency: Distribution = field(default_factory=lambda: Distribution.parse("0"))
+    job_duration: Distribution = field(default_factory=lambda: Distribution.parse("1"))
+    error_rate: float = 0.0  # chance any request gets an injected error
+    error_statuses: tuple[int, ...] = (500, 502, 503)
+    bandwidth: int | None = None  # response bytes per second
+    request_encodings: tuple[str, ...] = ("gzip", "deflate")  # others get HTTP 415
+    seed: int | None = None
+
+
+@dataclass(frozen=True)
+class Fixture:
+    """A canned response."""
+
+    status: int
+    body: bytes
+
+
+@dataclass
+class _Job:
+    result: Fixture
+    submitted_at: float
+    duration: float
+
+    @property
+    def done(self) -> bool:
+        return time.monotonic() - self.submitted_at >= self.duration
+
+
+def _default_body(kind: str, request: dict[str, Any]) -> dict[str, Any]:
+    """A minimal valid response: the query graph, with nothing found."""
+    if kind == "meta_knowledge_graph":
+        return {"nodes": {}, "edges": []}
+    # The versions translator_tom's semantic validation (`Semantic`) expects
+    from translator_tom.utils.config import TRAPI_CONFIG
+
+    message = request.get("message") or {}
+    return {
+        "status": "Success",
+        "description": "Mock response.",
+        "schema_version": TRAPI_CONFIG.schema_version,
+        "biolink_version": TRAPI_CONFIG.biolink_version,
+        "logs": [],
+        "message": {
+            "query_graph": message.get("query_graph"),
+            "knowledge_graph": {"nodes": {}, "edges": {}},
+            "results": [],
+            "auxiliary_graphs": {},
+        },
+    }
+
+
+class FixtureStore:
+    """Finds the canned response for a request (see the module docstring)."""
+
+    def __init__(self, directory: Path | None) -> None:
+        """Index ``directory`` (a fixtures directory or a cassette), if given."""
+        self.directory = directory
+        self._files: dict[Path, Fixture | None] = {}
+        self._recorded: dict[str, Fixture] = {}
+        if directory is not None and (directory / "index.json").exists():
+            tape = Cassette(directory, "replay")
+            for entry in tape.entries():
+                if entry["blob"] is not None and entry["endpoint"] is not None:
+                    self._recorded[unquote(entry["endpoint"]).strip("/")] = Fixture(
+                        cast(int, entry["http_status"]), tape.read_blob(entry["blob"])
+                    )
+
+    def _file(self, name: str) -> Fixture | None:
+        path = cast(Path, self.directory) / f"{name}.json"
+        if path not in self._files:
+            self._files[path] = (
+                Fixture(200, path.read_bytes()) if path.is_file() else None
+            )
+        return self._files[path]
+
+    def find(self, path: str, kind: str, request: dict[str, Any]) -> Fixture:
+        """The response for a request to ``path`` (of endpoint ``kind``).
+
+        The path is matched longest suffix first, so a service's base path (e.g.
+        ``/v1``) doesn't matter.
+        """
+        parts = unquote(path).strip("/").split("/")
+        names = ["/".join(parts[start:]) for start in range(len(parts))]
+        for name in [*names, kind]:
+            if (recorded := self._recorded.get(name)) is not None:
+                return recorded
+            if self.directory is not None and (fixture := self._file(name)):
+                return fixture
+        return Fixture(200, json.dumps(_default_body(kind, request)).encode())
+
+
+class MockServer:
+    """A threaded HTTP server acting as a TRAPI service."""
+
+    def __init__(self, settings: MockSettings, host: str, port: int) -> None:
+        """Bind the server (not yet serving)."""
+        self.settings = settings
+        self.fixtures = FixtureStore(settings.fixtures)
+        self.counts: Counter[str] = Counter()
+        self._jobs: dict[str, _Job] = {}
+        self._expiry: list[tuple[float, str]] = []  # heap of (expires at, job_id)
+        self._lock = threading.Lock()
+        self._rng = random.Random(settings.seed)
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        address, bound_port = self._server.server_address[:2]
+        self.base_url = f"http://{address!s}:{bound_port}"
+
+    def serve_forever(self) -> None:
+        """Serve until interrupted, then release the port."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def _sample(self, distribution: Distribution) -> float:
+        with self._lock:
+            return distribution.sample(self._rng)
+
+    def _injected_error(self) -> int | None:
+        """An error status to respond with instead, by ``error_rate``."""
+        with self._lock:
+            if self._rng.random() >= self.settings.error_rate:
+                return None
+            return self._rng.choice(self.settings.error_statuses)
+
+    def _submit(self, result: Fixture, callback_url: str | None) -> dict[str, Any]:
+        """Start an async job, calling back (if asked) when it's done."""
+        job_id = secrets.token_hex(8)
+        now = time.monotonic()
+        job = _Job(result, now, self._sample(self.settings.job_duration))
+        with self._lock:
+            # Drop jobs finished long ago whose results were never fetched
+            while self._expiry and self._expiry[0][0] <= now:
+                self._jobs.pop(heapq.heappop(self._expiry)[1], None)
+            self._jobs[job_id] = job
+            heapq.heappush(self._expiry, (now + job.duration + JOB_TTL, job_id))
+        if callback_url is not None:
+
+            def call_back() -> None:
+                time.sleep(job.duration)
+                with contextlib.suppress(httpx.HTTPError):  # Left to polling
+                    transport.client().post(
+                        callback_url,
+                        content=result.body,
+                        headers={"Content-Type": "application/json"},
+                    )
+
+            threading.Thread(target=call_back, daemon=True).start()
+        return {"status": "Accepted", "job_id": job_id, "description": "Job queued."}
+
+    def _job_status(self, job_id: str) -> tuple[int, dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return 404, {"status": "Failed", "description": f"No job {job_id}."}
+        if not job.done:
+            return 200, {"status": "Running", "job_id": job_id, "logs": []}
+        return 200, {
+            "status": "Completed",
+            "job_id": job_id,
+            "response_url": f"{self.base_url}/asyncquery_response/{job_id}",
+            "logs": [],
+        }
+
+    def _respond(self, method: str, path: str, request: dict[str, Any]) -> Fixture:
+        """The response to one request (before latency and bandwidth)."""
+        if (match := _ENDPOINT.search(path)) is not None:
+            kind = match.group(1)
+            fixture = self.fixtures.find(path, kind, request)
+            if kind != "asyncquery" or fixture.status != httpx.codes.OK:
+                return fixture
+            body = self._submit(fixture, request.get("callback"))
+            return Fixture(200, json.dumps(body).encode())
+        if method == "GET" and (match := _STATUS.search(path)) is not None:
+            status, body = self._job_status(match.group(1))
+            return Fixture(status, json.dumps(body).encode())
+        if method == "GET" and (match := _RESULT.search(path)) is not None:
+            with self._lock:
+                job = self._jobs.get(match.group(1))
+                if job is not None and job.done:  # collected, so no longer kept
+                    del self._jobs[match.group(1)]
+                    return job.result
+        return Fixture(404, b'{"detail": "Not Found"}')
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            @override
+            def log_message(self, format: str, *args: Any) -> None:
+                pass  # Keep the terminal clean
+
+            def _handle(self, method: str) -> None:
+                started = time.monotonic()
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                encoding = self.headers.get("Content-Encoding", "identity").lower()
+                accepted = encoding == "identity" or (
+                    encoding in server.settings.request_encodings
+                    and encoding in _DECODERS
+                )
+                try:
+                    request = (
+                        json.loads(_DECODERS[encoding](raw)) if raw and accepted else {}
+                    )
+                except (ValueError, OSError, zlib.error):
+                    request = {}
+                path = self.path.split("?", 1)[0]
+
+                error = server._injected_error()
+                if not accepted:
+                    fixture = Fixture(
+                        415, b'{"detail": "Unsupported Content-Encoding"}'
+                    )
+                elif error is not None:
+                    fixture = Fixture(error, b'{"detail": "Injected error"}')
+                else:
+                    fixture = server._respond(method, path, request)
+                with server._lock:
+                    server.counts[str(fixture.status)] += 1
+
+                delay = server._sample(server.settings.latency)
+                time.sleep(max(delay - (time.monotonic() - started), 0))
+                self._send(fixture)
+
+            def _send(self, fixture: Fixture) -> None:
+                self.send_response(fixture.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(fixture.body)))
+                self.end_headers()
+                bandwidth = server.settings.bandwidth
+                if bandwidth is None:
+                    self.wfile.write(fixture.body)
+                    return
+                for offset in range(0, len(fixture.body), WRITE_CHUNK):
+                    chunk = fixture.body[offset : offset + WRITE_CHUNK]
+                    self.wfile.write(chunk)
+                    time.sleep(len(chunk) / bandwidth)
+
+            def do_GET(self) -> None:  # noqa: N802
+                """Serve a GET."""
+                self._handle("GET")
+
+            def do_POST(self) -> None:  # noqa: N802
+                """Serve a POST."""
+                self._handle("POST")
+
+        return Handler
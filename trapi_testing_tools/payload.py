@@ -0,0 +1,50 @@
+"""Request bodies encoded once, however many times they're sent.
+
+A query's body is encoded to JSON bytes the first time it's sent (see
+`Query.payload`), and those bytes are reused for every environment, repetition
+and load iteration, rather than httpx re-encoding the body for each request.
+Each compressed form is likewise built at most once. Whether a body is sent
+compressed, and how, is up to `transport` (``transport.request_encoding``).
+"""
+
+import gzip
+import json
+import zlib
+from typing import Any, Literal
+
+Encoding = Literal["identity", "gzip", "deflate"]
+"""A request ``Content-Encoding``; ``identity`` means uncompressed."""
+
+
+def encode(body: Any) -> bytes:
+    """A body as compact UTF-8 JSON, TOM objects serialized."""
+    if not isinstance(body, dict | list):
+        from trapi_testing_tools.utils import serialize_body
+
+        body = serialize_body(body)
+    return json.dumps(
+        body, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+    ).encode()
+
+
+class Payload:
+    """A request body as JSON bytes, compressed at most once per encoding."""
+
+    def __init__(self, content: bytes) -> None:
+        """Wrap already-encoded JSON bytes."""
+        self.content = content
+        self._encoded: dict[Encoding, bytes] = {"identity": content}
+
+    @classmethod
+    def of(cls, body: Any) -> "Payload | None":
+        """Encode a query body; None for no body."""
+        return None if body is None else cls(encode(body))
+
+    def encoded(self, encoding: Encoding) -> bytes:
+        """The body as sent with the given ``Content-Encoding``."""
+        if encoding not in self._encoded:
+            if encoding == "gzip":
+                self._encoded[encoding] = gzip.compress(self.content, mtime=0)
+            else:
+                self._encoded[encoding] = zlib.compress(self.content)
+        return self._encoded[encoding]
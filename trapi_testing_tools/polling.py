@@ -0,0 +1,112 @@
+"""Polling of asyncquery jobs: when to poll, and how precisely completion is known."""
+
+import math
+import random
+import time
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, ClassVar
+
+from pydantic import BaseModel, ConfigDict, Field
+
+if TYPE_CHECKING:
+    import httpx
+
+ACTIVE_STATUSES = ("Accepted", "Queued", "Running")
+"""Job statuses that mean the job hasn't finished yet."""
+
+
+class PollStrategy(BaseModel):
+    """How long to wait between status polls of an async job.
+
+    Polls quickly at first (`fast_polls` polls `initial` seconds apart), then backs
+    off exponentially by `factor` up to `max_interval`. Each wait is spread by up to
+    `jitter` (a fraction) either way so many jobs don't poll in lockstep. A server's
+    ``Retry-After`` overrides the computed wait.
+
+    Set in `config.yaml` under `polling`, or per query file with a module-level
+    ``polling`` (a `PollStrategy` or dict of its fields, or `Query.polling` per step).
+    e.g. ``PollStrategy(initial=10, fast_polls=0, factor=1)`` polls every 10s.
+    """
+
+    model_config: ClassVar[ConfigDict] = ConfigDict(frozen=True)
+
+    initial: float = Field(default=1.0, gt=0)
+    fast_polls: int = Field(default=3, ge=0)
+    factor: float = Field(default=2.0, ge=1)
+    max_interval: float = Field(default=10.0, gt=0)
+    jitter: float = Field(default=0.1, ge=0, lt=1)
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to wait before re-poll number ``attempt`` (counting from 1)."""
+        if retry_after is not None:
+            return retry_after
+        backoff = max(attempt - self.fast_polls, 0)
+        base = min(self.initial * self.factor**backoff, self.max_interval)
+        spread = random.uniform(-self.jitter, self.jitter)
+        return min(base * (1 + spread), self.max_interval)
+
+
+def retry_after(response: "httpx.Response") -> float | None:
+    """The response's ``Retry-After`` in seconds (given as seconds or a date)."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+def poll_timeout(timeout: float) -> float:
+    """A configured timeout in seconds, where a negative value means none."""
+    return timeout if timeout >= 0 else math.inf
+
+
+class PollTimer:
+    """Paces the polls of one job and tracks when its completion was observed.
+
+    The first poll happens immediately; later ones wait per the `PollStrategy`,
+    never past the deadline. As a ``fallback`` (e.g. behind a callback), every
+    poll waits at least the strategy's `max_interval`. `uncertainty` is the gap
+    between the last two looks at the job (the submission response counting as
+    the first), i.e. the window in which it actually finished.
+    """
+
+    def __init__(
+        self, strategy: PollStrategy, timeout: float, fallback: bool = False
+    ) -> None:
+        """Start timing from the submission response, with ``timeout`` seconds."""
+        self.strategy = strategy
+        self.floor = strategy.max_interval if fallback else 0.0
+        self.last_look = time.monotonic()
+        self.deadline = self.last_look + poll_timeout(timeout)
+        self.attempt = 0
+        self.uncertainty = 0.0
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return time.monotonic() > self.deadline
+
+    def next_delay(self, response: "httpx.Response") -> float:
+        """Seconds to wait before the next poll, given the latest status response."""
+        delay = (
+            0.0
+            if self.attempt == 0
+            else self.strategy.delay(self.attempt, retry_after(response))
+        )
+        self.attempt += 1
+        delay = max(delay, self.floor)
+        return max(0.0, min(delay, self.deadline - time.monotonic()))
+
+    def polled(self) -> None:
+        """Record that a poll response just arrived."""
+        now = time.monotonic()
+        self.uncertainty = now - self.last_look
+        self.last_look = now
@@ -1,12 +1,46 @@
 import json
+import math
+import statistics
+import sys
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Literal, NotRequired, TypedDict, cast
+from typing import Any, BinaryIO, Literal, NotRequired, TypedDict
 
 import httpx
 
-# A parsed JSON response body, or the raw text when the body isn't JSON.
-ResponseBody = dict[str, Any] | list[Any] | str | None
+from tests import trapi
+from trapi_testing_tools import blobs
+from trapi_testing_tools.blobs import BlobRef, StoredBody
+from trapi_testing_tools.spool import CHUNK_SIZE
+from trapi_testing_tools.timing import StepTiming, phases
+
+
+class RawBody:
+    """A JSON response body, kept as the bytes it arrived as.
+
+    The pipe report splices these in verbatim rather than decoding and
+    re-encoding them.
+    """
+
+    def __init__(self, response: httpx.Response) -> None:
+        """Wrap ``response``, whose body must be valid JSON."""
+        self.response = response
+
+    def chunks(self) -> Iterator[bytes]:
+        """The body's bytes, minus line breaks so the report stays on one line.
+
+        JSON strings can't hold raw line breaks, so only whitespace is dropped.
+        """
+        for chunk in self.response.iter_bytes(CHUNK_SIZE):
+            if b"\n" in chunk or b"\r" in chunk:
+                chunk = chunk.translate(None, b"\r\n")  # noqa: PLW2901
+            yield chunk
+
+
+# A JSON response body (or its reference, with a blob store open), or the raw
+# text when the body isn't JSON.
+ResponseBody = RawBody | BlobRef | str | None
 
 StepStatus = Literal["ok", "no_response", "timeout", "error"]
 
@@ -36,20 +70,71 @@ class StepResult(TypedDict):
     error: str | None  # message when status != "ok", else None
     passed: bool  # request ok AND every test passed
     elapsed_seconds: float
+    elapsed_uncertainty_seconds: float  # for async jobs, the window completion fell in
+    timing: StepTiming | None  # phases of the final HTTP response; None if none
+    schema_version: str | None  # as reported by a TRAPI response body
+    biolink_version: str | None
     tests: TestSummary
     response: NotRequired[ResponseBody]  # omittable by a future flag
 
 
+class ElapsedStats(TypedDict):
+    """Summary statistics of elapsed times across repetitions, in seconds."""
+
+    min: float
+    median: float
+    mean: float
+    p95: float
+    max: float
+    stdev: float  # sample standard deviation; 0 for a single run
+
+
+class RepetitionStats(TypedDict):
+    """How a query fared across ``tt test --repeat`` runs (warmup runs excluded)."""
+
+    runs: int
+    warmup: int
+    pass_rate: float  # fraction of runs that passed, tests included
+    elapsed: ElapsedStats  # of the query's total elapsed time
+    elapsed_samples: list[float]  # each run's, in order (e.g. for `--baseline`)
+    step_elapsed: list[ElapsedStats]  # per step, over the runs that reached it
+
+
+class VariantResult(TypedDict):
+    """How one variant (table row) of a query matrix fared."""
+
+    label: str  # the row's `id`, or its row number
+    passed: bool
+    error: str | None  # why it couldn't be built or got no response; else None
+    elapsed_seconds: float | None  # None if it couldn't be built, so never ran
+    failed_tests: list[str]  # names of the tests it failed
+
+
+class MatrixStats(TypedDict):
+    """How a query matrix fared across its variants (see `matrix`)."""
+
+    variants: int
+    passed: int
+    pass_rate: float
+    elapsed: ElapsedStats | None  # of variants' elapsed times; None if none ran
+    shown: (
+        str | None
+    )  # the variant whose steps the result has: first failing, else last
+    results: list[VariantResult]  # in table order
+
+
 class QueryResult(TypedDict):
     """One query file run against one environment; a `steps` list (len 1 for a singleton)."""
 
     type: Literal["singleton", "multi_step"]
     path: str  # repo-relative query file path
     env: str  # the environment this query ran against
-    passed: bool  # every step passed
+    passed: bool  # every step passed (in every repetition)
     error: str | None  # pre-run failure (import/parse/missing); else None
     elapsed_seconds: float
-    steps: list[StepResult]
+    steps: list[StepResult]  # with --repeat, the last run's
+    repetitions: NotRequired[RepetitionStats]  # with --repeat/--warmup
+    matrix: NotRequired[MatrixStats]  # for a query matrix, one entry per variant
 
 
 class RunReport(TypedDict):
@@ -63,9 +148,26 @@ class RunReport(TypedDict):
     query_count: int  # number of query results (files x environments)
     passed: bool  # every query passed
     elapsed_seconds: float
+    # per env: DNS/TCP/TLS setup time measured by the up-front connection warm-up,
+    # so steps' elapsed times are request time only (None if the env was unreachable)
+    connection_setup_seconds: dict[str, float | None]
     queries: list[QueryResult]
 
 
+class RunSummary(TypedDict):
+    """The last ``--ndjson`` record: the `RunReport` without its queries.
+
+    Each query's `QueryResult` is its own record before this one.
+    """
+
+    type: Literal["summary"]
+    envs: list[str]
+    query_count: int
+    passed: bool
+    elapsed_seconds: float
+    connection_setup_seconds: dict[str, float | None]
+
+
 # ##### construction #####
 
 
@@ -80,16 +182,58 @@ class StepRun:
     elapsed: float
     target: str
     method: str
+    uncertainty: float = 0.0
+
+
+_NOT_JSON = object()
+"""`_decoded`'s result for a body that isn't JSON."""
 
 
-def _response_body(response: httpx.Response | None) -> ResponseBody:
-    """The parsed JSON body, or the raw text when it isn't JSON, or None."""
+def _decoded(response: httpx.Response | None) -> Any:
+    """A response's JSON body, decoded at most once and not kept (see `as_json`).
+
+    None for no response, `_NOT_JSON` for a body that isn't JSON.
+    """
     if response is None:
         return None
     try:
-        return cast(ResponseBody, response.json())
-    except Exception:
+        return trapi.as_json(response, keep=False)
+    except ValueError:
+        return _NOT_JSON
+
+
+def _response_body(response: httpx.Response | None, decoded: Any) -> ResponseBody:
+    """The JSON body (as is, or stored), or the raw text when it isn't JSON, or None.
+
+    ``decoded`` is the body from `_decoded`; the JSON itself is spliced in as
+    received (see `RawBody`) unless it's stored.
+    """
+    if response is None:
+        return None
+    if decoded is _NOT_JSON:
         return response.text
+    store = blobs.active()
+    return RawBody(response) if store is None else store.put(decoded)
+
+
+def _versions(body: Any) -> tuple[str | None, str | None]:
+    """The TRAPI schema and Biolink versions a decoded body reports, if any."""
+    if not isinstance(body, dict):
+        return None, None
+    schema, biolink = body.get("schema_version"), body.get("biolink_version")
+    return (
+        schema if isinstance(schema, str) else None,
+        biolink if isinstance(biolink, str) else None,
+    )
+
+
+def _rounded(timing: StepTiming) -> StepTiming:
+    """Round a timing breakdown's phase times for the report."""
+    for phase in ("connect_seconds", "tls_seconds", "ttfb_seconds", "download_seconds"):
+        value = timing[phase]
+        if value is not None:
+            timing[phase] = round(value, 4)
+    return timing
 
 
 def build_step(
@@ -106,6 +250,8 @@ def build_step(
     status = run.status
     if run.response is None and status == "ok":
         status = "no_response"
+    decoded = _decoded(run.response)
+    schema_version, biolink_version = _versions(decoded)
     step: StepResult = {
         "target": run.target,
         "method": run.method,
@@ -114,10 +260,14 @@ def build_step(
         "error": run.error,
         "passed": step_passed,
         "elapsed_seconds": round(run.elapsed, 3),
+        "elapsed_uncertainty_seconds": round(run.uncertainty, 3),
+        "timing": _rounded(phases(run.response)) if run.response is not None else None,
+        "schema_version": schema_version,
+        "biolink_version": biolink_version,
         "tests": {"passed": tests_passed, "cases": outcomes or []},
     }
     if include_response:
-        step["response"] = _response_body(run.response)
+        step["response"] = _response_body(run.response, decoded)
     return step
 
 
@@ -141,6 +291,118 @@ def build_query_result(  # noqa: PLR0913
     }
 
 
+def elapsed_stats(values: list[float]) -> ElapsedStats:
+    """Summarize a (non-empty) list of elapsed times."""
+    ordered = sorted(values)
+    p95 = ordered[max(math.ceil(len(ordered) * 0.95) - 1, 0)]  # nearest rank
+    return {
+        "min": round(ordered[0], 3),
+        "median": round(statistics.median(ordered), 3),
+        "mean": round(statistics.fmean(ordered), 3),
+        "p95": round(p95, 3),
+        "max": round(ordered[-1], 3),
+        "stdev": round(statistics.stdev(ordered), 3) if len(ordered) > 1 else 0.0,
+    }
+
+
+def combine_repetitions(runs: list[QueryResult], warmup: int) -> QueryResult:
+    """Fold one query's repeated runs into the last run's result plus statistics.
+
+    The combined result only passes if every run passed, so flaky queries fail.
+    """
+    last = runs[-1]
+    step_count = max(len(run["steps"]) for run in runs)
+    step_elapsed = [
+        elapsed_stats(
+            [
+                run["steps"][i]["elapsed_seconds"]
+                for run in runs
+                if len(run["steps"]) > i
+            ]
+        )
+        for i in range(step_count)
+    ]
+    return {
+        **last,
+        "passed": all(run["passed"] for run in runs),
+        "repetitions": {
+            "runs": len(runs),
+            "warmup": warmup,
+            "pass_rate": round(sum(run["passed"] for run in runs) / len(runs), 4),
+            "elapsed": elapsed_stats([run["elapsed_seconds"] for run in runs]),
+            "elapsed_samples": [run["elapsed_seconds"] for run in runs],
+            "step_elapsed": step_elapsed,
+        },
+    }
+
+
+def variant_result(label: str, result: QueryResult) -> VariantResult:
+    """One variant's outcome, from its run's result."""
+    errors = [step["error"] for step in result["steps"] if step["error"]]
+    return {
+        "label": label,
+        "passed": result["passed"],
+        "error": result["error"] or (errors[0] if errors else None),
+        "elapsed_seconds": result["elapsed_seconds"],
+        "failed_tests": [
+            case["name"]
+            for step in result["steps"]
+            for case in step["tests"]["cases"]
+            if not case["passed"]
+        ],
+    }
+
+
+def variant_error(label: str, error: str) -> VariantResult:
+    """A variant that couldn't be built, so never ran."""
+    return {
+        "label": label,
+        "passed": False,
+        "error": error,
+        "elapsed_seconds": None,
+        "failed_tests": [],
+    }
+
+
+def combine_variants(
+    path: Path,
+    env: str,
+    shown: tuple[str, QueryResult] | None,
+    variants: list[VariantResult],
+    elapsed: float,
+) -> QueryResult:
+    """Fold a matrix's variants into one result for its file.
+
+    The result has the ``shown`` variant's steps (labelled in ``matrix.shown``),
+    passes only if every variant passed (and there was at least one), and takes
+    ``elapsed``, the time to run every variant, as its elapsed time.
+    """
+    passed = sum(variant["passed"] for variant in variants)
+    samples = [
+        variant["elapsed_seconds"]
+        for variant in variants
+        if variant["elapsed_seconds"] is not None
+    ]
+    steps = shown[1]["steps"] if shown is not None else []
+    return {
+        "type": "multi_step" if len(steps) > 1 else "singleton",
+        "path": str(path),
+        "env": env,
+        "passed": bool(variants) and passed == len(variants),
+        "error": None if variants else "the matrix's table has no rows",
+        "elapsed_seconds": round(elapsed, 3),
+        "steps": steps,
+        "matrix": {
+            "variants": len(variants),
+            "passed": passed,
+            "pass_rate": round(passed / len(variants), 4) if variants else 0.0,
+            "elapsed": elapsed_stats(samples) if samples else None,
+            "shown": shown[0] if shown is not None else None,
+            "results": variants,
+        },
+    }
+
+
 def pre_run_failure(file: Path, env: str, error: str) -> QueryResult:
     """A `QueryResult` for a file that couldn't be run (missing/import/parse)."""
     return {
@@ -154,32 +416,103 @@ def pre_run_failure(file: Path, env: str, error: str) -> QueryResult:
     }
 
 
-def emit_report(
+def write_json(value: object, out: BinaryIO) -> None:
+    """Write ``value`` as JSON, splicing in any `RawBody`/`StoredBody` verbatim."""
+    if isinstance(value, RawBody | StoredBody):
+        for chunk in value.chunks():
+            out.write(chunk)
+    elif isinstance(value, dict):
+        out.write(b"{")
+        for index, (key, item) in enumerate(value.items()):
+            if index:
+                out.write(b", ")
+            out.write(json.dumps(key, ensure_ascii=False).encode() + b": ")
+            write_json(item, out)
+        out.write(b"}")
+    elif isinstance(value, list):
+        out.write(b"[")
+        for index, item in enumerate(value):
+            if index:
+                out.write(b", ")
+            write_json(item, out)
+        out.write(b"]")
+    else:
+        out.write(json.dumps(value, ensure_ascii=False).encode())
+
+
+def _rounded_setup(
+    connection_setup: dict[str, float | None] | None,
+) -> dict[str, float | None]:
+    return {
+        env: None if setup is None else round(setup, 3)
+        for env, setup in (connection_setup or {}).items()
+    }
+
+
+def emit_record(record: QueryResult | RunSummary) -> None:
+    """Write one ``--ndjson`` record to stdout as a line, flushed right away."""
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    write_json(record, out)
+    out.write(b"\n")
+    out.flush()
+
+
+def emit_summary(
+    query_count: int,
+    envs: list[str],
+    passed: bool,
+    elapsed: float,
+    connection_setup: dict[str, float | None] | None = None,
+) -> None:
+    """Write the closing ``--ndjson`` record (see `RunSummary`)."""
+    emit_record(
+        {
+            "type": "summary",
+            "envs": envs,
+            "query_count": query_count,
+            "passed": passed,
+            "elapsed_seconds": round(elapsed, 3),
+            "connection_setup_seconds": _rounded_setup(connection_setup),
+        }
+    )
+
+
+def emit_report(  # noqa: PLR0913
     queries: list[QueryResult],
     envs: list[str],
     passed: bool,
     elapsed: float,
     report_only: bool,
+    connection_setup: dict[str, float | None] | None = None,
 ) -> None:
     """Write the pipe output to stdout.
 
     A lone single-step query emits just its raw response body for basic piping.
     Otherwise emits the aggregate `RunReport` envelope. ``report_only`` always
-    emits the envelope (there are no responses to pipe raw).
+    emits the envelope (there are no responses to pipe raw), as do a repeated
+    query and a query matrix, whose statistics a lone body would drop.
+
+    Either way, JSON response bodies are copied through as received (see
+    `RawBody`), and only the report around them is serialized.
     """
+    sys.stdout.flush()  # anything printed earlier goes first
+    out = sys.stdout.buffer
     if (
         not report_only
         and len(queries) == 1
         and queries[0]["type"] == "singleton"
         and queries[0]["steps"]
+        and "repetitions" not in queries[0]
+        and "matrix" not in queries[0]
     ):
         response = queries[0]["steps"][0].get("response")
-        if response is not None:
-            print(
-                json.dumps(response, ensure_ascii=False)
-                if isinstance(response, dict | list)
-                else response
-            )
+        if isinstance(response, str):
+            out.write(f"{response}\n".encode())
+        elif response is not None:
+            write_json(response, out)
+            out.write(b"\n")
+        out.flush()
         return
 
     report: RunReport = {
@@ -187,6 +520,9 @@ def emit_report(
         "query_count": len(queries),
         "passed": passed,
         "elapsed_seconds": round(elapsed, 3),
+        "connection_setup_seconds": _rounded_setup(connection_setup),
         "queries": queries,
     }
-    print(json.dumps(report, ensure_ascii=False))
+    write_json(report, out)
+    out.write(b"\n")
+    out.flush()
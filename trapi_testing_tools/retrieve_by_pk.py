@@ -8,17 +8,16 @@ from sys import stderr
 from typing import Any, Literal
 
 import httpx
-from InquirerPy.prompts.confirm import ConfirmPrompt
-from InquirerPy.prompts.fuzzy import FuzzyPrompt
 from rich import box, progress
 from rich.console import Console
 from rich.table import Table
 
+from trapi_testing_tools import transport
 from trapi_testing_tools.config import CONFIG
 from trapi_testing_tools.utils import handle_output
 
 console = Console(stderr=True)
-client = httpx.AsyncClient(follow_redirects=True, timeout=300)
+client = transport.async_client()
 
 
 async def check_ars_pk(
@@ -92,6 +91,8 @@ def get_ars_ara_response(
     else:
         if ara is not None:
             console.print(f"Warning: pre-selected ara '{ara}' not a valid actor")
+        from InquirerPy.prompts.fuzzy import FuzzyPrompt
+
         selection = FuzzyPrompt(
             message="Select ARA to retrieve response of:",
             choices=[actor.removeprefix("ara-") for actor in actors],
@@ -106,7 +107,7 @@ def get_ars_ara_response(
     console.print(f"Child key for {selection}: {actor['message']}")
 
     with console.status("Querying ARS for TRAPI response..."):
-        response = httpx.get(f"{target_ars}/{actor['message']}")
+        response = transport.client().get(f"{target_ars}/{actor['message']}")
     response.raise_for_status()
     console.print(f"Got ARS stored response for {selection}")
     return response.json(), actor["actor"]["agent"]
@@ -283,6 +284,8 @@ def extract_response_payload(body: dict[str, Any]) -> dict[str, Any]:
 def handle_error(msg: str, error: Exception) -> None:
     """Print some `msg` and error name, prompting to print traceback."""
     console.print(f"ERROR: {msg} due to {error!r}")
+    from InquirerPy.prompts.confirm import ConfirmPrompt
+
     with redirect_stdout(stderr):
         if ConfirmPrompt("Print traceback for this error?", default=False).execute():
             console.print_exception(show_locals=True)
@@ -1,5 +1,11 @@
+import asyncio
 import importlib
+import io
+import sqlite3
 import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
 from pathlib import Path
 from types import ModuleType
 from typing import Any, Literal, cast
@@ -11,31 +17,109 @@ from rich.panel import Panel
 from rich.text import Text
 
 import trapi_testing_tools
+from tests import perf, trapi
+from tests.base_test import test_name
+from trapi_testing_tools import (
+    async_jobs,
+    baseline,
+    blobs,
+    callback,
+    cassette,
+    history,
+    matrix,
+    timing,
+    transport,
+)
 from trapi_testing_tools.config import CONFIG
+from trapi_testing_tools.polling import ACTIVE_STATUSES, PollStrategy, PollTimer
 from trapi_testing_tools.report import (
     QueryResult,
     StepResult,
     StepRun,
     TestOutcome,
+    VariantResult,
     build_query_result,
     build_step,
+    combine_repetitions,
+    combine_variants,
+    emit_record,
     emit_report,
+    emit_summary,
     pre_run_failure,
+    variant_error,
+    variant_result,
 )
+from trapi_testing_tools.spool import SpooledResponse
 from trapi_testing_tools.types import OutputModes, Query
 from trapi_testing_tools.utils import (
+    ACTIVE_CONSOLE,
+    ContextConsole,
     IndentedBlock,
+    buffered_console,
     handle_output,
     maybe_print_traceback,
     parse_query,
 )
 
-console = Console(stderr=True)
+console = cast(Console, ContextConsole())
 
 
-CLIENT = httpx.Client(
-    follow_redirects=True, timeout=CONFIG.timeout if CONFIG.timeout >= 0 else None
-)
+@dataclass
+class _QueryJob:
+    """One query file scheduled to run against one environment."""
+
+    module: ModuleType
+    env: str
+    url: str
+    save_path: Path | None
+    label: str = ""  # e.g. which repetition this is
+    emit: bool = True  # view/save the final response (only a repetition's last)
+    keep_result: bool = False  # build a QueryResult even when not piping
+    slot: int = 0  # position in the run plan (shared by a job's repetitions)
+    warmup: bool = False  # a warmup repetition, left out of statistics and history
+    concurrency: int = 1  # a query matrix's variants run at once (see `matrix`)
+
+
+# Handed each run's outcome as soon as it's known, returning the outcome to keep
+_Sink = Callable[
+    ["_QueryJob", tuple[bool, QueryResult | None]], tuple[bool, QueryResult | None]
+]
+
+
+class _ResultStream:
+    """Writes each job's `QueryResult` to stdout as an NDJSON line once it's done.
+
+    A repeated job's runs are held until its last one, then combined. Results are
+    dropped once written, so memory doesn't grow with the run.
+    """
+
+    def __init__(self, runs_per_job: int, warmup: int) -> None:
+        self.runs_per_job = runs_per_job
+        self.warmup = warmup
+        self.count = 0
+        self._pending: dict[int, list[tuple[bool, QueryResult | None]]] = {}
+
+    def write(self, result: QueryResult) -> None:
+        emit_record(result)
+        self.count += 1
+
+    def add(
+        self, job: _QueryJob, outcome: tuple[bool, QueryResult | None]
+    ) -> tuple[bool, None]:
+        """Take a run's outcome, writing its job's result if that was the last run.
+
+        Returns the outcome without its result, which is no longer needed.
+        """
+        runs = self._pending.setdefault(job.slot, [])
+        runs.append(outcome)
+        if len(runs) == self.runs_per_job:
+            del self._pending[job.slot]
+            _passed, result = (
+                _combine_runs(runs, self.warmup) if self.runs_per_job > 1 else outcome
+            )
+            if result is not None:
+                self.write(result)
+        return outcome[0], None
 
 
 def run_queries(  # noqa: PLR0913
@@ -45,19 +129,320 @@ def run_queries(  # noqa: PLR0913
     save_path: Path | None = None,
     on_fail: bool = False,
     report_only: bool = False,
+    concurrency: int = 1,
+    collect_async: bool = False,
+    use_callback: bool = False,
+    repeat: int = 1,
+    warmup: int = 0,
+    record: Path | None = None,
+    replay: Path | None = None,
+    ndjson: bool = False,
+    blob_store: Path | None = None,
+    history_path: Path | None = None,
+    baseline_measurements: baseline.Measurements | None = None,
 ) -> bool:
     """Given a set of queries, run each against each target environment.
 
     ``targets`` is a list of ``(env_name, url)`` pairs; every query runs against
-    every target, sequentially. Returns ``True`` only if every run passed. When
-    piping, a single `RunReport` JSON envelope aggregating every query/step is
-    written to stdout.
+    every target. With ``concurrency`` above 1, up to that many query/environment
+    pairs run at once (see `_run_concurrently`); otherwise they run sequentially.
+    ``collect_async`` submits every single-step asyncquery up front and collects
+    them together (see `_submit_then_collect`). Connections to every target are
+    pooled and warmed up front (see `transport`). ``use_callback`` has async jobs
+    report back to a local listener (see `callback`). ``repeat`` runs each query
+    that many times (after ``warmup`` discarded runs), testing every run and adding
+    elapsed-time statistics and a pass rate (see `_repetitions`). ``record`` writes
+    every step's request and response to a cassette directory, and ``replay`` serves
+    them back from one without the network (see `cassette`). A query matrix runs up
+    to ``concurrency`` of its variants at once (see `_manage_matrix`). Returns
+    ``True`` only if every run passed. When piping, a single `RunReport` JSON
+    envelope aggregating every query/step is written to stdout, in file then
+    environment order regardless of completion order. With ``ndjson`` (when piping),
+    each `QueryResult` is instead written as a line as soon as its query finishes,
+    in completion order, followed by a `RunSummary` line (see `_ResultStream`).
+    ``blob_store`` keeps piped and saved JSON bodies in a content-addressed store,
+    referring to them by hash instead (see `blobs`). ``history_path`` records the
+    run to a history database (see `history`), unless it's replayed. With
+    ``baseline_measurements``, each query's latency and response size are compared
+    against them, and regressions fail the run (see `baseline`).
     """
     collect = output_modes[0] == "pipe"  # only collect responses on pipe (save mem)
-    report_queries: list[QueryResult] = []
     run_start = time.monotonic()
 
-    all_passed = True
+    # Each slot is a job to run, or the result of a file that couldn't be run.
+    slots = _plan_jobs(files, targets, save_path, concurrency)
+    all_passed = all(isinstance(slot, _QueryJob) for slot in slots)
+
+    jobs = [slot for slot in slots if isinstance(slot, _QueryJob)]
+    runs = [run for job in jobs for run in _repetitions(job, repeat, warmup)]
+    offline = replay is not None
+    stream = _ResultStream(warmup + repeat, warmup) if collect and ndjson else None
+    recorder = history.RunRecorder() if history_path and not offline else None
+    measurements: baseline.Measurements | None = (
+        {} if baseline_measurements is not None else None
+    )
+    if recorder is not None or measurements is not None:
+        runs = [replace(run, keep_result=True) for run in runs]
+    for slot in slots:
+        if not isinstance(slot, _QueryJob):
+            if stream is not None:
+                stream.write(slot)
+            if recorder is not None:
+                recorder.add(slot)
+
+    def sink(
+        job: _QueryJob, outcome: tuple[bool, QueryResult | None]
+    ) -> tuple[bool, QueryResult | None]:
+        if outcome[1] is not None and not job.warmup:
+            if recorder is not None:
+                recorder.add(outcome[1])
+            if measurements is not None:
+                baseline.add_result(measurements, outcome[1])
+        return outcome if stream is None else stream.add(job, outcome)
+
+    connection_setup = _prepare_connections(targets) if jobs and not offline else {}
+    with (
+        cassette.using(replay or record, "replay" if offline else "record") as tape,
+        callback.receiving(CONFIG.callback, enabled=use_callback and not offline),
+        blobs.using(blob_store),
+    ):
+        outcomes = _run_jobs(
+            runs,
+            concurrency,
+            collect_async and not offline,
+            output_modes,
+            on_fail,
+            report_only,
+            sink
+            if stream is not None or recorder is not None or measurements is not None
+            else None,
+        )
+    if tape is not None and tape.mismatches:
+        console.print(
+            f"{len(tape.mismatches)} step(s) didn't match the cassette:\n  "
+            + "\n  ".join(tape.mismatches),
+            style="red",
+            highlight=False,
+        )
+
+    jobs_passed, report_queries = _fold_outcomes(slots, outcomes, repeat, warmup)
+    all_passed = all_passed and jobs_passed
+
+    if stream is not None:
+        emit_summary(
+            stream.count,
+            [env for env, _url in targets],
+            all_passed,
+            time.monotonic() - run_start,
+            connection_setup,
+        )
+    elif collect:
+        emit_report(
+            report_queries,
+            [env for env, _url in targets],
+            all_passed,
+            time.monotonic() - run_start,
+            report_only,
+            connection_setup,
+        )
+    if recorder is not None:
+        _save_history(
+            recorder,
+            cast(Path, history_path),
+            [env for env, _url in targets],
+            all_passed,
+            time.monotonic() - run_start,
+            connection_setup,
+        )
+    if measurements is not None:
+        comparisons = baseline.compare(
+            cast(baseline.Measurements, baseline_measurements),
+            measurements,
+            CONFIG.baseline,
+        )
+        baseline.print_comparisons(comparisons, CONFIG.baseline)
+        all_passed = all_passed and not any(row["regression"] for row in comparisons)
+    return all_passed
+
+
+def _fold_outcomes(
+    slots: list[_QueryJob | QueryResult],
+    outcomes: list[tuple[bool, QueryResult | None]],
+    repeat: int,
+    warmup: int,
+) -> tuple[bool, list[QueryResult]]:
+    """Whether every job passed, and the results to report, in plan order.
+
+    A repeated job's runs are combined (see `_combine_runs`).
+    """
+    passed = True
+    results: list[QueryResult] = []
+    completed = iter(outcomes)
+    for slot in slots:
+        if not isinstance(slot, _QueryJob):
+            results.append(slot)
+            continue
+        if repeat > 1 or warmup:
+            job_passed, result = _combine_runs(
+                [next(completed) for _ in range(warmup + repeat)], warmup
+            )
+        else:
+            job_passed, result = next(completed)
+        passed = passed and job_passed
+        if result is not None:
+            results.append(result)
+    return passed, results
+
+
+def _save_history(  # noqa: PLR0913
+    recorder: history.RunRecorder,
+    path: Path,
+    envs: list[str],
+    passed: bool,
+    elapsed: float,
+    connection_setup: dict[str, float | None],
+) -> None:
+    """Save a run to the history database, warning (only) if that fails."""
+    try:
+        recorder.save(path, envs, passed, elapsed, connection_setup)
+    except sqlite3.Error as error:
+        console.print(
+            f"WARNING: couldn't record this run to {path}: {error!r}",
+            style="yellow",
+        )
+
+
+def _repetitions(job: _QueryJob, repeat: int, warmup: int) -> list[_QueryJob]:
+    """The runs of one job: ``warmup`` runs, then ``repeat`` measured ones.
+
+    Every run is tested and printed; only the last one's response is viewed or
+    saved.
+    """
+    if repeat == 1 and warmup == 0:
+        return [job]
+    labels = [f"warmup {i}/{warmup}" for i in range(1, warmup + 1)]
+    labels += [f"run {i}/{repeat}" for i in range(1, repeat + 1)]
+    return [
+        replace(
+            job,
+            label=label,
+            emit=i == len(labels) - 1,
+            keep_result=True,
+            warmup=i < warmup,
+        )
+        for i, label in enumerate(labels)
+    ]
+
+
+def _combine_runs(
+    outcomes: list[tuple[bool, QueryResult | None]], warmup: int
+) -> tuple[bool, QueryResult | None]:
+    """Fold a job's repeated runs into one outcome, printing their statistics.
+
+    Warmup runs are left out entirely; the job passes only if every measured run
+    passed.
+    """
+    measured = outcomes[warmup:]
+    results = [result for _passed, result in measured if result is not None]
+    passed = all(run_passed for run_passed, _result in measured)
+    if not results:
+        return passed, None
+    combined = combine_repetitions(results, warmup)
+    stats = combined["repetitions"]
+    elapsed = stats["elapsed"]
+    console.print(
+        f"{combined['path']}  ·  {combined['env']}: {stats['runs']} runs, "
+        f"{stats['pass_rate']:.0%} passed · elapsed median {elapsed['median']:.3f}s "
+        f"(min {elapsed['min']:.3f}, mean {elapsed['mean']:.3f}, "
+        f"p95 {elapsed['p95']:.3f}, max {elapsed['max']:.3f}, "
+        f"stdev {elapsed['stdev']:.3f})",
+        style="bold" if passed else "bold red",
+        highlight=False,
+    )
+    return passed, combined
+
+
+def _prepare_connections(targets: list[tuple[str, str]]) -> dict[str, float | None]:
+    """Give each environment a connection pool, warming it up if configured.
+
+    Returns each environment's connection setup time (see `transport.warm_up`), so
+    DNS/TCP/TLS setup is reported apart from, rather than inside, the first
+    query's elapsed time.
+    """
+    urls = [url for _env, url in targets]
+    shared = transport.use_hosts(urls)
+    if not CONFIG.transport.warmup:
+        return {}
+    with console.status("Warming up connections..."):
+        setup = transport.warm_up(shared, urls)
+    console.print(
+        "Connection setup: "
+        + ", ".join(
+            f"{env} {'unreachable' if setup[url] is None else f'{setup[url]:.3f}s'}"
+            for env, url in targets
+        ),
+        style="italic bright_black",
+        highlight=False,
+    )
+    return {env: setup[url] for env, url in targets}
+
+
+def _run_jobs(  # noqa: PLR0913
+    jobs: list[_QueryJob],
+    concurrency: int,
+    collect_async: bool,
+    output_modes: OutputModes,
+    on_fail: bool,
+    report_only: bool,
+    sink: _Sink | None = None,
+) -> list[tuple[bool, QueryResult | None]]:
+    """Run every job, sequentially or in an event loop, returning outcomes in order.
+
+    Each outcome is handed to ``sink`` (if any) as soon as it's known.
+    """
+    if collect_async or (concurrency > 1 and len(jobs) > 1):
+        return asyncio.run(
+            _run_async(
+                jobs,
+                concurrency,
+                collect_async,
+                output_modes,
+                on_fail,
+                report_only,
+                sink,
+            )
+        )
+    outcomes: list[tuple[bool, QueryResult | None]] = []
+    for job in jobs:
+        outcome = manage_query(
+            job.module,
+            job.url,
+            job.env,
+            output_modes,
+            job.save_path,
+            on_fail,
+            report_only,
+            defer_output=not job.emit,
+            label=job.label,
+            keep_result=job.keep_result,
+            concurrency=job.concurrency,
+        )[:2]
+        outcomes.append(outcome if sink is None else sink(job, outcome))
+    return outcomes
+
+
+def _plan_jobs(
+    files: list[Path],
+    targets: list[tuple[str, str]],
+    save_path: Path | None,
+    concurrency: int = 1,
+) -> list[_QueryJob | QueryResult]:
+    """Import each query file and pair it with every target environment.
+
+    Files that can't be run (missing, or failing to import) yield a pre-run
+    failure result per environment in place of their jobs.
+    """
+    slots: list[_QueryJob | QueryResult] = []
     multiple = len(files) > 1 or len(targets) > 1
     for path in files:
         file = path.resolve().relative_to(Path(trapi_testing_tools.__path__[0]).parent)
@@ -69,12 +454,10 @@ def run_queries(  # noqa: PLR0913
             continue
         if not file.exists():
             console.print(f"ERROR: {file} does not exist. Skipping...", style="red")
-            all_passed = False
-            if collect:
-                report_queries.extend(
-                    pre_run_failure(file, env, "file does not exist")
-                    for env, _url in targets
-                )
+            slots.extend(
+                pre_run_failure(file, env, "file does not exist")
+                for env, _url in targets
+            )
             continue
         try:
             import_path = ".".join(file.with_suffix("").parts)
@@ -84,11 +467,9 @@ def run_queries(  # noqa: PLR0913
                 f"ERROR: failed to read query file due to {error!r}. The query will be skipped."
             )
             maybe_print_traceback()
-            all_passed = False
-            if collect:
-                report_queries.extend(
-                    pre_run_failure(file, env, repr(error)) for env, _url in targets
-                )
+            slots.extend(
+                pre_run_failure(file, env, repr(error)) for env, _url in targets
+            )
             continue
 
         qualified = ".".join(file.with_suffix("").parts).removeprefix("queries.")
@@ -103,23 +484,258 @@ def run_queries(  # noqa: PLR0913
                 query_save_path = query_save_path.with_name(
                     f"{prefix}_{query_save_path.name}"
                 )
-            passed, result = manage_query(
-                query, url, env, output_modes, query_save_path, on_fail, report_only
+            slots.append(
+                _QueryJob(
+                    query,
+                    env,
+                    url,
+                    query_save_path,
+                    slot=len(slots),
+                    concurrency=concurrency,
+                )
             )
-            if not passed:
-                all_passed = False
-            if collect and result is not None:
-                report_queries.append(result)
+    return slots
 
-    if collect:
-        emit_report(
-            report_queries,
-            [env for env, _url in targets],
-            all_passed,
-            time.monotonic() - run_start,
+
+async def _run_async(  # noqa: PLR0913
+    jobs: list[_QueryJob],
+    concurrency: int,
+    collect_async: bool,
+    output_modes: OutputModes,
+    on_fail: bool,
+    report_only: bool,
+    sink: _Sink | None,
+) -> list[tuple[bool, QueryResult | None]]:
+    """Run jobs in one event loop, returning their outcomes in job order.
+
+    With ``collect_async``, single-step asyncquery jobs are submitted and collected
+    together while the rest run with up to ``concurrency`` at once.
+    """
+    # Jobs run in the default executor (`asyncio.to_thread`), which would otherwise
+    # cap them at min(32, CPUs + 4) threads; one more is for writing out output.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=concurrency + 1)
+    )
+    flush_lock = asyncio.Lock()
+    submittable = [job for job in jobs if collect_async and _is_async_single(job)]
+    submitted_ids = set(map(id, submittable))
+    rest = [job for job in jobs if id(job) not in submitted_ids]
+
+    collected, ran = await asyncio.gather(
+        _submit_then_collect(
+            submittable, flush_lock, output_modes, on_fail, report_only, sink
+        ),
+        _run_concurrently(
+            rest, concurrency, flush_lock, output_modes, on_fail, report_only, sink
+        ),
+    )
+    outcomes = dict(zip(map(id, submittable), collected, strict=True))
+    outcomes.update(zip(map(id, rest), ran, strict=True))
+    return [outcomes[id(job)] for job in jobs]
+
+
+async def _run_concurrently(  # noqa: PLR0913
+    jobs: list[_QueryJob],
+    concurrency: int,
+    flush_lock: asyncio.Lock,
+    output_modes: OutputModes,
+    on_fail: bool,
+    report_only: bool,
+    sink: _Sink | None,
+) -> list[tuple[bool, QueryResult | None]]:
+    """Run query jobs with at most ``concurrency`` in flight at once.
+
+    Each job prints into its own buffered console; when it finishes the buffer is
+    written out as one block, so blocks never interleave. Outcomes are returned in
+    job order.
+    """
+    limit = asyncio.Semaphore(concurrency)
+
+    async def run(job: _QueryJob) -> tuple[bool, QueryResult | None]:
+        async with limit:
+            finished = await _execute_buffered(job, output_modes, on_fail, report_only)
+        return await _flush(job, finished, flush_lock, output_modes, on_fail, sink)
+
+    return await asyncio.gather(*(run(job) for job in jobs))
+
+
+def _is_async_single(job: _QueryJob) -> bool:
+    """Whether a job is a single asyncquery step (so it can be submitted early)."""
+    if matrix.is_matrix(job.module):
+        return False
+    try:
+        queries = parse_query(job.module)
+    except Exception:
+        return False  # Left to the normal run to report
+    return len(queries) == 1 and "asyncquery" in (queries[0].endpoint or "")
+
+
+async def _submit_then_collect(  # noqa: PLR0913
+    jobs: list[_QueryJob],
+    flush_lock: asyncio.Lock,
+    output_modes: OutputModes,
+    on_fail: bool,
+    report_only: bool,
+    sink: _Sink | None,
+) -> list[tuple[bool, QueryResult | None]]:
+    """POST every asyncquery job up front, then poll them all together.
+
+    Each job's tests run (and its block is printed) as soon as it completes, so
+    the jobs take about as long as the slowest rather than their sum.
+    """
+    if not jobs:
+        return []
+    urls = list(dict.fromkeys(job.url for job in jobs))
+    async with transport.async_client(urls) as client:
+        if CONFIG.transport.warmup:
+            await transport.warm_up_async(client, urls)
+        with console.status(f"Submitting {len(jobs)} async queries..."):
+            submitted = await asyncio.gather(
+                *(
+                    async_jobs.submit(client, parse_query(job.module)[0], job.url)
+                    for job in jobs
+                )
+            )
+
+        async def finish(
+            job: _QueryJob, pending: async_jobs.SubmittedJob
+        ) -> tuple[bool, QueryResult | None]:
+            run = await async_jobs.collect(client, pending)
+            finished = await _execute_buffered(
+                job, output_modes, on_fail, report_only, _replay_collected(pending, run)
+            )
+            return await _flush(job, finished, flush_lock, output_modes, on_fail, sink)
+
+        return await asyncio.gather(
+            *(
+                finish(job, pending)
+                for job, pending in zip(jobs, submitted, strict=True)
+            )
+        )
+
+
+def _replay_collected(
+    job: async_jobs.SubmittedJob, run: StepRun
+) -> Callable[[Query, str], StepRun]:
+    """A query runner handing back an already-collected job, printed like a run."""
+
+    def runner(_query: Query, _url: str) -> StepRun:
+        console.print(f"{run.method} {run.target}")
+        if job.status_url is not None:
+            console.print(f"GET {job.status_url} (polled with other jobs)")
+        if job.pending is not None:
+            console.print(f"Callback URL {job.pending.url}")
+        if run.error is not None:
+            console.print("Query failed due to an exception, information below:")
+            console.print(run.error)
+        elif run.status == "timeout":
+            console.print("Query timed out.")
+        if run.response is not None:
+            _print_timing(run.response)
+        console.print(
+            f"total query elapsed time: {run.elapsed:.3f} (±{run.uncertainty:.3f})s",
+            highlight=False,
+        )
+        return run
+
+    return runner
+
+
+def _run_step(
+    query: Query,
+    url: str,
+    runner: Callable[[Query, str], StepRun] | None,
+    env: str,
+    key: str,
+) -> StepRun:
+    """Run one step, recording it to or replaying it from any open cassette."""
+    tape = cassette.active()
+    if tape is not None and tape.mode == "replay":
+        return _replay_cassette(tape, key)(query, url)
+    run = (runner or run_query)(query, url)
+    if tape is not None:
+        tape.record(key, env, query, run)
+    return run
+
+
+def _replay_cassette(
+    tape: cassette.Cassette, key: str
+) -> Callable[[Query, str], StepRun]:
+    """A query runner serving a step's recorded run, printed like a run."""
+
+    def runner(query: Query, url: str) -> StepRun:
+        run = tape.replay(key, query, url)
+        console.print(f"{run.method} {run.target} (replayed)")
+        if run.error is not None:
+            console.print(run.error, style="red" if run.response is None else None)
+        if run.response is not None:
+            _print_timing(run.response)
+        console.print(
+            f"recorded elapsed time: {run.elapsed:.3f} (±{run.uncertainty:.3f})s",
+            highlight=False,
+        )
+        return run
+
+    return runner
+
+
+async def _execute_buffered(
+    job: _QueryJob,
+    output_modes: OutputModes,
+    on_fail: bool,
+    report_only: bool,
+    runner: Callable[[Query, str], StepRun] | None = None,
+) -> tuple[bool, QueryResult | None, httpx.Response | None, str]:
+    """Run `manage_query` in a worker thread, printing into a private buffer.
+
+    Returns `manage_query`'s outcome plus the buffered console output.
+    """
+    buffer = io.StringIO()
+    token = ACTIVE_CONSOLE.set(buffered_console(buffer))
+    try:
+        passed, result, response = await asyncio.to_thread(
+            manage_query,
+            job.module,
+            job.url,
+            job.env,
+            output_modes,
+            job.save_path,
+            on_fail,
             report_only,
+            defer_output=True,
+            runner=runner,
+            label=job.label,
+            keep_result=job.keep_result,
+            concurrency=job.concurrency,
         )
-    return all_passed
+    finally:
+        ACTIVE_CONSOLE.reset(token)
+    return passed, result, response, buffer.getvalue()
+
+
+async def _flush(  # noqa: PLR0913
+    job: _QueryJob,
+    finished: tuple[bool, QueryResult | None, httpx.Response | None, str],
+    flush_lock: asyncio.Lock,
+    output_modes: OutputModes,
+    on_fail: bool,
+    sink: _Sink | None,
+) -> tuple[bool, QueryResult | None]:
+    """Write a finished job's block out whole, then handle its view/save output.
+
+    With a ``sink``, the job's outcome is handed to it here too.
+    """
+    passed, result, response, printed = finished
+    async with flush_lock:
+        console.file.write(printed)
+        console.file.flush()
+        if output_modes[0] != "pipe" and job.emit:
+            await asyncio.to_thread(
+                _emit_output, response, output_modes, job.save_path, on_fail, passed
+            )
+        if sink is not None:
+            return sink(job, (passed, result))
+    return passed, result
 
 
 def manage_query(  # noqa: PLR0913
@@ -130,24 +746,57 @@ def manage_query(  # noqa: PLR0913
     save_path: Path | None,
     on_fail: bool,
     report_only: bool,
-) -> tuple[bool, QueryResult | None]:
+    defer_output: bool = False,
+    runner: Callable[[Query, str], StepRun] | None = None,
+    label: str = "",
+    keep_result: bool = False,
+    concurrency: int = 1,
+    variant: tuple[str, list[Query]] | None = None,
+) -> tuple[bool, QueryResult | None, httpx.Response | None]:
     """Interpret query as single or multiple and manage steps in running it.
 
     Returns whether the query (and any tests it defines) passed, plus a
-    `QueryResult` when piping (for the aggregate report), else ``None``.
+    `QueryResult` when piping (for the aggregate report) or ``keep_result`` (with
+    no response bodies), else ``None``, and the final response. ``defer_output``
+    leaves viewing/saving that response to the caller. ``runner`` replaces
+    `run_query` for running each step. ``label`` is shown in the query's header.
+    A query matrix runs each of its variants, up to ``concurrency`` at once (see
+    `_manage_matrix`); ``variant`` (a label and its queries) runs one of them.
     """
-    collect = output_modes[0] == "pipe"
+    if variant is None and matrix.is_matrix(query_module):
+        return _manage_matrix(
+            query_module,
+            url,
+            env,
+            output_modes,
+            save_path,
+            on_fail,
+            report_only,
+            defer_output,
+            label,
+            keep_result,
+            concurrency,
+        )
+    piping = output_modes[0] == "pipe"
+    collect = piping or keep_result
+    include_response = piping and not report_only
 
     rel_path = Path(cast(str, query_module.__file__)).relative_to(
         Path(trapi_testing_tools.__path__[0]).parent
     )
+    if variant is not None:
+        rel_path = rel_path.with_name(f"{rel_path.name}[{variant[0]}]")
     # Use rich text to create a section for this query's context
     console.rule(
-        Text("┌ ", style="rule.line") + str(rel_path) + f"  ·  {env}", align="left"
+        Text("┌ ", style="rule.line")
+        + str(rel_path)
+        + f"  ·  {env}"
+        + (f"  ·  {label}" if label else ""),
+        align="left",
     )
     console.push_render_hook(IndentedBlock())
 
-    queries = parse_query(query_module)
+    queries = parse_query(query_module) if variant is None else variant[1]
 
     steps: list[StepResult] = []
     query_passed = True
@@ -157,8 +806,10 @@ def manage_query(  # noqa: PLR0913
     query_elapsed = 0.0
     final_response: httpx.Response | None = None
 
-    for query in queries:
-        run = run_query(query, url)
+    for index, query in enumerate(queries):
+        run = _run_step(
+            query, url, runner, env, cassette.entry_key(env, rel_path, index)
+        )
         final_response = run.response
         query_elapsed += run.elapsed
 
@@ -170,7 +821,7 @@ def manage_query(  # noqa: PLR0913
                         run,
                         step_passed=False,
                         tests_passed=True,
-                        include_response=not report_only,
+                        include_response=include_response,
                     )
                 )
             console.pop_render_hook()
@@ -182,13 +833,14 @@ def manage_query(  # noqa: PLR0913
                 if collect
                 else None
             )
-            return False, result
+            return False, result, None
 
         step_ok = run.status == "ok"
         outcomes: list[TestOutcome] = []
         tests_passed = True
         if step_ok and query.tests is not None:
             any_tests = True
+            _record_metrics(run.response, run.elapsed, query_elapsed)
             n_passed, n_failed, outcomes = run_tests(query, run.response)
             total_passed += n_passed
             total_failed += n_failed
@@ -204,12 +856,12 @@ def manage_query(  # noqa: PLR0913
                     step_passed,
                     tests_passed,
                     outcomes,
-                    include_response=not report_only,
+                    include_response=include_response,
                 )
             )
 
     # Output (non-pipe only; piping is aggregated into one report by run_queries)
-    if not collect:
+    if not piping and not defer_output:
         _emit_output(final_response, output_modes, save_path, on_fail, query_passed)
 
     console.pop_render_hook()
@@ -227,7 +879,226 @@ def manage_query(  # noqa: PLR0913
         if collect
         else None
     )
-    return query_passed, result
+    return query_passed, result, final_response
+
+
+def _manage_matrix(  # noqa: PLR0913
+    query_module: ModuleType,
+    url: str,
+    env: str,
+    output_modes: OutputModes,
+    save_path: Path | None,
+    on_fail: bool,
+    report_only: bool,
+    defer_output: bool,
+    label: str,
+    keep_result: bool,
+    concurrency: int,
+) -> tuple[bool, QueryResult | None, httpx.Response | None]:
+    """Run every variant of a query matrix, up to ``concurrency`` at once.
+
+    Each variant runs like a query of its own, printing into a buffer that's
+    dropped; failing variants get a line each, then the matrix's pass rate and
+    elapsed-time statistics are printed. Returns like `manage_query`: the result
+    folds every variant into one (see `report.combine_variants`) and the
+    response is that of the variant the result shows.
+    """
+    collect = output_modes[0] == "pipe" or keep_result
+    rel_path = Path(cast(str, query_module.__file__)).relative_to(
+        Path(trapi_testing_tools.__path__[0]).parent
+    )
+    console.rule(
+        Text("┌ ", style="rule.line")
+        + str(rel_path)
+        + f"  ·  {env}  ·  matrix"
+        + (f"  ·  {label}" if label else ""),
+        align="left",
+    )
+    console.push_render_hook(IndentedBlock())
+
+    start = time.monotonic()
+    variants: list[tuple[int, VariantResult]] = []
+    shown: tuple[int, str, QueryResult, httpx.Response | None] | None = None
+    error: str | None = None
+    try:
+        for variant, outcome in _run_variants(
+            query_module, url, env, output_modes, report_only, concurrency
+        ):
+            if isinstance(outcome, Exception):
+                variants.append(
+                    (variant.index, variant_error(variant.label, repr(outcome)))
+                )
+                console.print(
+                    f"[red]x[/] \\[{variant.label}] couldn't be built: {outcome!r}"
+                )
+                continue
+            passed, result, response = outcome
+            result = cast(QueryResult, result)
+            variants.append((variant.index, variant_result(variant.label, result)))
+            if not passed:
+                _print_failed_variant(variants[-1][1])
+            if shown is None or _shows_before(
+                (passed, variant.index), (shown[2]["passed"], shown[0])
+            ):
+                shown = (variant.index, variant.label, result, response)
+    except (ValueError, OSError) as table_error:
+        error = f"couldn't read the matrix's table: {table_error}"
+        console.print(f"ERROR: {error}", style="red")
+
+    variants.sort(key=lambda item: item[0])
+    results = [variant for _index, variant in variants]
+    combined = combine_variants(
+        rel_path,
+        env,
+        None if shown is None else (shown[1], shown[2]),
+        results,
+        time.monotonic() - start,
+    )
+    if error is not None:
+        combined["passed"] = False
+        combined["error"] = error
+    stats = combined["matrix"]
+    query_passed = combined["passed"]
+    response = None if shown is None else shown[3]
+    if stats["elapsed"] is not None:
+        elapsed = stats["elapsed"]
+        console.print(
+            f"{stats['variants']} variant{'' if stats['variants'] == 1 else 's'}, "
+            f"{stats['pass_rate']:.0%} passed · "
+            f"elapsed median {elapsed['median']:.3f}s (min {elapsed['min']:.3f}, "
+            f"p95 {elapsed['p95']:.3f}, max {elapsed['max']:.3f}) · "
+            f"{combined['elapsed_seconds']:.3f}s in all",
+            highlight=False,
+        )
+    elif error is None:
+        console.print(combined["error"], style="red")
+
+    if output_modes[0] != "pipe" and not defer_output:
+        _emit_output(response, output_modes, save_path, on_fail, query_passed)
+
+    console.pop_render_hook()
+    _print_verdict(
+        query_passed,
+        bool(results),
+        stats["passed"],
+        stats["variants"] - stats["passed"],
+    )
+    if on_fail and query_passed:
+        for step in combined["steps"]:
+            step.pop("response", None)
+    return query_passed, combined if collect else None, response
+
+
+def _run_variants(  # noqa: PLR0913
+    query_module: ModuleType,
+    url: str,
+    env: str,
+    output_modes: OutputModes,
+    report_only: bool,
+    concurrency: int,
+) -> Iterator[
+    tuple[
+        matrix.Variant,
+        tuple[bool, QueryResult | None, httpx.Response | None] | Exception,
+    ]
+]:
+    """Run a matrix's variants in worker threads, yielding each as it finishes.
+
+    Rows are read and built only as workers free up, so at most ``concurrency``
+    variants (and their bodies) are in memory at once. A variant that can't be
+    built yields the exception instead of an outcome.
+
+    Raises:
+        ValueError, OSError: if the table can't be read (see `matrix.rows`).
+    """
+    base = parse_query(query_module)[0]
+
+    def run(
+        variant: matrix.Variant,
+    ) -> tuple[bool, QueryResult | None, httpx.Response | None]:
+        queries = matrix.build(query_module, base, variant)
+        token = ACTIVE_CONSOLE.set(buffered_console(io.StringIO()))
+        try:
+            return manage_query(
+                query_module,
+                url,
+                env,
+                output_modes,
+                None,
+                False,
+                report_only,
+                defer_output=True,
+                keep_result=True,
+                variant=(variant.label, queries),
+            )
+        finally:
+            ACTIVE_CONSOLE.reset(token)
+
+    def finished(
+        future: Future[tuple[bool, QueryResult | None, httpx.Response | None]],
+    ) -> tuple[bool, QueryResult | None, httpx.Response | None] | Exception:
+        error = future.exception()
+        return future.result() if error is None else cast(Exception, error)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        running: dict[
+            Future[tuple[bool, QueryResult | None, httpx.Response | None]],
+            matrix.Variant,
+        ] = {}
+        for variant in matrix.variants(query_module):
+            if len(running) >= concurrency:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield running.pop(future), finished(future)
+            running[pool.submit(run, variant)] = variant
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield running.pop(future), finished(future)
+
+
+def _shows_before(variant: tuple[bool, int], shown: tuple[bool, int]) -> bool:
+    """Whether a variant (passed, index) is shown over the one shown so far.
+
+    The first failing variant in table order is shown, else the last passing one.
+    """
+    if variant[0] != shown[0]:
+        return not variant[0]
+    return variant[1] < shown[1] if not variant[0] else variant[1] > shown[1]
+
+
+def _print_failed_variant(variant: VariantResult) -> None:
+    """Print a line on why a matrix variant failed."""
+    reason = (
+        variant["error"]
+        if variant["error"] is not None
+        else "failed " + ", ".join(variant["failed_tests"])
+        if variant["failed_tests"]
+        else "failed"
+    )
+    elapsed = variant["elapsed_seconds"]
+    console.print(
+        f"[red]x[/] \\[{variant['label']}]"
+        + ("" if elapsed is None else f" {elapsed:.3f}s")
+        + f": {reason}"
+    )
+
+
+def _record_metrics(
+    response: httpx.Response, elapsed: float, query_elapsed: float
+) -> None:
+    """Record a step's measurements for its performance tests (see `perf`)."""
+    step_timing = timing.phases(response)
+    decoded = step_timing["decoded_bytes"]
+    perf.record(
+        response,
+        {
+            "elapsed_seconds": elapsed,
+            "query_elapsed_seconds": query_elapsed,
+            "ttfb_seconds": step_timing["ttfb_seconds"],
+            "body_bytes": step_timing["wire_bytes"] if decoded is None else decoded,
+        },
+    )
 
 
 def _emit_output(
@@ -238,15 +1109,18 @@ def _emit_output(
     passed: bool,
 ) -> None:
     """View/save the final response of a non-piping run."""
+    if response is None:
+        return
     view_mode, save_mode = output_modes
     if on_fail and passed:
         view_mode = "skip"
         save_mode = "skip"
-    resp = cast(httpx.Response, response)
-    try:
-        output = cast(dict[str, Any], resp.json())
-    except Exception:
-        output = resp.text
+    output: object = response
+    if not isinstance(response, SpooledResponse):
+        try:
+            output = cast(dict[str, Any], trapi.as_json(response))
+        except Exception:
+            output = response.text
     handle_output(output, view_mode, save_mode, save_path)
 
 
@@ -263,36 +1137,59 @@ def _print_verdict(
 
 
 def run_query(query: Query, url: str) -> StepRun:
-    """Run an individual query, handling sync or async intelligently."""
+    """Run an individual query, handling sync or async intelligently.
+
+    An async query's elapsed time is end-to-end wall-clock time (submission
+    through fetching the final response), with the uncertainty being the poll
+    interval its completion was observed in.
+    """
     target = url + cast(str, query.endpoint)
     method = cast(str, query.method)
     elapsed = 0.0
+    start = time.monotonic()
+    receiver = callback.active()
+    is_async = "asyncquery" in cast(str, query.endpoint)
+    pending = receiver.register() if receiver is not None and is_async else None
 
     console.print(f"{method} {target}")
 
     try:
         with console.status("Querying..."):
-            response = CLIENT.request(
+            response = transport.send(
+                transport.client(),
                 method=method,
                 url=target,
                 params=query.params,
                 headers=query.headers,
-                json=query.body,
+                payload=callback.with_callback(query, pending),
             )
 
         elapsed = response.elapsed.total_seconds()
         response.raise_for_status()
-        body = cast(dict[str, Any], response.json())
         console.print(f"Query elapsed time {elapsed}s", highlight=False)
 
-        if "asyncquery" not in cast(str, query.endpoint):
+        if not is_async:
+            # Not parsed here: only what reads the body (tests, output) decodes it
+            _print_timing(response)
             return StepRun(
                 response, "ok", response.status_code, None, elapsed, target, method
             )
 
-        response, status, elapsed = _await_async_result(response, body, url, elapsed)
+        body = cast(dict[str, Any], trapi.as_json(response))
+        response, status, uncertainty = _await_async_result(
+            response, body, url, query.polling or CONFIG.polling, pending
+        )
+        elapsed = time.monotonic() - start
+        if response is not None:
+            _print_timing(response)
+        console.print(
+            f"total query elapsed time: {elapsed:.3f} (±{uncertainty:.3f})s",
+            highlight=False,
+        )
         http_status = response.status_code if response is not None else None
-        return StepRun(response, status, http_status, None, elapsed, target, method)
+        return StepRun(
+            response, status, http_status, None, elapsed, target, method, uncertainty
+        )
 
     except httpx.HTTPStatusError as error:
         console.print(error)
@@ -307,71 +1204,103 @@ def run_query(query: Query, url: str) -> StepRun:
         status = "timeout" if isinstance(error, httpx.TimeoutException) else "error"
         console.print(f"total query elapsed time: {elapsed} (±0)s", highlight=False)
         return StepRun(None, status, None, repr(error), elapsed, target, method)
+    finally:
+        if pending is not None:
+            pending.close()
+
+
+def _print_timing(response: httpx.Response) -> None:
+    """Print where a response's time went (see `timing.phases`)."""
+    console.print(
+        timing.describe(timing.phases(response)),
+        style="italic bright_black",
+        highlight=False,
+    )
 
 
 def _await_async_result(
-    response: httpx.Response, body: dict[str, Any], url: str, elapsed: float
+    response: httpx.Response,
+    body: dict[str, Any],
+    url: str,
+    strategy: PollStrategy,
+    pending: callback.PendingCallback | None = None,
 ) -> tuple[httpx.Response | None, Literal["ok", "timeout"], float]:
-    """Poll asyncquery_status to completion, then fetch the final response."""
+    """Poll asyncquery_status to completion, then fetch the final response.
+
+    With a ``pending`` callback the result is taken from the callback when it
+    arrives (exactly timed), polling only slowly as a fallback. Returns the final
+    response, status, and the uncertainty in when the job completed.
+    """
     status_url = url + "/asyncquery_status/" + body["job_id"]
+    if pending is not None:
+        console.print(f"Awaiting callback at {pending.url}")
 
-    response, body, elapsed, uncertainty, timed_out = _poll_async_status(
-        status_url, response, body, elapsed
+    response, body, uncertainty, timed_out = _poll_async_status(
+        status_url, response, body, strategy, pending
     )
 
+    if pending is not None:
+        arrived = pending.wait(0 if timed_out else callback.CALLBACK_GRACE)
+        if arrived is not None:
+            console.print("Result received by callback.")
+            return arrived.response, "ok", 0.0
+        console.print("No callback received, falling back to polled status.")
+
     if timed_out:
         console.print("Query timed out.")
-        return response, "timeout", elapsed
+        return response, "timeout", uncertainty
 
     response_url = body.get("response_url", None)
     if response_url is None:
         console.print("No response url found, query may have failed.")
-        return response, "ok", elapsed
+        return response, "ok", uncertainty
 
     with console.status("Querying response endpoint..."):
         console.print(f"GET {response_url}")
-        response = CLIENT.get(response_url)
+        response = transport.send(transport.client(), "GET", response_url)
         response.raise_for_status()
-        elapsed += response.elapsed.total_seconds()
 
-    console.print(
-        f"total query elapsed time: {elapsed} (±{uncertainty})s", highlight=False
-    )
-    return response, "ok", elapsed
+    return response, "ok", uncertainty
 
 
 def _poll_async_status(
-    status_url: str, response: httpx.Response, body: dict[str, Any], elapsed: float
-) -> tuple[httpx.Response, dict[str, Any], float, int, bool]:
-    """Poll every 10s while the job is Accepted/Queued/Running; stop on finish/timeout.
+    status_url: str,
+    response: httpx.Response,
+    body: dict[str, Any],
+    strategy: PollStrategy,
+    pending: callback.PendingCallback | None = None,
+) -> tuple[httpx.Response, dict[str, Any], float, bool]:
+    """Poll while the job is Accepted/Queued/Running; stop on finish/timeout.
 
-    Returns the latest response and body, the accumulated elapsed time and its
-    uncertainty, and whether polling timed out.
+    Waits between polls per ``strategy`` (see `PollTimer`), or at the slow
+    fallback rate while awaiting a ``pending`` callback, stopping early if it
+    arrives. Returns the latest response and body, the uncertainty in when the
+    job finished, and whether polling timed out.
     """
     status = body["status"]
-    uncertainty = 0
-    with console.status("Polling status endpoint every 10s...") as task_status:
-        deadline = time.time() + CONFIG.timeout
-        attempt = 0
+    timer = PollTimer(strategy, CONFIG.timeout, fallback=pending is not None)
+    with console.status("Polling status endpoint...") as task_status:
         console.print(f"GET {status_url} (polling)")
 
-        while status in ["Accepted", "Queued", "Running"]:
-            if time.time() > deadline:
-                return response, body, elapsed, uncertainty, True
+        while status in ACTIVE_STATUSES:
+            if timer.expired:
+                return response, body, timer.uncertainty, True
 
-            if attempt > 0:
-                time.sleep(10)
-                elapsed += 10
-                uncertainty = 10  # Could have finished any time in interval
-
-            attempt += 1
-            task_status.update(f"Polling status endpoint every 10s...({attempt})")
-            response = CLIENT.get(status_url)
+            delay = timer.next_delay(response)
+            if pending is None:
+                time.sleep(delay)
+            elif pending.wait(delay) is not None:
+                break
+            task_status.update(
+                f"Polling status endpoint...({timer.attempt}, waited {delay:.1f}s)"
+            )
+            response = transport.client().get(status_url)
+            timer.polled()
             response.raise_for_status()
-            body = cast(dict[str, Any], response.json())
+            body = cast(dict[str, Any], trapi.as_json(response))
             status = body["status"]
 
-    return response, body, elapsed, uncertainty, False
+    return response, body, timer.uncertainty, False
 
 
 def run_tests(
@@ -389,9 +1318,7 @@ def run_tests(
     for i, test in enumerate(query.tests or []):
         try:
             result = test.test(response)  # Returns report if failed otherwise None
-            test_name = (
-                test.__doc__.removesuffix(".") if test.__doc__ else test.__name__
-            )
+            name = test_name(test)
 
             message = ""
             if result.passed:
@@ -400,7 +1327,7 @@ def run_tests(
             else:
                 message += "[red]x[/]"
                 failed += 1
-            message += f" {i + 1}. {test_name}"
+            message += f" {i + 1}. {name}"
 
             report_long: Panel | None = None
             if result.info:
@@ -426,7 +1353,7 @@ def run_tests(
                 console.print(report_long)
 
             outcomes.append(
-                {"name": test_name, "passed": result.passed, "info": result.info}
+                {"name": name, "passed": result.passed, "info": result.info}
             )
 
         except Exception as error:
@@ -0,0 +1,136 @@
+"""Response bodies streamed into spooled temporary files instead of memory.
+
+Pathfinder and creative-mode responses can run to hundreds of MB. A
+`SpooledResponse` keeps its (decoded) body in a `SpooledTemporaryFile`, in memory
+only up to a threshold, and reads it back on demand rather than holding a copy;
+everything reading a response (tests, viewing, saving) works on it unchanged.
+"""
+
+import json
+import shutil
+from collections.abc import Iterator
+from datetime import timedelta
+from tempfile import SpooledTemporaryFile
+from typing import Any, BinaryIO, cast, override
+
+import httpx
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class SpooledBody:
+    """A body written once, then read back any number of times."""
+
+    def __init__(self, threshold: int) -> None:
+        """Hold up to ``threshold`` bytes in memory before spilling to disk."""
+        self._file = SpooledTemporaryFile(max_size=threshold)  # noqa: SIM115
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk of the body."""
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def reader(self) -> BinaryIO:
+        """The body as a file, rewound to the start."""
+        self._file.seek(0)
+        return cast(BinaryIO, self._file)
+
+    def on_disk(self) -> BinaryIO:
+        """`reader`, forced onto disk (so it has a ``fileno``, e.g. for stdin)."""
+        self._file.rollover()
+        return self.reader()
+
+    def read(self) -> bytes:
+        """The whole body (a transient copy; not kept)."""
+        return self.reader().read()
+
+    def copy_to(self, destination: BinaryIO) -> None:
+        """Write the whole body to ``destination`` without loading it at once."""
+        shutil.copyfileobj(self.reader(), destination, CHUNK_SIZE)
+
+    def close(self) -> None:
+        """Discard the body."""
+        self._file.close()
+
+
+class SpooledResponse(httpx.Response):
+    """An `httpx.Response` whose body is read from a `SpooledBody` on each access.
+
+    ``content``, ``text`` and ``json()`` are not cached, so a response passed
+    between tests, the report and output doesn't pin a full copy in memory.
+    """
+
+    def __init__(
+        self,
+        source: httpx.Response,
+        body: SpooledBody,
+        elapsed: timedelta | None = None,
+        wire_bytes: int | None = None,
+    ) -> None:
+        """Take ``source``'s status, headers and request, with ``body`` as its body.
+
+        ``wire_bytes`` is how many bytes the body took to receive, when it didn't
+        arrive through ``source`` (as a callback's doesn't).
+        """
+        self.body = body
+        super().__init__(
+            source.status_code,
+            headers=source.headers,
+            stream=httpx.ByteStream(b""),
+            request=source.request,
+            extensions=source.extensions,
+            history=source.history,
+        )
+        self.is_stream_consumed = True
+        self.is_closed = True
+        self._num_bytes_downloaded = (
+            source.num_bytes_downloaded if wire_bytes is None else wire_bytes
+        )
+        self.elapsed = source.elapsed if elapsed is None else elapsed
+
+    @property
+    @override
+    def content(self) -> bytes:
+        return self.body.read()
+
+    @property
+    @override
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    @override
+    def read(self) -> bytes:
+        return self.content
+
+    @override
+    def iter_bytes(self, chunk_size: int | None = None) -> Iterator[bytes]:
+        reader = self.body.reader()
+        while chunk := reader.read(chunk_size or CHUNK_SIZE):
+            yield chunk
+
+    @override
+    def json(self, **kwargs: Any) -> Any:
+        return json.loads(self.content, **kwargs)
+
+
+def spool(response: httpx.Response, threshold: int) -> SpooledResponse:
+    """Stream a (``stream=True``) response's body into a `SpooledResponse`."""
+    body = SpooledBody(threshold)
+    try:
+        for chunk in response.iter_bytes(CHUNK_SIZE):
+            body.write(chunk)
+    finally:
+        response.close()
+    return SpooledResponse(response, body)
+
+
+async def aspool(response: httpx.Response, threshold: int) -> SpooledResponse:
+    """`spool` for a response streamed by an async client."""
+    body = SpooledBody(threshold)
+    try:
+        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+            body.write(chunk)
+    finally:
+        await response.aclose()
+    return SpooledResponse(response, body)
@@ -0,0 +1,173 @@
+"""Import-time budgets for CLI startup (`tt startup`).
+
+Subcommands are imported only when invoked (see `main.AliasGroup`), so each one's
+startup cost is what its own module pulls in. Each measurement runs a fresh
+interpreter under ``python -X importtime`` that imports the app and loads one
+subcommand, as invoking it would, and totals the import times it reports; the
+median over several runs is checked against that subcommand's budget.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, TypedDict
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+import trapi_testing_tools
+from trapi_testing_tools.main import COMMANDS
+
+console = Console(stderr=True)
+
+APP = "tt"
+"""The bare app, as imported for ``tt --help``."""
+
+DEFAULT_BUDGET = 2.0
+"""Seconds of imports a subcommand may take without a budget of its own.
+
+Most subcommands need config, httpx and rich; the budgets leave room for noise.
+"""
+
+BUDGETS: dict[str, float] = {
+    APP: 0.5,
+    "validate | v": 0.5,
+    "synth": 0.8,
+    "startup": 0.8,
+    "resolve": 1.5,
+    "history | hist": 1.5,
+    # These load heavier dependencies up front (translator_tom, analyses, the run
+    # pipeline).
+    "test | t": 2.5,
+    "analyze | a": 3.0,
+    "harness | h": 3.0,
+    "bench": 3.0,
+}
+"""Import-time budgets in seconds, by subcommand name."""
+
+
+class StartupResult(TypedDict):
+    """One subcommand's import time over repeated cold starts."""
+
+    command: str
+    seconds: list[float]  # each run's total import time
+    median_seconds: float
+    budget_seconds: float
+    over_budget: bool
+    heaviest: list[tuple[str, float]]  # top-level imports by seconds, last run
+
+
+def _script(command: str) -> str:
+    if command == APP:
+        return "import trapi_testing_tools.main"
+    return (
+        f"from trapi_testing_tools.main import load_command; load_command({command!r})"
+    )
+
+
+def parse_importtime(report: str) -> list[tuple[str, float]]:
+    """Top-level imports and their cumulative seconds from ``-X importtime`` output."""
+    imports: list[tuple[str, float]] = []
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _self, cumulative, name = line.removeprefix("import time:").split("|")
+        if name.startswith("  ") or not cumulative.strip().isdigit():
+            continue  # a nested import (counted in its parent), or the header
+        imports.append((name.strip(), int(cumulative) / 1_000_000))
+    return imports
+
+
+def measure(command: str, repeat: int) -> tuple[list[float], list[tuple[str, float]]]:
+    """Each run's total import time, and the last run's top-level imports.
+
+    Raises:
+        RuntimeError: if loading the subcommand fails.
+    """
+    seconds: list[float] = []
+    imports: list[tuple[str, float]] = []
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _script(command)],
+            capture_output=True,
+            text=True,
+            cwd=Path(trapi_testing_tools.__path__[0]).parent,
+            check=False,
+        )
+        if process.returncode != 0:
+            error = process.stderr.strip().splitlines()
+            raise RuntimeError(
+                f"loading {command!r} failed: {error[-1] if error else ''}"
+            )
+        imports = parse_importtime(process.stderr)
+        seconds.append(sum(cumulative for _name, cumulative in imports))
+    return seconds, imports
+
+
+def run_startup(
+    commands: list[str], repeat: int, budget: float | None
+) -> list[StartupResult]:
+    """Measure each command's import time against its budget (or ``budget``)."""
+    results: list[StartupResult] = []
+    with console.status("Measuring startup...") as status:
+        for command in commands:
+            status.update(f"Measuring startup of {command}...")
+            seconds, imports = measure(command, repeat)
+            median = statistics.median(seconds)
+            allowed = (
+                budget if budget is not None else BUDGETS.get(command, DEFAULT_BUDGET)
+            )
+            results.append(
+                {
+                    "command": command,
+                    "seconds": [round(value, 4) for value in seconds],
+                    "median_seconds": round(median, 4),
+                    "budget_seconds": allowed,
+                    "over_budget": median > allowed,
+                    "heaviest": [
+                        (name, round(cumulative, 4))
+                        for name, cumulative in sorted(
+                            imports, key=lambda item: item[1], reverse=True
+                        )[:3]
+                    ],
+                }
+            )
+    return results
+
+
+def all_commands() -> list[str]:
+    """The bare app, then every subcommand."""
+    return [APP, *COMMANDS]
+
+
+def print_results(results: list[StartupResult]) -> None:
+    """Print import times against budgets as a table."""
+    table = Table(
+        title="Startup import time",
+        title_style="bold",
+        box=box.SIMPLE,
+        caption="Median of cold starts under python -X importtime.",
+    )
+    table.add_column("Command", style="rule.line", no_wrap=True)
+    for column in ("Median", "Budget"):
+        table.add_column(column, justify="right", no_wrap=True)
+    table.add_column("Heaviest imports", overflow="fold")
+    for result in results:
+        style = "red" if result["over_budget"] else "green"
+        table.add_row(
+            result["command"],
+            f"[{style}]{result['median_seconds'] * 1000:.0f}ms[/]",
+            f"{result['budget_seconds'] * 1000:.0f}ms",
+            ", ".join(
+                f"{name} {seconds * 1000:.0f}ms" for name, seconds in result["heaviest"]
+            ),
+        )
+    console.print(table)
+
+
+def emit(output: Any) -> None:
+    """Write results to stdout as JSON."""
+    print(json.dumps(output, ensure_ascii=False))
@@ -0,0 +1,90 @@
+"""Significance tests for comparing measurements against a baseline."""
+
+import itertools
+import math
+import random
+import statistics
+from collections import Counter
+
+EXACT_LIMIT = 20
+"""Samples (both sides together) up to which permutation tests are exact."""
+
+PERMUTATIONS = 10_000
+"""Random permutations drawn when a permutation test can't be exact."""
+
+
+def permutation_pvalue(
+    baseline: list[float], current: list[float], seed: int = 0
+) -> float:
+    """One-sided p-value that ``current`` has a higher mean than ``baseline``.
+
+    The chance of a mean difference at least as large as the observed one if the
+    two samples were interchangeable: exact over every split for small samples,
+    else estimated from random permutations.
+    """
+    pooled = [*baseline, *current]
+    n = len(current)
+    total = sum(pooled)
+
+    def difference(chosen_sum: float) -> float:
+        return chosen_sum / n - (total - chosen_sum) / len(baseline)
+
+    observed = difference(sum(current)) - 1e-12  # ties count as extreme
+    if len(pooled) <= EXACT_LIMIT:
+        splits = math.comb(len(pooled), n)
+        extreme = sum(
+            difference(sum(chosen)) >= observed
+            for chosen in itertools.combinations(pooled, n)
+        )
+        return extreme / splits
+    rng = random.Random(seed)
+    extreme = sum(
+        difference(sum(rng.sample(pooled, n))) >= observed for _ in range(PERMUTATIONS)
+    )
+    return (extreme + 1) / (PERMUTATIONS + 1)
+
+
+def mann_whitney_pvalue(baseline: list[float], current: list[float]) -> float:
+    """One-sided Mann-Whitney U p-value that ``current`` tends to be larger.
+
+    Rank-based, so robust to outliers: exact over every split of the (tie-averaged)
+    ranks for small samples, else from the normal approximation with tie and
+    continuity corrections.
+    """
+    pooled = sorted([*baseline, *current])
+    first_rank: dict[float, int] = {}
+    for rank, value in enumerate(pooled, 1):
+        first_rank.setdefault(value, rank)
+    counts = Counter(pooled)
+    rank_of = {
+        value: first_rank[value] + (count - 1) / 2 for value, count in counts.items()
+    }
+    n, total = len(current), len(pooled)
+    observed = sum(rank_of[value] for value in current)
+    if total <= EXACT_LIMIT:
+        ranks = [rank_of[value] for value in pooled]
+        extreme = sum(
+            sum(chosen) >= observed - 1e-9  # ties count as extreme
+            for chosen in itertools.combinations(ranks, n)
+        )
+        return extreme / math.comb(total, n)
+    ties = sum(count**3 - count for count in counts.values())
+    variance = n * (total - n) / 12 * (total + 1 - ties / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (observed - n * (total + 1) / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def min_pvalue(baseline_size: int, current_size: int) -> float:
+    """The smallest p-value the (exact) tests here can give samples of these sizes.
+
+    When it's above the significance level, no difference can be significant.
+    """
+    return 1 / math.comb(baseline_size + current_size, current_size)
+
+
+def median_change(baseline: list[float], current: list[float]) -> float:
+    """The relative change of the median, e.g. 0.25 for 25% slower/larger."""
+    before = statistics.median(baseline)
+    return statistics.median(current) / before - 1 if before else 0.0
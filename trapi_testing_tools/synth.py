@@ -0,0 +1,231 @@
+"""Synthetic TRAPI responses of any size (`tt synth`), for scale testing.
+
+The response is written out piece by piece as it's generated, so even a
+multi-GB response takes little memory: only each edge's endpoints are kept.
+Everything is derived from the seed, so a spec and seed always produce the same
+bytes (its TRAPI and Biolink versions are the installed translator_tom's).
+
+Support graphs nest ``depth`` levels deep: edges are split into tiers by index,
+result analyses bind tier-0 edges, and an edge of tier ``t`` is supported by
+auxiliary graphs of level ``t + 1``, which hold edges of tier ``t + 1``.
+"""
+
+import json
+import random
+import string
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any, TextIO
+
+EDGES_PER_AUX_GRAPH = 3
+_CATEGORIES = ("biolink:Gene", "biolink:Disease", "biolink:ChemicalEntity")
+
+
+@dataclass(frozen=True)
+class SynthSpec:
+    """The shape of a synthetic response."""
+
+    nodes: int = 1000
+    edges: int = 1000
+    results: int = 100
+    analyses: int = 1  # per result
+    aux_graphs: int = 0
+    depth: int = 1  # support graph nesting, when there are auxiliary graphs
+    attribute_bytes: int = 0  # size of an extra payload attribute on each edge
+    logs: int = 10
+    broken: int = 0  # results binding a node and edge missing from the kg
+    seed: int = 0
+
+
+class _Generator:
+    def __init__(self, spec: SynthSpec, out: TextIO) -> None:
+        self.spec = spec
+        self.out = out
+        self.rng = random.Random(spec.seed)
+        self.tiers = spec.depth + 1 if spec.aux_graphs and spec.depth else 1
+        # Edge endpoints, as node indexes (the only per-item state kept)
+        self.subjects = array(
+            "I", (self.rng.randrange(spec.nodes) for _ in range(spec.edges))
+        )
+        self.objects = array(
+            "I", (self.rng.randrange(spec.nodes) for _ in range(spec.edges))
+        )
+        self.payload = "".join(
+            self.rng.choices(string.ascii_letters, k=spec.attribute_bytes)
+        )
+
+    def write_items(self, items: Iterable[Any], mapping: bool) -> None:
+        """Write (key, value) pairs as a JSON object, or values as an array."""
+        self.out.write("{" if mapping else "[")
+        for index, item in enumerate(items):
+            if index:
+                self.out.write(",")
+            if mapping:
+                key, value = item
+                self.out.write(f"{json.dumps(key)}:{json.dumps(value)}")
+            else:
+                self.out.write(json.dumps(item))
+        self.out.write("}" if mapping else "]")
+
+    def tier_edge(self, tier: int, position: int) -> int:
+        """The index of the ``position``-th edge (wrapping) in a tier."""
+        count = max((self.spec.edges - tier + self.tiers - 1) // self.tiers, 1)
+        return min(tier + self.tiers * (position % count), self.spec.edges - 1)
+
+    def level_aux(self, level: int, position: int) -> int:
+        """The index of the ``position``-th auxiliary graph (wrapping) of a level."""
+        depth = self.tiers - 1
+        count = max((self.spec.aux_graphs - (level - 1) + depth - 1) // depth, 1)
+        return min(level - 1 + depth * (position % count), self.spec.aux_graphs - 1)
+
+    def nodes(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        for index in range(self.spec.nodes):
+            yield (
+                f"SYN:{index}",
+                {
+                    "name": f"synthetic node {index}",
+                    "categories": [_CATEGORIES[index % len(_CATEGORIES)]],
+                    "attributes": [],
+                },
+            )
+
+    def edge(self, index: int) -> dict[str, Any]:
+        tier = index % self.tiers
+        attributes: list[dict[str, Any]] = [
+            {
+                "attribute_type_id": "biolink:knowledge_level",
+                "value": "knowledge_assertion"
+                if tier == self.tiers - 1
+                else "prediction",
+            },
+            {"attribute_type_id": "biolink:agent_type", "value": "computational_model"},
+        ]
+        if tier < self.tiers - 1:
+            aux = self.level_aux(tier + 1, index // self.tiers)
+            attributes.append(
+                {"attribute_type_id": "biolink:support_graphs", "value": [f"aux{aux}"]}
+            )
+        if self.payload:
+            attributes.append(
+                {"attribute_type_id": "biolink:description", "value": self.payload}
+            )
+        return {
+            "subject": f"SYN:{self.subjects[index]}",
+            "object": f"SYN:{self.objects[index]}",
+            "predicate": "biolink:related_to",
+            "sources": [
+                {
+                    "resource_id": "infores:synthetic",
+                    "resource_role": "primary_knowledge_source",
+                }
+            ],
+            "attributes": attributes,
+        }
+
+    def edges(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        for index in range(self.spec.edges):
+            yield f"e{index}", self.edge(index)
+
+    def result(self, index: int) -> dict[str, Any]:
+        analyses = self.spec.analyses
+        edges = [self.tier_edge(0, index * analyses + n) for n in range(analyses)]
+        subject, obj = f"SYN:{self.subjects[edges[0]]}", f"SYN:{self.objects[edges[0]]}"
+        edge_ids = [f"e{edge}" for edge in edges]
+        if index < self.spec.broken:
+            subject, edge_ids = f"SYN:missing{index}", [f"missing{index}"] * analyses
+        return {
+            "node_bindings": {
+                "n0": [{"id": subject, "attributes": []}],
+                "n1": [{"id": obj, "attributes": []}],
+            },
+            "analyses": [
+                {
+                    "resource_id": "infores:synthetic",
+                    "edge_bindings": {"e0": [{"id": edge_id, "attributes": []}]},
+                    "score": round(self.rng.random(), 4),
+                }
+                for edge_id in edge_ids
+            ],
+        }
+
+    def aux_graph(self, index: int) -> dict[str, Any]:
+        depth = self.tiers - 1
+        level = index % depth + 1
+        first = (index // depth) * EDGES_PER_AUX_GRAPH
+        edges = {
+            f"e{self.tier_edge(level, first + n)}" for n in range(EDGES_PER_AUX_GRAPH)
+        }
+        return {"edges": sorted(edges), "attributes": []}
+
+    def logs(self) -> Iterator[dict[str, Any]]:
+        for index in range(self.spec.logs):
+            yield {
+                "timestamp": f"2024-01-01T00:00:{index % 60:02d}+00:00",
+                "level": "INFO",
+                "code": None,
+                "message": f"Synthetic log message {index}.",
+            }
+
+    def write(self) -> None:
+        # The versions translator_tom's semantic validation (`Semantic`) expects
+        from translator_tom.utils.config import TRAPI_CONFIG
+
+        out = self.out
+        out.write('{"message":{"query_graph":')
+        out.write(
+            json.dumps(
+                {
+                    "nodes": {
+                        "n0": {"categories": [_CATEGORIES[0]]},
+                        "n1": {"categories": [_CATEGORIES[1]]},
+                    },
+                    "edges": {
+                        "e0": {
+                            "subject": "n0",
+                            "object": "n1",
+                            "predicates": ["biolink:related_to"],
+                        }
+                    },
+                }
+            )
+        )
+        out.write(',"knowledge_graph":{"nodes":')
+        self.write_items(self.nodes(), mapping=True)
+        out.write(',"edges":')
+        self.write_items(self.edges(), mapping=True)
+        out.write('},"results":')
+        self.write_items(map(self.result, range(self.spec.results)), mapping=False)
+        out.write(',"auxiliary_graphs":')
+        aux_graphs = range(self.spec.aux_graphs if self.tiers > 1 else 0)
+        self.write_items(
+            ((f"aux{index}", self.aux_graph(index)) for index in aux_graphs),
+            mapping=True,
+        )
+        out.write('},"logs":')
+        self.write_items(self.logs(), mapping=False)
+        out.write(
+            f',"status":"Success","description":"Synthetic response.",'
+            f'"schema_version":"{TRAPI_CONFIG.schema_version}",'
+            f'"biolink_version":"{TRAPI_CONFIG.biolink_version}"}}'
+        )
+
+
+def synthesize(spec: SynthSpec, out: TextIO) -> None:
+    """Write a synthetic TRAPI response matching ``spec`` to ``out``.
+
+    Raises:
+        ValueError: if the spec can't make a valid response (e.g. edges but no
+            nodes, or results but no edges).
+    """
+    if spec.edges and not spec.nodes:
+        raise ValueError("edges need at least one node")
+    if spec.results and not spec.edges:
+        raise ValueError("results need at least one edge")
+    if spec.aux_graphs and spec.depth and spec.edges <= spec.depth:
+        raise ValueError(f"support graphs {spec.depth} deep need more edges than that")
+    if spec.aux_graphs and spec.aux_graphs < spec.depth:
+        raise ValueError(f"support graphs {spec.depth} deep need as many aux graphs")
+    if spec.analyses < 1:
+        raise ValueError("each result needs at least one analysis")
+    _Generator(spec, out).write()
@@ -0,0 +1,200 @@
+"""Per-phase network timing of HTTP responses.
+
+Every client from `transport` installs a `PhaseTrace` on each request it sends
+(via an event hook and httpx's ``trace`` extension), recording when connection
+setup, the request, the response headers and the response body happened.
+`phases` turns that into a `StepTiming`, separating a slow service (time to first
+byte) from a slow network (connect/TLS) from a large body (download).
+"""
+
+import re
+import time
+from typing import Any, TypedDict, cast
+
+import httpx
+
+from trapi_testing_tools.spool import SpooledResponse
+
+
+class ServerTimingMetric(TypedDict):
+    """One metric from a ``Server-Timing`` response header."""
+
+    name: str
+    duration_ms: float | None
+    description: str | None
+
+
+class StepTiming(TypedDict):
+    """Where a response's time went, and how big it was.
+
+    Phase times are None when they weren't measured (e.g. a result delivered by
+    callback); connect/TLS are 0 when a pooled connection was reused.
+    """
+
+    connect_seconds: float | None  # DNS resolution and TCP connect
+    tls_seconds: float | None
+    ttfb_seconds: float | None  # request sent until response headers received
+    download_seconds: float | None  # response headers until body fully received
+    wire_bytes: int  # body bytes as transferred (before content decoding)
+    decoded_bytes: int | None  # body bytes after decoding; None if not read
+    server_timing: list[ServerTimingMetric]
+
+
+class PhaseTrace:
+    """An httpx ``trace`` extension recording when each phase of a request began/ended.
+
+    Events are keyed without their protocol prefix (``http11``/``http2``/
+    ``connection``), keeping the first ``.started`` and last ``.complete`` time.
+    """
+
+    def __init__(self) -> None:
+        """Start with no phases recorded."""
+        self.events: dict[str, float] = {}
+
+    def __call__(self, event: str, _info: dict[str, Any]) -> None:
+        """Record one trace event."""
+        phase = event.split(".", 1)[-1]
+        if phase.endswith(".complete") or phase not in self.events:
+            self.events[phase] = time.monotonic()
+
+    def span(self, start: str, end: str) -> float | None:
+        """Seconds between two recorded events, or None if either is missing."""
+        if start not in self.events or end not in self.events:
+            return None
+        return self.events[end] - self.events[start]
+
+
+class AsyncPhaseTrace:
+    """A `PhaseTrace` for async clients, which require a coroutine callback."""
+
+    def __init__(self) -> None:
+        """Start with no phases recorded."""
+        self.trace = PhaseTrace()
+
+    async def __call__(self, event: str, info: dict[str, Any]) -> None:
+        """Record one trace event."""
+        self.trace(event, info)
+
+
+def install_trace(request: httpx.Request) -> None:
+    """Request event hook: trace the request's phases (see `phases`)."""
+    request.extensions["trace"] = PhaseTrace()
+
+
+async def install_async_trace(request: httpx.Request) -> None:
+    """Async request event hook: trace the request's phases (see `phases`)."""
+    request.extensions["trace"] = AsyncPhaseTrace()
+
+
+def _connection_span(trace: PhaseTrace, phase: str) -> float:
+    """A connection setup phase's duration; 0 when a pooled connection was reused."""
+    return trace.span(f"{phase}.started", f"{phase}.complete") or 0.0
+
+
+_ENTRIES = re.compile(r',(?=(?:[^"]*"[^"]*")*[^"]*$)')  # commas outside quotes
+_PARAM = re.compile(r';\s*([\w-]+)\s*(?:=\s*("[^"]*"|[^;]*))?')
+
+
+def parse_server_timing(response: httpx.Response) -> list[ServerTimingMetric]:
+    """Parse every ``Server-Timing`` header, e.g. ``db;dur=53.2;desc="lookup"``."""
+    metrics: list[ServerTimingMetric] = []
+    for header in response.headers.get_list("Server-Timing"):
+        for entry in _ENTRIES.split(header):
+            name, _, params = entry.strip().partition(";")
+            if not name:
+                continue
+            values = {
+                key.lower(): value.strip().strip('"')
+                for key, value in _PARAM.findall(f";{params}")
+            }
+            try:
+                duration = float(values["dur"]) if "dur" in values else None
+            except ValueError:
+                duration = None
+            metrics.append(
+                {
+                    "name": name.strip(),
+                    "duration_ms": duration,
+                    "description": values.get("desc"),
+                }
+            )
+    return metrics
+
+
+def _decoded_size(response: httpx.Response) -> int | None:
+    if isinstance(response, SpooledResponse):
+        return response.body.size
+    return len(response.content) if response.is_stream_consumed else None
+
+
+def phases(response: httpx.Response) -> StepTiming:
+    """The timing breakdown of a received response.
+
+    A response replayed from a cassette (see `cassette`) has its recorded timing.
+    """
+    recorded = response.extensions.get("recorded_timing")
+    if recorded is not None:
+        return cast(StepTiming, dict(recorded))
+    trace = response.request.extensions.get("trace")
+    if isinstance(trace, AsyncPhaseTrace):
+        trace = trace.trace
+    timing: StepTiming = {
+        "connect_seconds": None,
+        "tls_seconds": None,
+        "ttfb_seconds": None,
+        "download_seconds": None,
+        "wire_bytes": response.num_bytes_downloaded,
+        "decoded_bytes": _decoded_size(response),
+        "server_timing": parse_server_timing(response),
+    }
+    if isinstance(trace, PhaseTrace):
+        timing["connect_seconds"] = _connection_span(trace, "connect_tcp")
+        timing["tls_seconds"] = _connection_span(trace, "start_tls")
+        timing["ttfb_seconds"] = trace.span(
+            "send_request_headers.started", "receive_response_headers.complete"
+        )
+        timing["download_seconds"] = trace.span(
+            "receive_response_headers.complete", "receive_response_body.complete"
+        )
+    return timing
+
+
+def setup_seconds(response: httpx.Response) -> float:
+    """Connection setup (DNS/TCP and TLS) time spent on a response's request."""
+    timing = phases(response)
+    return (timing["connect_seconds"] or 0.0) + (timing["tls_seconds"] or 0.0)
+
+
+def _size(count: int) -> str:
+    if count < 1000:  # noqa: PLR2004
+        return f"{count}B"
+    size = count / 1000
+    for unit in ("kB", "MB"):
+        if size < 1000:  # noqa: PLR2004
+            return f"{size:.1f}{unit}"
+        size /= 1000
+    return f"{size:.1f}GB"
+
+
+def describe(timing: StepTiming) -> str:
+    """A one-line human summary of a timing breakdown."""
+    parts = [
+        f"{label} {value:.3f}s"
+        for label, value in (
+            ("connect", timing["connect_seconds"]),
+            ("tls", timing["tls_seconds"]),
+            ("ttfb", timing["ttfb_seconds"]),
+            ("download", timing["download_seconds"]),
+        )
+        if value is not None
+    ]
+    size = _size(timing["wire_bytes"])
+    if timing["decoded_bytes"] not in (None, timing["wire_bytes"]):
+        size += f" ({_size(timing['decoded_bytes'] or 0)} decoded)"
+    parts.append(size)
+    parts.extend(
+        f"server {metric['name']} {metric['duration_ms']:.1f}ms"
+        for metric in timing["server_timing"]
+        if metric["duration_ms"] is not None
+    )
+    return " · ".join(parts)
@@ -0,0 +1,285 @@
+"""Shared HTTP transport: pooled (optionally HTTP/2) clients built from `TTTConfig`.
+
+Every command gets its clients here, so connection limits, keep-alive and HTTP/2
+are configured in one place (`config.yaml` under `transport`). Environments a run
+targets get a connection pool of their own (`per_host_connections`), and can be
+warmed up front so the first query against each doesn't carry the DNS, TCP and
+TLS setup cost. Every request is traced for its per-phase timing (see `timing`).
+
+Query bodies are sent as `payload.Payload` bytes encoded once per query. With
+``request_encoding`` set, large bodies are sent compressed; a host answering a
+compressed body with HTTP 415 (Unsupported Media Type) gets it again
+uncompressed, and uncompressed bodies from then on.
+"""
+
+import asyncio
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+import httpx
+from rich.console import Console
+
+from trapi_testing_tools import spool, timing
+from trapi_testing_tools.payload import Encoding, Payload
+
+if TYPE_CHECKING:
+    from trapi_testing_tools.config import TransportConfig
+
+console = Console(stderr=True)
+
+
+@cache
+def _use_http2(requested: bool) -> bool:
+    """Whether HTTP/2 can be used, warning (once) if requested but unavailable."""
+    if not requested:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        console.print(
+            "WARNING: transport.http2 is set but the 'h2' package is not installed "
+            "(install httpx[http2]); using HTTP/1.1.",
+            style="yellow",
+        )
+        return False
+    return True
+
+
+def _config() -> "TransportConfig":
+    from trapi_testing_tools.config import CONFIG
+
+    return CONFIG.transport
+
+
+def _limits(per_host: bool) -> httpx.Limits:
+    config = _config()
+    return httpx.Limits(
+        max_connections=config.per_host_connections
+        if per_host
+        else config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+
+
+def _host_pattern(url: str) -> str:
+    """An httpx mount pattern matching ``url``'s host (and port, if explicit)."""
+    parsed = httpx.URL(url)
+    port = f":{parsed.port}" if parsed.port is not None else ""
+    return f"all://{parsed.host}{port}"
+
+
+def _client_options(
+    transport: Callable[..., Any], hosts: Iterable[str]
+) -> dict[str, Any]:
+    """Client keyword arguments giving each of ``hosts`` a pool of its own."""
+    http2 = _use_http2(_config().http2)
+    return {
+        "follow_redirects": True,
+        "http2": http2,
+        "limits": _limits(per_host=False),
+        "mounts": {
+            _host_pattern(url): transport(http2=http2, limits=_limits(per_host=True))
+            for url in hosts
+        },
+    }
+
+
+def default_timeout() -> float | None:
+    """The configured request timeout, where a negative value means none."""
+    from trapi_testing_tools.config import CONFIG
+
+    return CONFIG.timeout if CONFIG.timeout >= 0 else None
+
+
+def sync_client(hosts: Iterable[str] = ()) -> httpx.Client:
+    """A new pooled client; ``hosts`` (base URLs) get dedicated pools."""
+    return httpx.Client(
+        timeout=default_timeout(),
+        event_hooks={"request": [timing.install_trace]},
+        **_client_options(httpx.HTTPTransport, hosts),
+    )
+
+
+def async_client(hosts: Iterable[str] = ()) -> httpx.AsyncClient:
+    """A new pooled async client; ``hosts`` (base URLs) get dedicated pools.
+
+    Async clients are bound to the event loop they're used in, so create one per
+    loop rather than sharing it. Override the timeout per request where needed.
+    """
+    return httpx.AsyncClient(
+        timeout=default_timeout(),
+        event_hooks={"request": [timing.install_async_trace]},
+        **_client_options(httpx.AsyncHTTPTransport, hosts),
+    )
+
+
+_uncompressed_hosts: set[str] = set()
+"""Hosts (mount patterns) that refused a compressed request body."""
+
+
+def _request_encoding(url: str, payload: Payload | None) -> Encoding:
+    """How to encode a body sent to ``url``: compressed, unless small or refused."""
+    config = _config()
+    if (
+        payload is None
+        or config.request_encoding == "identity"
+        or len(payload.content) < config.request_encoding_threshold
+        or _host_pattern(url) in _uncompressed_hosts
+    ):
+        return "identity"
+    return config.request_encoding
+
+
+def _build(  # noqa: PLR0913
+    client: httpx.Client | httpx.AsyncClient,
+    method: str,
+    url: str,
+    payload: Payload | None,
+    encoding: Encoding,
+    kwargs: dict[str, Any],
+) -> httpx.Request:
+    if payload is None:
+        return client.build_request(method, url, **kwargs)
+    headers = httpx.Headers(kwargs.get("headers"))
+    headers.setdefault("Content-Type", "application/json")
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    options: dict[str, Any] = {
+        **kwargs,
+        "headers": headers,
+        "content": payload.encoded(encoding),
+    }
+    return client.build_request(method, url, **options)
+
+
+def _refused(response: httpx.Response, url: str, encoding: Encoding) -> bool:
+    """Whether a compressed body was refused; the host then gets uncompressed ones."""
+    if (
+        encoding == "identity"
+        or response.status_code != httpx.codes.UNSUPPORTED_MEDIA_TYPE
+    ):
+        return False
+    host = _host_pattern(url)
+    if host not in _uncompressed_hosts:
+        _uncompressed_hosts.add(host)
+        console.print(
+            f"INFO: {host.removeprefix('all://')} refused a {encoding} request "
+            "body; sending it uncompressed bodies from now on.",
+            style="italic bright_black",
+        )
+    return True
+
+
+def send(
+    client: httpx.Client,
+    method: str,
+    url: str,
+    payload: Payload | None = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Send a request, streaming its response body into a spooled file.
+
+    ``payload`` is sent as the JSON body, compressed per ``request_encoding``.
+    Takes other `httpx.Client.build_request` arguments; see
+    `spool.SpooledResponse`.
+    """
+    encoding = _request_encoding(url, payload)
+    request = _build(client, method, url, payload, encoding, kwargs)
+    response = client.send(request, stream=True)
+    if _refused(response, url, encoding):
+        response.close()
+        request = _build(client, method, url, payload, "identity", kwargs)
+        response = client.send(request, stream=True)
+    return spool.spool(response, _config().spool_threshold)
+
+
+async def asend(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    payload: Payload | None = None,
+    spooled: bool = True,
+    **kwargs: Any,
+) -> httpx.Response:
+    """`send` for an async client.
+
+    Without ``spooled``, the response is returned still streaming, for the caller
+    to read (or discard) and close.
+    """
+    encoding = _request_encoding(url, payload)
+    request = _build(client, method, url, payload, encoding, kwargs)
+    response = await client.send(request, stream=True)
+    if _refused(response, url, encoding):
+        await response.aclose()
+        request = _build(client, method, url, payload, "identity", kwargs)
+        response = await client.send(request, stream=True)
+    if not spooled:
+        return response
+    return await spool.aspool(response, _config().spool_threshold)
+
+
+def spool_threshold() -> int:
+    """Response body bytes kept in memory before spilling to a temporary file."""
+    return _config().spool_threshold
+
+
+_shared: httpx.Client | None = None
+_shared_lock = threading.Lock()
+
+
+def client() -> httpx.Client:
+    """The process-wide shared sync client (created on first use)."""
+    global _shared  # noqa: PLW0603
+    with _shared_lock:
+        if _shared is None:
+            _shared = sync_client()
+        return _shared
+
+
+def use_hosts(hosts: Iterable[str]) -> httpx.Client:
+    """Rebuild the shared client so ``hosts`` (base URLs) get dedicated pools."""
+    global _shared  # noqa: PLW0603
+    with _shared_lock:
+        if _shared is not None:
+            _shared.close()
+        _shared = sync_client(hosts)
+        return _shared
+
+
+def _warm_one(shared: httpx.Client, url: str) -> float | None:
+    try:
+        return timing.setup_seconds(shared.head(url, timeout=30))
+    except httpx.HTTPError:
+        return None
+
+
+def warm_up(shared: httpx.Client, urls: list[str]) -> dict[str, float | None]:
+    """Concurrently open a pooled connection to each URL's host.
+
+    Returns each URL's connection setup time in seconds, or None when it couldn't
+    be reached (the run itself will report the failure).
+    """
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        times = list(pool.map(lambda url: _warm_one(shared, url), urls))
+    return dict(zip(urls, times, strict=True))
+
+
+async def warm_up_async(
+    shared: httpx.AsyncClient, urls: list[str]
+) -> dict[str, float | None]:
+    """`warm_up` for an async client."""
+
+    async def warm(url: str) -> float | None:
+        try:
+            return timing.setup_seconds(await shared.head(url, timeout=30))
+        except httpx.HTTPError:
+            return None
+
+    times = await asyncio.gather(*(warm(url) for url in urls))
+    return dict(zip(urls, times, strict=True))
@@ -1,8 +1,11 @@
 from dataclasses import dataclass, field
 from enum import StrEnum
+from functools import cached_property
 from typing import TYPE_CHECKING, Any, Literal
 
 from tests.base_test import Test
+from trapi_testing_tools.payload import Payload
+from trapi_testing_tools.polling import PollStrategy
 
 if TYPE_CHECKING:
     # translator_tom (TOM) is only referenced for typing; it is imported lazily at
@@ -38,3 +41,9 @@ class Query:
     headers: dict[str, str] = field(default_factory=dict)
     body: "dict[str, Any] | list[Any] | TOMBase | None" = None
     tests: list[type[Test]] | None = None
+    polling: PollStrategy | None = None  # async polling; defaults to CONFIG.polling
+
+    @cached_property
+    def payload(self) -> Payload | None:
+        """The body encoded once, for every send of this query (None if no body)."""
+        return Payload.of(self.body)
@@ -1,36 +1,67 @@
 import asyncio
+import io
 import json
 import shutil
 import subprocess
 import zipfile
 from contextlib import redirect_stdout
+from contextvars import ContextVar
 from dataclasses import replace
 from http import HTTPStatus
 from pathlib import Path
-from sys import stderr, stdin
+from sys import stderr, stdin, stdout
 from types import CoroutineType, ModuleType
 from typing import Any, Literal, cast, get_args, override
+from weakref import WeakKeyDictionary
 
 import httpx
-from InquirerPy.prompts.confirm import ConfirmPrompt
-from InquirerPy.prompts.filepath import FilePathPrompt
-from InquirerPy.prompts.fuzzy import FuzzyPrompt
 from natsort import natsorted
 from platformdirs import PlatformDirs
 from rich import progress
 from rich.console import Console, ConsoleRenderable, Group, RenderHook
 from rich.live import Live
 from rich.text import Text
-from translator_tom import TOMBase
 
 from tests.base_test import Test
+from trapi_testing_tools import blobs, transport
 from trapi_testing_tools.config import CONFIG
+from trapi_testing_tools.polling import PollStrategy
+from trapi_testing_tools.spool import SpooledResponse
 from trapi_testing_tools.types import HTTPMethod, Query
 
-SYNC_BASIC_CLIENT = httpx.Client(follow_redirects=True, timeout=None)
-ASYNC_BASIC_CLIENT = httpx.AsyncClient(follow_redirects=True, timeout=None)
+ASYNC_BASIC_CLIENT = transport.async_client()
 console = Console(stderr=True)
 
+ACTIVE_CONSOLE: ContextVar[Console] = ContextVar("active_console", default=console)
+"""The console output goes to in the current context (a buffer for concurrent runs)."""
+
+
+class ContextConsole:
+    """A stand-in `Console` forwarding everything to the context's `ACTIVE_CONSOLE`.
+
+    Lets concurrently-run queries each print into their own buffer while module
+    code keeps using a plain ``console``.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        """Look the attribute up on the currently active console."""
+        return getattr(ACTIVE_CONSOLE.get(), name)
+
+
+def buffered_console(buffer: io.StringIO) -> Console:
+    """A console rendering into ``buffer`` the way the real console would.
+
+    Styles are kept but live displays (status spinners) are not, so the buffer can
+    later be written out as one uninterrupted block.
+    """
+    return Console(
+        file=buffer,
+        width=console.width,
+        color_system=cast(Any, console.color_system),
+        force_terminal=False,
+        force_interactive=False,
+    )
+
 
 ENVIRONMENT_MAPPING = dict[str, str]()
 default = None
@@ -43,8 +74,11 @@ for level, url in CONFIG.environments[CONFIG.default_environment].items():
 
 
 def is_interactive() -> bool:
-    """Whether an interactive terminal is attached for prompting."""
-    return stdin.isatty() and stderr.isatty()
+    """Whether an interactive terminal is attached for prompting.
+
+    Never true while printing into a buffered (concurrent) console.
+    """
+    return stdin.isatty() and stderr.isatty() and ACTIVE_CONSOLE.get() is console
 
 
 def maybe_print_traceback(
@@ -56,6 +90,8 @@ def maybe_print_traceback(
     """
     if not is_interactive():
         return
+    from InquirerPy.prompts.confirm import ConfirmPrompt
+
     with redirect_stdout(stderr):
         if ConfirmPrompt(message, default=False).execute():
             console.print_exception(show_locals=True)
@@ -88,12 +124,30 @@ def should_output(
     output = True
     if mode == "every":
         return True
+    from InquirerPy.prompts.confirm import ConfirmPrompt
+
     with redirect_stdout(stderr):  # Otherwise set to "prompt"
         return ConfirmPrompt(
             message=f"{output_type.capitalize()} {subject} body?", default=True
         ).execute()
 
 
+def _is_json(response: httpx.Response) -> bool:
+    return "json" in response.headers.get("Content-Type", "")
+
+
+def _stored(output: object, subject: str) -> object:
+    """A JSON response's blob reference, with a blob store open (see `blobs`)."""
+    store = blobs.active()
+    if store is None or subject != "response":
+        return output
+    from tests import trapi
+
+    if isinstance(output, SpooledResponse) and trapi.is_json(output):
+        output = trapi.as_json(output)
+    return store.put(output) if isinstance(output, dict | list) else output
+
+
 def handle_output(
     output: object | None,
     view_mode: Literal["prompt", "skip", "every", "pipe"],
@@ -101,15 +155,31 @@ def handle_output(
     save_path: Path | None,
     subject: str = "response",
 ) -> None:
-    """Based on the given view/output modes, handle user appropriate interactions."""
+    """Based on the given view/output modes, handle user appropriate interactions.
+
+    A `SpooledResponse` is output straight from its body file, without parsing it.
+    """
     if output is None:
         return
     if view_mode == "pipe":
+        if isinstance(output, SpooledResponse):
+            stdout.flush()
+            output.body.copy_to(stdout.buffer)
+            stdout.buffer.write(b"\n")
+            stdout.flush()
+            return
         print(json.dumps(output) if isinstance(output, dict | list) else output)
         return
 
     if should_output(output, "view", view_mode, subject):
-        if isinstance(output, dict | list):
+        if isinstance(output, SpooledResponse):
+            subprocess.run(
+                CONFIG.viewer if _is_json(output) else "less",
+                stdin=output.body.on_disk(),
+                shell=True,
+                check=False,
+            )
+        elif isinstance(output, dict | list):
             subprocess.run(
                 CONFIG.viewer,
                 input=json.dumps(output),
@@ -129,6 +199,8 @@ def handle_output(
         subject,
     ):
         if not save_path:
+            from InquirerPy.prompts.filepath import FilePathPrompt
+
             with redirect_stdout(stderr):
                 save_path = Path(
                     FilePathPrompt(
@@ -137,6 +209,11 @@ def handle_output(
                     ).execute()
                 )
         save_path.parent.mkdir(parents=True, exist_ok=True)
+        output = _stored(output, subject)
+        if isinstance(output, SpooledResponse):
+            with save_path.open("wb") as file:
+                output.body.copy_to(file)
+            return
         with save_path.open("w", encoding="utf8") as file:
             if isinstance(output, dict | list):
                 json.dump(output, file)
@@ -152,14 +229,26 @@ def serialize_body(body: object) -> dict[str, Any] | list[Any] | None:
     if body is None or isinstance(body, dict | list):
         return cast("dict[str, Any] | list[Any] | None", body)
 
+    from translator_tom import TOMBase
+
     if isinstance(body, TOMBase):
         return body.to_dict()
 
     raise AttributeError("Query body must be a dict, list, TOM model, or None.")
 
 
+_PARSED: WeakKeyDictionary[ModuleType, list[Query]] = WeakKeyDictionary()
+
+
 def parse_query(query_module: ModuleType) -> list[Query]:
-    """Check that query has required options."""
+    """Check that query has required options.
+
+    Each module is parsed once, so every environment and repetition shares the
+    same `Query` steps: TOM bodies are serialized, and bodies encoded (see
+    `Query.payload`), only once.
+    """
+    if query_module in _PARSED:
+        return list(_PARSED[query_module])
     queries: list[Query]
 
     if hasattr(query_module, "steps"):
@@ -193,8 +282,13 @@ def parse_query(query_module: ModuleType) -> list[Query]:
                 "Query headers must a dict of header-value string pairs."
             )
 
-        # Normalize in case of TOM object
-        body = serialize_body(getattr(query_module, "body", None))
+        # Normalize in case of TOM object; a matrix's body is a template, filled
+        # in per variant (see `matrix`)
+        body = (
+            None
+            if getattr(query_module, "matrix", None) is not None
+            else serialize_body(getattr(query_module, "body", None))
+        )
 
         tests = getattr(query_module, "tests", None)
         if not isinstance(tests, list | None) or (
@@ -203,6 +297,12 @@ def parse_query(query_module: ModuleType) -> list[Query]:
         ):
             raise AttributeError("Query tests must be defined using Test class.")
 
+        polling = getattr(query_module, "polling", None)
+        if isinstance(polling, dict):
+            polling = PollStrategy.model_validate(polling)
+        if not isinstance(polling, PollStrategy | None):
+            raise AttributeError("Query polling must be a PollStrategy or dict.")
+
         queries = [
             Query(
                 method=cast(HTTPMethod, method),
@@ -211,10 +311,12 @@ def parse_query(query_module: ModuleType) -> list[Query]:
                 headers=cast(dict[str, str], headers),
                 body=body,
                 tests=cast(list[type[Test]], tests),
+                polling=polling,
             )
         ]
 
-    return queries
+    _PARSED[query_module] = queries
+    return list(queries)
 
 
 def cache_tests() -> None:
@@ -234,7 +336,7 @@ def cache_tests() -> None:
 
         with console.status("Checking for cache updates...") as status:
             needs_update = True
-            response = SYNC_BASIC_CLIENT.get(repo_url)
+            response = transport.client().get(repo_url, timeout=None)
             response.raise_for_status()
             body = response.json()
             remote_update = body["updated_at"]
@@ -260,9 +362,10 @@ def cache_tests() -> None:
             status.update("Getting repository contents...")
             with (
                 archive_path.open("wb") as archive_file,
-                SYNC_BASIC_CLIENT.stream(
+                transport.client().stream(
                     "GET",
                     f"{repo_url}/zipball",
+                    timeout=None,
                 ) as response,
             ):
                 for chunk in response.iter_bytes():
@@ -299,6 +402,8 @@ def cache_tests() -> None:
         console.print(
             f"[red]ERROR:[/]: An error occurred while checking/updating cache: {error!r}"
         )
+        from InquirerPy.prompts.confirm import ConfirmPrompt
+
         with redirect_stdout(stderr):
             if ConfirmPrompt(
                 "Print traceback for this error?", default=False
@@ -326,6 +431,8 @@ def select_tests(test_type: Literal["asset", "case", "suite"]) -> list[Path]:
             file_prompts.append(prompt)
             prompt_to_fpath[prompt] = test_path
 
+    from InquirerPy.prompts.fuzzy import FuzzyPrompt
+
     selection = FuzzyPrompt(
         message=f"Select test {test_type}(s)...",
         choices=natsorted(file_prompts),